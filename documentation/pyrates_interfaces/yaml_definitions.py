@@ -138,6 +138,9 @@ References
 #       * :code:`input` -> the variable will be provided with a value from a previous operator or external,
 #         user-defined input
 #       * :code:`output` -> the value of this variable can be connected to another operator
+#       * :code:`noise` -> the variable is a Gaussian white noise source, which turns the differential equations it
+#         appears in into stochastic differential equations. It is set to a new noise sample at each step of a
+#         stochastic solver (e.g. :code:`solver='euler_maruyama'`) and is zero for all other solvers
 #       * a scalar value, e.g. :code:`default: 1.0` -> indicates that this variable is a constant with value 1.0
 #
 
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+#
+#
+# PyRates software framework for flexible implementation of neural
+# network model_templates and simulations. See also:
+# https://github.com/pyrates-neuroscience/PyRates
+#
+# Copyright (C) 2017-2018 the original authors (Richard Gast and
+# Daniel Rose), the Max-Planck-Institute for Human Cognitive Brain
+# Sciences ("MPI CBS") and contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+# CITATION:
+#
+# Richard Gast and Daniel Rose et. al. in preparation
+
+
+"""Contains events that are evaluated after each step of the integration loop of a simulation, such as threshold
+crossings of state variables, convergence to a fixed point or divergence of the solution. Events record the times at
+which they occurred and can terminate the simulation early.
+
+"""
+
+# external imports
+from typing import Optional, Union
+import numpy as np
+
+# meta infos
+__author__ = "Richard Gast"
+__status__ = "development"
+
+
+class Event:
+    """Base class for events. Events are opened by the backend before the simulation starts and are updated with the
+    state vector and its right-hand side update after each integration step. The simulation times at which the event
+    condition was met are collected in `Event.times`.
+
+    Parameters
+    ----------
+    var
+        Variable the event condition is evaluated on, in the format 'node_name/op_name/var_name' (see
+        `CircuitIR.run`). If None, the condition is evaluated on all state variables.
+    terminal
+        If true, the simulation is terminated when the event condition is met.
+
+    """
+
+    def __init__(self, var: Optional[str] = None, terminal: bool = True):
+        self.var = var
+        self.terminal = terminal
+        self.times = []
+        self.indices = None
+
+    def open(self, indices: Optional[np.ndarray] = None) -> None:
+        """Prepares the event for a simulation. `indices` refer to the entries of the state vector that the event
+        condition is evaluated on (all entries, if None).
+        """
+        self.indices = indices
+        self.times = []
+
+    def update(self, t: float, y: np.ndarray, dy: np.ndarray) -> bool:
+        """Evaluates the event condition on the state vector `y` and its right-hand side update `dy` at time `t`.
+        Returns true, if the event occurred and the simulation should be terminated.
+        """
+        if self.indices is not None:
+            y, dy = y[self.indices], dy[self.indices]
+        if self._check(y, dy):
+            self.times.append(t)
+            return self.terminal
+        return False
+
+    @property
+    def triggered(self) -> bool:
+        """True, if the event occurred during the last simulation.
+        """
+        return len(self.times) > 0
+
+    def get_state(self) -> dict:
+        """Returns the state of the event that is required to continue a simulation from a checkpoint.
+        """
+        return {'times': list(self.times)}
+
+    def set_state(self, state: dict) -> None:
+        """Restores a state returned by `get_state`.
+        """
+        self.times = list(state['times'])
+
+    def _check(self, y: np.ndarray, dy: np.ndarray) -> bool:
+        raise NotImplementedError
+
+
+class ThresholdEvent(Event):
+    """Occurs when a variable crosses a threshold. For variables with multiple entries (e.g. vectorized nodes), the
+    event occurs when any entry crosses the threshold.
+
+    Parameters
+    ----------
+    var
+        Variable the threshold is applied to, in the format 'node_name/op_name/var_name'.
+    threshold
+        Threshold value.
+    direction
+        Direction of the threshold crossing: 'rising', 'falling' or 'both'.
+    terminal
+        If true, the simulation is terminated when the threshold is crossed. Else, only the crossing times are recorded.
+
+    """
+
+    def __init__(self, var: str, threshold: float, direction: str = 'rising', terminal: bool = False):
+        if direction not in ('rising', 'falling', 'both'):
+            raise ValueError(f'Invalid direction of threshold crossing: {direction}. Please choose `rising`, '
+                             f'`falling` or `both`.')
+        super().__init__(var=var, terminal=terminal)
+        self.threshold = threshold
+        self.direction = direction
+        self._above = None
+
+    def open(self, indices: Optional[np.ndarray] = None) -> None:
+        super().open(indices)
+        self._above = None
+
+    def get_state(self) -> dict:
+        state = super().get_state()
+        state['above'] = None if self._above is None else self._above.copy()
+        return state
+
+    def set_state(self, state: dict) -> None:
+        super().set_state(state)
+        self._above = state['above']
+
+    def _check(self, y: np.ndarray, dy: np.ndarray) -> bool:
+        above = y >= self.threshold
+        above_old, self._above = self._above, above
+        if above_old is None:
+            return False
+        if self.direction == 'rising':
+            return bool(np.any(above & ~above_old))
+        if self.direction == 'falling':
+            return bool(np.any(above_old & ~above))
+        return bool(np.any(above != above_old))
+
+
+class ConvergenceEvent(Event):
+    """Occurs when the solution converged to a fixed point, i.e. when the absolute right-hand side update of all
+    (selected) state variables stayed below a tolerance for a number of consecutive integration steps (such that
+    turning points of the solution, at which the update vanishes only briefly, are not mistaken for fixed points). Not
+    meaningful for stochastic solvers.
+
+    Parameters
+    ----------
+    tol
+        Convergence tolerance for the right-hand side update (change of the state variables per unit of time).
+    var
+        Variable to check for convergence. If None, all state variables are checked.
+    terminal
+        If true, the simulation is terminated when the solution converged.
+    min_steps
+        Number of consecutive integration steps for which the right-hand side update has to stay below `tol`.
+
+    """
+
+    def __init__(self, tol: float = 1e-6, var: Optional[str] = None, terminal: bool = True, min_steps: int = 100):
+        if min_steps < 1:
+            raise ValueError(f'Invalid number of steps for convergence: {min_steps}. Please choose a positive '
+                             f'integer.')
+        super().__init__(var=var, terminal=terminal)
+        self.tol = tol
+        self.min_steps = min_steps
+        self._steps = 0
+
+    def open(self, indices: Optional[np.ndarray] = None) -> None:
+        super().open(indices)
+        self._steps = 0
+
+    def get_state(self) -> dict:
+        state = super().get_state()
+        state['steps'] = self._steps
+        return state
+
+    def set_state(self, state: dict) -> None:
+        super().set_state(state)
+        self._steps = state['steps']
+
+    def _check(self, y: np.ndarray, dy: np.ndarray) -> bool:
+        self._steps = self._steps + 1 if np.all(np.abs(dy) < self.tol) else 0
+        return self._steps >= self.min_steps
+
+
+class DivergenceEvent(Event):
+    """Occurs when the solution diverged, i.e. when any (selected) state variable became NaN or infinite, or its
+    absolute value reached `max_value`.
+
+    Parameters
+    ----------
+    max_value
+        Maximum absolute value of the state variables.
+    var
+        Variable to check for divergence. If None, all state variables are checked.
+    terminal
+        If true, the simulation is terminated when the solution diverged.
+
+    """
+
+    def __init__(self, max_value: float = np.inf, var: Optional[str] = None, terminal: bool = True):
+        super().__init__(var=var, terminal=terminal)
+        self.max_value = max_value
+
+    def _check(self, y: np.ndarray, dy: np.ndarray) -> bool:
+        return not np.all(np.abs(y) < self.max_value)
+
+
+def get_event(event: Union[Event, str], **kwargs) -> Event:
+    """Creates an event from its name ('convergence' or 'divergence'). Event instances are returned as they are.
+
+    Parameters
+    ----------
+    event
+        Event instance or name.
+    kwargs
+        Additional keyword arguments passed to the event initialization (e.g. `tol`).
+
+    Returns
+    -------
+    Event
+        Event instance.
+
+    """
+
+    if isinstance(event, Event):
+        return event
+    if event == 'convergence':
+        return ConvergenceEvent(**kwargs)
+    if event == 'divergence':
+        return DivergenceEvent(**kwargs)
+    raise ValueError(f'Invalid event: {event}. Please provide an `Event` instance, `convergence` or `divergence`.')
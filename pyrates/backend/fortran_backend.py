@@ -33,12 +33,14 @@
 from typing import Optional, Dict, Callable, List, Any, Union
 import os
 import sys
-from shutil import rmtree
+from shutil import rmtree, move
+from importlib.machinery import EXTENSION_SUFFIXES
 import numpy as np
 from numpy import f2py
 
 # pyrates internal imports
-from .numpy_backend import NumpyBackend, PyRatesAssignOp, PyRatesIndexOp, PyRatesOp, CodeGen, extract_lhs_var
+from .numpy_backend import NumpyBackend, PyRatesAssignOp, PyRatesIndexOp, PyRatesOp, CodeGen, extract_lhs_var, \
+    rk_tableaus, stochastic_solvers, implicit_solvers, default_cache_dir
 
 # meta infos
 __author__ = "Richard Gast"
@@ -49,6 +51,8 @@ module_counter = 0
 
 class FortranOp(PyRatesOp):
 
+    static_inference = False
+
     def __init__(self, op: str, short_name: str, name, *args, **kwargs) -> None:
         self.build_dir = kwargs.pop('build_dir', '')
         super().__init__(op, short_name, name, *args, **kwargs)
@@ -63,6 +67,8 @@ class FortranOp(PyRatesOp):
 
 class FortranIndexOp(PyRatesIndexOp):
 
+    static_inference = False
+
     def __init__(self, op: str, short_name: str, name, *args, **kwargs) -> None:
         self.build_dir = kwargs.pop('build_dir', '')
         super().__init__(op, short_name, name, *args, **kwargs)
@@ -73,6 +79,8 @@ class FortranIndexOp(PyRatesIndexOp):
 
 class FortranAssignOp(PyRatesAssignOp):
 
+    static_inference = False
+
     def __init__(self, op: str, short_name: str, name, *args, **kwargs) -> None:
         self.build_dir = kwargs.pop('build_dir', '')
         super().__init__(op, short_name, name, *args, **kwargs)
@@ -104,7 +112,8 @@ class FortranBackend(NumpyBackend):
                  float_default_type: str = 'float32',
                  imports: Optional[List[str]] = None,
                  build_dir: Optional[str] = None,
-                 auto_compat: bool = False
+                 auto_compat: bool = False,
+                 cache_dir: Optional[str] = default_cache_dir
                  ) -> None:
         """Instantiates numpy backend, i.e. a compute graph with numpy operations.
         """
@@ -174,18 +183,21 @@ class FortranBackend(NumpyBackend):
                  "interpolate": {'name': "pyrates_interpolate", 'call': ""},
                  "interpolate_1d": {'name': "pyrates_interpolate_1d", 'call': ""},
                  "interpolate_nd": {'name': "pyrates_interpolate_nd", 'call': ""},
+                 "interpolate_uniform": {'name': "pyrates_interpolate_uniform", 'call': ""},
+                 "hold_uniform": {'name': "pyrates_hold_uniform", 'call': ""},
                  }
         if ops:
             ops_f.update(ops)
         self.pyauto_compat = auto_compat
         super().__init__(ops=ops_f, dtypes=dtypes, name=name, float_default_type=float_default_type,
-                         imports=imports, build_dir=build_dir)
+                         imports=imports, build_dir=build_dir, cache_dir=cache_dir)
         self._imports = []
         self.npar = 0
         self.ndim = 0
         self._auto_files_generated = False
 
-    def compile(self, build_dir: Optional[str] = None, decorator: Optional[Callable] = None, **kwargs) -> tuple:
+    def compile(self, build_dir: Optional[str] = None, decorator: Optional[Callable] = None, fused_loop: bool = False,
+                solver: str = 'euler', profile_ops: bool = False, preallocate: bool = False, **kwargs) -> tuple:
         """Compile the graph layers/operations. Creates python files containing the functions in each layer.
 
         Parameters
@@ -194,6 +206,15 @@ class FortranBackend(NumpyBackend):
             Directory in which to create the file structure for the simulation.
         decorator
             Decorator function that should be applied to the right-hand side evaluation function.
+        fused_loop
+            Not supported by this backend.
+        solver
+            Numerical solver that will be used for the simulation. The native runge-kutta solvers of the `numpy`
+            backend are not supported by this backend.
+        profile_ops
+            Not supported by this backend.
+        preallocate
+            Not supported by this backend.
         kwargs
             decorator keyword arguments
 
@@ -207,6 +228,19 @@ class FortranBackend(NumpyBackend):
         # preparations
         ##############
 
+        if fused_loop:
+            raise NotImplementedError(f'Fused integration loops are not implemented for this backend ({self.name}). '
+                                      f'Please choose another backend (e.g. `numpy`) for this feature.')
+        if solver in rk_tableaus or solver in stochastic_solvers or solver in implicit_solvers:
+            raise NotImplementedError(f'The solver `{solver}` is not implemented for this backend ({self.name}). '
+                                      f'Please choose another solver (e.g. `euler` or `scipy`) or another backend.')
+        if profile_ops:
+            raise NotImplementedError(f'Operator profiling is not implemented for this backend ({self.name}). '
+                                      f'Please choose another backend (e.g. `numpy`) for this feature.')
+        if preallocate:
+            raise NotImplementedError(f'Preallocated work arrays are not implemented for this backend ({self.name}). '
+                                      f'Please choose another backend (e.g. `numpy`) for this feature.')
+
         # remove empty layers and operators
         new_layer_idx = 0
         for layer_idx, layer in enumerate(self.layers.copy()):
@@ -218,10 +252,6 @@ class FortranBackend(NumpyBackend):
             else:
                 new_layer_idx += 1
 
-        # remove previously imported rhs_funcs from system
-        if 'rhs_func' in sys.modules:
-            del sys.modules['rhs_func']
-
         # collect state variable and parameter vectors
         state_vars, params, var_map = self._process_vars()
 
@@ -352,19 +382,36 @@ class FortranBackend(NumpyBackend):
         func_gen.add_linebreak()
         func_gen.remove_indent()
 
-        # save rhs function to file
+        # save rhs function to file and compile it. Extension modules are compiled under a content-addressed name,
+        # such that the modules of different models do not collide when they are imported into the same process. In
+        # the cache directory, they are only compiled if they do not exist yet.
         fname = f'{self._build_dir}/rhs_func'
-        f2py.compile(func_gen.generate(), modulename='rhs_func', extension='.f', source_fn=f'{fname}.f', verbose=False)
+        source = func_gen.generate()
+        module = self._get_module_name(source, decorator, **kwargs)
+        if self._cache_dir and any(os.path.exists(f"{self._cache_dir}/{module}{suffix}")
+                                   for suffix in EXTENSION_SUFFIXES):
+            with open(f'{fname}.f', 'w') as f:
+                f.write(source)
+        else:
+            f2py.compile(source, modulename=module, extension='.f', source_fn=f'{fname}.f', verbose=False)
+            if self._cache_dir:
+                os.makedirs(self._cache_dir, exist_ok=True)
+                for suffix in EXTENSION_SUFFIXES:
+                    if os.path.exists(f"{module}{suffix}"):
+                        move(f"{module}{suffix}", f"{self._cache_dir}/{module}{suffix}")
+        self._module_name = module
 
         # create additional subroutines in pyauto compatibility mode
         gen_def = kwargs.pop('generate_auto_def', True)
         if self.pyauto_compat and gen_def:
             self.generate_auto_def(self._build_dir)
 
-        # import function from file
-        fname_import = fname.replace('/', '.')
-        exec(f"from rhs_func import rhs_eval", globals())
-        rhs_eval = globals().pop('func')
+        # import function from file (extension modules have to be loaded under the name they were compiled with)
+        module_dir = self._cache_dir if self._cache_dir else os.getcwd()
+        fn = [f"{module_dir}/{module}{suffix}" for suffix in EXTENSION_SUFFIXES
+              if os.path.exists(f"{module_dir}/{module}{suffix}")][0]
+        self._module = self._load_module(fn, module)
+        rhs_eval = self._module.func
 
         # apply function decorator
         if decorator:
@@ -39,6 +39,13 @@ __author__ = "Richard Gast"
 __status__ = "development"
 
 
+# tolerance of the zero-order hold lookup (`pr_hold_uniform`) in units of the sample interval of the input. Lookup times
+# that fall short of a sample time by less than this fraction of the sample interval (e.g. due to the accumulated
+# round-off of the time variable) are assigned to that sample instead of the previous one. It has to stay well below the
+# smallest non-zero fraction of a sample interval at which solvers evaluate the right-hand side (e.g. 1/9 for `rk45`).
+hold_uniform_tol = 1e-3
+
+
 # function definitions
 ######################
 
@@ -55,6 +62,10 @@ def pr_identity(x):
     return x
 
 
+def pr_sparse_dot(A, x):
+    return A @ x
+
+
 def pr_interp_1d_linear(x, y, x_new):
     return np.interp(x_new, x, y)
 
@@ -81,3 +92,15 @@ def pr_interp_nd(x, y, x_new, y_idx, t):
 
 def pr_interp(f, x_new):
     return f(x_new)
+
+
+def pr_interp_uniform(y, t, scale, offset=0.0):
+    x = min(max(t*scale - offset, 0.0), y.shape[0] - 1.0)
+    idx = min(int(x), y.shape[0] - 2)
+    w = x - idx
+    return (1.0 - w)*y[idx] + w*y[idx+1]
+
+
+def pr_hold_uniform(y, t, scale, offset=0.0):
+    idx = min(max(int(np.floor(t*scale - offset + hold_uniform_tol)), 0), y.shape[0] - 1)
+    return y[idx]
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+#
+#
+# PyRates software framework for flexible implementation of neural
+# network model_templates and simulations. See also:
+# https://github.com/pyrates-neuroscience/PyRates
+#
+# Copyright (C) 2017-2018 the original authors (Richard Gast and
+# Daniel Rose), the Max-Planck-Institute for Human Cognitive Brain
+# Sciences ("MPI CBS") and contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+# CITATION:
+#
+# Richard Gast and Daniel Rose et. al. in preparation
+
+
+"""Contains input sources that provide extrinsic inputs of a simulation in blocks of samples on demand, such that the
+memory consumption of a simulation does not scale with the simulation time.
+
+"""
+
+# external imports
+from typing import Callable, Iterator, Optional, Union
+from types import GeneratorType
+import numpy as np
+
+# meta infos
+__author__ = "Richard Gast"
+__status__ = "development"
+
+
+class InputSource:
+    """Base class for input sources. Input sources provide `n_samples` samples of an input with `n_columns` columns on a
+    uniform time grid that spans the simulation time. Samples are requested by the backend in blocks via `get`.
+
+    Parameters
+    ----------
+    n_samples
+        Number of samples of the input.
+
+    """
+
+    def __init__(self, n_samples: int):
+        self.n_samples = n_samples
+        self.times = None
+
+    @property
+    def n_columns(self) -> int:
+        """Number of columns of the input.
+        """
+        raise NotImplementedError
+
+    @property
+    def shape(self) -> tuple:
+        return self.n_samples, self.n_columns
+
+    def open(self, T: float) -> None:
+        """Prepares the source for a simulation of `T` seconds, i.e. for a time grid `np.linspace(0, T, n_samples)`.
+        """
+        self.times = np.linspace(0, T, self.n_samples)
+
+    def get(self, start: int, stop: int) -> np.ndarray:
+        """Returns the samples `start` to `stop` of the input as an array of shape `(n, n_columns)`, where `n` is
+        smaller than `stop - start` at the end of the input.
+        """
+        raise NotImplementedError
+
+
+class ArraySource(InputSource):
+    """Provides the samples of an array (first dimension: time), e.g. a memory-mapped `.npy` file, block-wise.
+
+    Parameters
+    ----------
+    data
+        Array of shape `(n_samples,)` or `(n_samples, n_columns)`.
+
+    """
+
+    def __init__(self, data: np.ndarray):
+        super().__init__(n_samples=data.shape[0])
+        self.data = data
+
+    @property
+    def n_columns(self) -> int:
+        return int(np.prod(self.data.shape[1:]))
+
+    def get(self, start: int, stop: int) -> np.ndarray:
+        return np.reshape(np.asarray(self.data[start:stop]), (-1, self.n_columns))
+
+
+class CallableSource(InputSource):
+    """Evaluates a function `f(t)` block-wise on the time grid of the input.
+
+    Parameters
+    ----------
+    func
+        Function that returns the input (a scalar or an array of shape `(n_columns,)`) at time `t`.
+    n_samples
+        Number of samples on the time grid of the input.
+
+    """
+
+    def __init__(self, func: Callable, n_samples: int):
+        super().__init__(n_samples=n_samples)
+        self.func = func
+        self._n_columns = None
+
+    @property
+    def n_columns(self) -> int:
+        if self._n_columns is None:
+            self._n_columns = int(np.size(self.func(0.0)))
+        return self._n_columns
+
+    def get(self, start: int, stop: int) -> np.ndarray:
+        return np.reshape(np.asarray([self.func(t) for t in self.times[start:stop]], dtype=float),
+                          (-1, self.n_columns))
+
+
+class GeneratorSource(InputSource):
+    """Pulls chunks of samples from a generator (or any other iterator). Only the samples of the most recently
+    requested block are kept, such that blocks have to be requested in order.
+
+    Parameters
+    ----------
+    generator
+        Iterator that yields chunks of shape `(n, n_columns)` (or `(n,)` for inputs with a single column).
+    n_samples
+        Number of samples on the time grid of the input.
+
+    """
+
+    def __init__(self, generator: Iterator, n_samples: int):
+        super().__init__(n_samples=n_samples)
+        self.generator = generator
+        self._chunk = None
+        self._chunk_start = 0
+        if not self._pull():
+            raise ValueError('The generator of the input source did not yield any samples.')
+
+    @property
+    def n_columns(self) -> int:
+        return self._chunk.shape[1]
+
+    def get(self, start: int, stop: int) -> np.ndarray:
+        if start < self._chunk_start:
+            raise ValueError(f'Samples {start} to {stop} have already been pulled from the generator. Input sources that '
+                             f'are based on generators can only be read in order.')
+
+        # pull chunks until the block is covered, while dropping the samples before the block
+        while self._chunk_start + self._chunk.shape[0] < stop:
+            self._drop(start)
+            if not self._pull():
+                break
+        self._drop(start)
+        return self._chunk[:stop-start]
+
+    def _drop(self, start: int) -> None:
+        n = min(start - self._chunk_start, self._chunk.shape[0])
+        self._chunk = self._chunk[n:]
+        self._chunk_start += n
+
+    def _pull(self) -> bool:
+        try:
+            chunk = np.asarray(next(self.generator), dtype=float)
+        except StopIteration:
+            return False
+        chunk = np.reshape(chunk, (chunk.shape[0], -1)) if chunk.ndim else np.reshape(chunk, (1, 1))
+        if self._chunk is None:
+            self._chunk = chunk
+        else:
+            self._chunk = np.concatenate([self._chunk, chunk], axis=0)
+        return True
+
+
+def get_input_source(inp: Union[InputSource, np.memmap, Callable, Iterator], n_samples: Optional[int] = None
+                     ) -> InputSource:
+    """Creates an input source from a memory-mapped array, a function `f(t)` or a generator. Input source instances are
+    returned as they are.
+
+    Parameters
+    ----------
+    inp
+        Input source instance, memory-mapped array, function or generator.
+    n_samples
+        Number of samples on the time grid of functions and generators.
+
+    Returns
+    -------
+    InputSource
+        Input source instance.
+
+    """
+
+    if isinstance(inp, InputSource):
+        return inp
+    if isinstance(inp, np.ndarray):
+        return ArraySource(inp)
+    if isinstance(inp, GeneratorType) or hasattr(inp, '__next__'):
+        return GeneratorSource(inp, n_samples=n_samples)
+    if callable(inp):
+        return CallableSource(inp, n_samples=n_samples)
+    raise ValueError(f'Invalid input source: {inp}. Please provide an array, a memory-mapped array, a function `f(t)` '
+                     f'or a generator.')
+
+
+def is_input_source(inp) -> bool:
+    """Returns true, if `inp` is an input that is provided on demand, i.e. anything but a plain numpy array.
+    """
+    return isinstance(inp, (InputSource, np.memmap)) or callable(inp) or hasattr(inp, '__next__')
@@ -49,13 +49,125 @@ import numpy as np
 from copy import deepcopy
 import os
 import sys
+import hashlib
+import json
+import importlib.util
+from itertools import count
+from numbers import Number
+from tempfile import mkstemp
 from shutil import rmtree
 import warnings
 from scipy.interpolate.interpolate import interp1d
+from scipy.sparse import issparse, spmatrix
 
 # pyrates internal imports
 from .funcs import *
 from .parser import replace
+from .output_sinks import OutputSink, get_output_sink
+from .events import get_event
+from .input_sources import InputSource, get_input_source
+from .optimization import optimize_equations, eliminate_dead_code, preallocate_buffers, get_names
+
+# butcher tableaus of the explicit runge-kutta schemes that are available as native solvers. Each tableau contains the
+# nodes `c`, the stage coefficients `a` and the weights `b`. Embedded schemes additionally provide the weights `e` of
+# the local error estimate (difference between the weights of the high- and the low-order solution). Schemes with the
+# first-same-as-last property (`fsal`) evaluate their last stage at the new state, such that it can be re-used as the
+# first stage of the next step.
+rk_tableaus = {
+    'heun': {'c': [0., 1.],
+             'a': [[], [1.]],
+             'b': [1/2, 1/2]},
+    'rk4': {'c': [0., 1/2, 1/2, 1.],
+            'a': [[], [1/2], [0., 1/2], [0., 0., 1.]],
+            'b': [1/6, 1/3, 1/3, 1/6]},
+    'rk45': {'c': [0., 1/5, 3/10, 4/5, 8/9, 1., 1.],
+             'a': [[],
+                   [1/5],
+                   [3/40, 9/40],
+                   [44/45, -56/15, 32/9],
+                   [19372/6561, -25360/2187, 64448/6561, -212/729],
+                   [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+                   [35/384, 0., 500/1113, 125/192, -2187/6784, 11/84]],
+             'b': [35/384, 0., 500/1113, 125/192, -2187/6784, 11/84, 0.],
+             'e': [71/57600, 0., -71/16695, 71/1920, -17253/339200, 22/525, -1/40],
+             'fsal': True}
+}
+
+# implicit solvers for stiff equation systems, which solve a linear system with the jacobian of the right-hand side at
+# each step
+implicit_solvers = ('backward_euler', 'ros2')
+
+# solvers that evaluate the right-hand side of the equation system at arbitrary points in time
+continuous_solvers = ('scipy',) + tuple(rk_tableaus.keys()) + implicit_solvers
+
+# solvers for stochastic differential equations, which set the noise variables at each integration step
+stochastic_solvers = ('euler_maruyama',)
+
+# implicit methods of `scipy.integrate.solve_ivp` that accept the sparsity pattern of the jacobian (`jac_sparsity`)
+sparse_scipy_methods = ('Radau', 'BDF')
+
+# default directory in which generated right-hand side modules are cached. Caching is opt-in: modules are only cached
+# if a directory is set via the environment variable `PYRATES_CACHE_DIR` or passed as backend argument `cache_dir`.
+default_cache_dir = os.environ.get('PYRATES_CACHE_DIR', None)
+
+# counter for unique names of the loaded right-hand side modules
+module_counter = count()
+
+
+# static shape inference
+########################
+
+
+def _broadcast_shape(*shapes: tuple) -> tuple:
+    """Shape of the result of an element-wise operation (numpy broadcasting rules).
+    """
+    return tuple(np.broadcast_shapes(*shapes))
+
+
+def _dot_shape(s1: tuple, s2: tuple) -> tuple:
+    """Shape of the result of `np.dot`.
+    """
+    if not s1 or not s2:
+        return _broadcast_shape(s1, s2)
+    if s1[-1] != s2[0 if len(s2) == 1 else -2]:
+        raise ValueError(f'Shapes {s1} and {s2} are not aligned for an inner product.')
+    return s1[:-1] + s2[:-2] + s2[-1:] if len(s2) > 1 else s1[:-1]
+
+
+def _transpose_shape(s: tuple) -> tuple:
+    """Shape of the result of `np.transpose`.
+    """
+    return s[::-1]
+
+
+def _squeeze_shape(s: tuple) -> tuple:
+    """Shape of the result of `np.squeeze`.
+    """
+    return tuple(d for d in s if d != 1)
+
+
+def _identity_shape(s: tuple, *args) -> tuple:
+    """Shape of the result of operations that preserve the shape of their first operand.
+    """
+    return s
+
+
+# rules for the result shape of operations, given the shapes of their operands. Keys are the calls of the operations,
+# values contain the number of operands (None for an arbitrary number) and a function of the operand shapes.
+shape_rules = {
+    **{op: (2, _broadcast_shape) for op in ('np.add', 'np.subtract', 'np.multiply', 'np.divide', 'np.mod', 'np.power',
+                                            'np.float_power', 'np.greater', 'np.less', 'np.equal', 'np.not_equal',
+                                            'np.greater_equal', 'np.less_equal', 'np.maximum', 'np.minimum')},
+    **{op: (1, _broadcast_shape) for op in ('np.sin', 'np.cos', 'np.tan', 'np.arctan', 'np.abs', 'np.sqrt',
+                                            'np.square', 'np.exp', 'np.tanh', 'np.round', 'np.invert')},
+    'pr_sigmoid': (None, _broadcast_shape),
+    'np.dot': (2, _dot_shape),
+    'pr_sparse_dot': (2, _dot_shape),
+    'np.transpose': (1, _transpose_shape),
+    'np.squeeze': (1, _squeeze_shape),
+    'pr_identity': (1, _identity_shape),
+    'np.asarray': (2, _identity_shape),
+}
 
 
 class NumpyVar(np.ndarray):
@@ -128,6 +240,8 @@ class NumpyVar(np.ndarray):
             shape = tuple(shape)
         if callable(value):
             obj = value
+        elif issparse(value):
+            obj = value.astype(dtype)
         else:
             value = cls._get_value(value, dtype, shape)
             if squeeze:
@@ -174,9 +288,8 @@ class NumpyVar(np.ndarray):
         else:
             return np.asarray(value, dtype=dtype)
 
-    @staticmethod
-    def squeeze(var, axis=None):
-        return var.squeeze(axis)
+    def squeeze(self, axis=None):
+        return np.asarray(self).squeeze(axis)
 
     @classmethod
     def _get_var(cls, value, name, dtype):
@@ -205,7 +318,7 @@ class NumpyVar(np.ndarray):
         if np.ndarray.__subclasscheck__(subclass):
             return True
         else:
-            return interp1d.__subclasscheck__(subclass)
+            return interp1d.__subclasscheck__(subclass) or spmatrix.__subclasscheck__(subclass)
 
 
 class PyRatesOp:
@@ -226,6 +339,7 @@ class PyRatesOp:
     """
 
     var_class = NumpyVar
+    static_inference = True
 
     def __init__(self, op: str, short_name: str, name, *args, **kwargs) -> None:
         """Instantiates PyRates operator.
@@ -235,6 +349,8 @@ class PyRatesOp:
         self.op = op
         self.short_name = short_name if short_name in name else name.split('/')[-1]
         self.name = name
+        self._operands = args
+        self._check = kwargs.pop('check', False)
 
         # generate function string
         self._op_dict = self.generate_op_str(op, args, **kwargs)
@@ -276,21 +392,108 @@ class PyRatesOp:
         return func_dict
 
     def build_op(self, args):
-        """Builds the function of the operator, tests its functionality and stores shape and data-type of the result
-        on the instance.
+        """Builds the function of the operator and stores shape and data-type of the result on the instance.
+
+        Shape and data-type are inferred from the shapes and data-types of the operands (see `_infer_shape_dtype`),
+        without evaluating the operator. Operators for which no inference rule exists are evaluated once instead. If
+        the operator was created with `check=True`, it is always evaluated on a copy of its arguments (including a
+        check for NaNs) and the inferred shape and data-type are compared to the result of the evaluation.
         """
 
         func_dict = self._generate_func()
         self._callable = func_dict.pop(self.short_name)
+        self.args = args
+
+        # infer output shape and data-type
+        inferred = self._infer_shape_dtype() if self.static_inference else None
+        if inferred is not None and not self._check:
+            self.shape, self.dtype = inferred
+            return
 
         # test function
-        self.args = self._deepcopy(args)
-        result = self.numpy() if 'no_op' not in self.short_name else self.args[0]
+        if self._check or not self.static_inference:
+            self.args = self._deepcopy(args)
+            result = self.numpy() if 'no_op' not in self.short_name else self.args[0]
+        else:
+            result = self._callable(*self.args)
         self.args = args
 
         # remember output shape and data-type
         self.shape = result.shape if hasattr(result, 'shape') else ()
         self.dtype = result.dtype if hasattr(result, 'dtype') else type(result)
+        if inferred is not None and (tuple(inferred[0]) != tuple(self.shape) or
+                                     np.dtype(inferred[1]) != np.dtype(self.dtype)):
+            raise ValueError(f'Inferred shape and data-type of operation {self.name} ({inferred[0]}, {inferred[1]}) '
+                             f'do not match the result of its evaluation ({self.shape}, {self.dtype}).')
+
+    def _infer_shape_dtype(self) -> Optional[tuple]:
+        """Infers shape and data-type of the result of the operator from its operands. The shape follows from the
+        operand shapes via `shape_rules`. The data-type is determined by applying the function of the operator to
+        proxies of the operands that contain a single element each, such that the type promotion rules of numpy apply.
+
+        Returns
+        -------
+        Optional[tuple]
+            Shape and data-type of the result or None, if they cannot be inferred.
+
+        """
+        if self.op not in shape_rules:
+            return None
+        n_operands, shape_rule = shape_rules[self.op]
+        if n_operands is not None and len(self._operands) != n_operands:
+            return None
+        shapes = [self._get_shape(arg) for arg in self._operands]
+        proxies = [self._get_proxy(arg) for arg in self._operands]
+        if any(s is None for s in shapes) or any(p is None for p in proxies):
+            return None
+        shape = shape_rule(*shapes)
+        with np.errstate(all='ignore'):
+            result = eval(self.op, globals())(*proxies)
+        return shape, result.dtype if hasattr(result, 'dtype') else type(result)
+
+    def _infer_index_shape(self, var: Any, idx: str) -> tuple:
+        """Evaluates index `idx` of the operand `var` on a zero-strided view that has the shape and data-type of `var`,
+        which only allocates memory for the indexed elements.
+        """
+        func_dict = {}
+        func = CodeGen()
+        func.add_code_line(f"def _index(__var, {', '.join(self.arg_names)}):" if self.arg_names else
+                           "def _index(__var):")
+        func.add_linebreak()
+        func.add_indent()
+        func.add_code_line(f"return __var{idx}")
+        exec(func.generate(), globals(), func_dict)
+        proxy = np.broadcast_to(np.zeros((), dtype=var.dtype), var.shape)
+        return np.shape(func_dict['_index'](proxy, *self.args))
+
+    @classmethod
+    def _get_shape(cls, arg: Any) -> Optional[tuple]:
+        """Returns the shape of an operand or None for operands without shape (e.g. strings or tuples).
+        """
+        if (PyRatesOp.__subclasscheck__(type(arg)) or cls.var_class.__subclasscheck__(type(arg))) and \
+                hasattr(arg, 'shape'):
+            return tuple(arg.shape)
+        if isinstance(arg, (Number, np.number, bool, np.bool_)):
+            return ()
+        return None
+
+    @classmethod
+    def _get_proxy(cls, arg: Any) -> Any:
+        """Returns a proxy of an operand with a single element, its data-type and its number of dimensions. Scalar
+        variables are returned as they are, since numpy's type promotion depends on their values.
+        """
+        if PyRatesOp.__subclasscheck__(type(arg)):
+            return np.ones((1,) * len(arg.shape), dtype=arg.dtype)
+        if cls.var_class.__subclasscheck__(type(arg)) and hasattr(arg, 'dtype'):
+            return np.ones((1,) * len(arg.shape), dtype=arg.dtype) if arg.shape else arg
+        if isinstance(arg, (Number, np.number, bool, np.bool_)):
+            return arg
+        if type(arg) is str:
+            try:
+                return eval(arg, globals())
+            except Exception:
+                return None
+        return None
 
     @classmethod
     def generate_op_str(cls, op, args, **kwargs):
@@ -524,6 +727,50 @@ class PyRatesAssignOp(PyRatesOp):
         self.lhs = self._op_dict.pop('lhs')
         self.rhs = self._op_dict.pop('rhs')
 
+    def _infer_shape_dtype(self) -> Optional[tuple]:
+        """The result of an assign operation is the variable it assigns to, except for non-indexed `=` operations,
+        which return the update. Raises an error, if the update cannot be broadcast to the shape of the (indexed)
+        variable or, for in-place updates, cannot be cast to its data-type.
+        """
+
+        if self.op not in ("=", "+=", "-=", "*=", "/="):
+            return None
+        var, upd = self._operands[0:2]
+        upd_shape = self._get_shape(upd)
+        if upd_shape is None:
+            return None
+
+        # non-indexed assignments of updates
+        if self.op == "=" and not self._op_dict['idx']:
+            upd_proxy = self._get_proxy(upd)
+            if upd_proxy is None:
+                return None
+            return upd_shape, upd_proxy.dtype if hasattr(upd_proxy, 'dtype') else type(upd_proxy)
+
+        if not hasattr(var, 'shape') or not hasattr(var, 'dtype'):
+            return None
+
+        # check whether the update can be broadcast to the shape of the (indexed) variable. Updates with more
+        # dimensions than the target (e.g. an update of shape (1,) for a single entry) are rejected, such that the
+        # broadcasting fallback of `add_op` squeezes them
+        target_shape = self._infer_index_shape(var, self._op_dict['idx'])
+        if len(upd_shape) > len(target_shape) or _broadcast_shape(target_shape, upd_shape) != tuple(target_shape):
+            raise ValueError(f'Update of shape {upd_shape} cannot be assigned to variable {self._op_dict["lhs"]} '
+                             f'of shape {target_shape}.')
+
+        # check whether the update can be cast to the data-type of the variable
+        if self.op != "=":
+            upd_proxy = self._get_proxy(upd)
+            if upd_proxy is None:
+                return None
+            if hasattr(upd_proxy, 'shape') and upd_proxy.shape:
+                upd_proxy = upd_proxy.reshape((1,) * len(upd_shape))
+            var_proxy = np.zeros((1,) * len(target_shape), dtype=var.dtype)
+            with np.errstate(all='ignore'):
+                exec(f"var_proxy {self.op} upd_proxy", globals(), {'var_proxy': var_proxy, 'upd_proxy': upd_proxy})
+
+        return tuple(var.shape), var.dtype
+
     def _generate_func(self):
         func_dict = {}
         func = CodeGen()
@@ -619,6 +866,7 @@ class PyRatesAssignOp(PyRatesOp):
         results['value'] = assign_line
         results['lhs'] = var_str
         results['rhs'] = upd_str
+        results['idx'] = var_idx
 
         return results
 
@@ -661,6 +909,16 @@ class PyRatesIndexOp(PyRatesOp):
      extract from a variable (1. entry in args).
     """
 
+    def _infer_shape_dtype(self) -> Optional[tuple]:
+        """The result of an index operation has the data-type of the indexed variable. Its shape is obtained by applying
+        the index to a zero-strided view of the variable.
+        """
+        var = self._operands[0]
+        if 'idx' not in self._op_dict or not hasattr(var, 'shape') or not hasattr(var, 'dtype') or \
+                not (PyRatesOp.__subclasscheck__(type(var)) or var.vtype != 'constant' or tuple(var.shape)):
+            return None
+        return self._infer_index_shape(var, self._op_dict['idx']), var.dtype
+
     @classmethod
     def generate_op_str(cls, op, args, idx_l='[', idx_r=']'):
         """Generates the index function string, call signature etc.
@@ -785,6 +1043,7 @@ class PyRatesIndexOp(PyRatesOp):
 
         # generate op
         results['value'] = f"{var}{var_idx}"
+        results['idx'] = var_idx
 
         # check whether any state variables are part of the indexing operation or not
         if n_vars == 0:
@@ -817,6 +1076,23 @@ class NumpyBackend(object):
         provided via `ops`. Will be added to the top of each generated code file.
     build_dir
         Directory in which pyrates builds will be stored.
+    cache_dir
+        Directory in which the generated right-hand side modules are cached (e.g. `~/.cache/pyrates`). Modules are
+        stored under a hash of their source code, the backend type, the float precision and the function decorator,
+        such that a model that has been compiled before on the same machine is not written and compiled again. The
+        cache is not cleaned up automatically and can be cleared by deleting the directory. If None (default, unless
+        the environment variable `PYRATES_CACHE_DIR` is set), modules are written to the build directory instead.
+    check_ops
+        If true, each operation is evaluated once when it is added to the backend, on a copy of its arguments. The
+        result is checked for NaNs and compared to the statically inferred shape and data-type of the operation. By
+        default, shapes and data-types of operations are inferred without evaluating them (see
+        `PyRatesOp.build_op`), which avoids copying weight matrices and delay buffers for each operation.
+    optimize_rhs
+        If true, the equations of the right-hand side evaluation are optimized during code generation (see
+        `pyrates.backend.optimization`): Equations that neither the state derivatives nor the inputs depend on are
+        removed, together with all parameters that are not used anymore. Subexpressions that depend on constants only
+        are evaluated once and passed to the function as additional parameters and subexpressions that are evaluated
+        repeatedly with identical arguments are evaluated only once.
 
     """
 
@@ -830,6 +1106,9 @@ class NumpyBackend(object):
                  float_default_type: str = 'float32',
                  imports: Optional[List[str]] = None,
                  build_dir: str = None,
+                 cache_dir: Optional[str] = default_cache_dir,
+                 check_ops: bool = False,
+                 optimize_rhs: bool = True
                  ) -> None:
         """Instantiates numpy backend, i.e. a compute graph with numpy operations.
         """
@@ -898,9 +1177,12 @@ class NumpyBackend(object):
                     "group": {'name': "pyrates_group", 'call': "pr_group"},
                     "asarray": {'name': "numpy_asarray", 'call': "np.asarray"},
                     "no_op": {'name': "pyrates_identity", 'call': "pr_identity"},
+                    "sparse_dot": {'name': "pyrates_sparse_dot", 'call': "pr_sparse_dot"},
                     "interpolate": {'name': "pyrates_interpolate", 'call': "pr_interp"},
                     "interpolate_1d": {'name': "pyrates_interpolate_1d", 'call': "pr_interp_1d"},
                     "interpolate_nd": {'name': "pyrates_interpolate_nd", 'call': "pr_interp_nd"},
+                    "interpolate_uniform": {'name': "pyrates_interpolate_uniform", 'call': "pr_interp_uniform"},
+                    "hold_uniform": {'name': "pyrates_hold_uniform", 'call': "pr_hold_uniform"},
                     }
         if ops:
             self.ops.update(ops)
@@ -941,6 +1223,21 @@ class NumpyBackend(object):
                 if imp not in self._imports:
                     self._imports.append(imp)
         self._input_names = []
+        self._loop_func = None
+        self._step_func = None
+        self._out_sink = None
+        self._noise = None
+        self._batch = None
+        self._input_sources = None
+        self._checkpoint = None
+        self._resume = None
+        self._events = []
+        self._cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        self._check_ops = check_ops
+        self._optimize_rhs = optimize_rhs
+        self._module_name = 'rhs_func'
+        self._module = None
+        self._op_scopes = []
 
         # create build dir
         orig_dir = os.getcwd()
@@ -960,7 +1257,6 @@ class NumpyBackend(object):
         except FileExistsError:
             rmtree(self._build_dir)
             os.mkdir(self._build_dir)
-        sys.path.append(self._build_dir)
 
     def run(self,
             T: float,
@@ -970,7 +1266,7 @@ class NumpyBackend(object):
             dts: Optional[int] = None,
             solver: str = 'euler',
             out_dir: Optional[str] = None,
-            profile: bool = False,
+            profile: Union[bool, str] = False,
             verbose: bool = True,
             **kwargs
             ) -> tuple:
@@ -989,13 +1285,38 @@ class NumpyBackend(object):
         dts
             Sampling step-size.
         solver
-            Type of the numerical solver to use.
+            Type of the numerical solver to use. Native solvers are `euler`, `heun`, `rk4` (fixed step-size) and `rk45`
+            (adaptive step-size), which are generated as part of the right-hand side evaluation module. `scipy` uses
+            `scipy.integrate.solve_ivp` instead. `euler_maruyama` solves stochastic differential equations by setting
+            the noise variables (see `add_noise_layer`) to white noise samples at each Euler step. `backward_euler` and
+            `ros2` are implicit solvers for stiff systems (see `_get_implicit_step_func`).
         out_dir
             Directory to write the session log into.
         profile
-            If true, the total graph execution time will be printed and returned.
+            If true, the total graph execution time will be printed and returned. If 'ops', the right-hand side
+            evaluation is additionally instrumented with timing counters for each operator (see `compile`), which can
+            be retrieved via `get_op_profile` after the simulation.
         verbose
             If true, updates about the simulation process will be displayed in the terminal.
+        kwargs
+            Additional keyword arguments. `input_interpolation` defines how inputs are looked up between their time
+            points for solvers that operate in continuous time ('linear' or 'zoh', see `add_input_layer`) and
+            `input_block_size` the number of integration steps for which the samples of input sources are kept in
+            memory at once (see `input_sources.InputSource`). `out_sink`
+            can be used to stream the output variables in chunks into an `output_sinks.OutputSink` instance, a
+            memory-mapped `.npy` file, an HDF5 file (`.h5` or `.hdf5`, optionally followed by `:dataset_name`) or a
+            callback with the signature `callback(times, chunk)`, instead of collecting them in memory. For stochastic
+            solvers, `noise_vars` contains the noise variables of the network, `seed` the seed of the random number
+            generator and `noise_block_size` the number of integration steps for which noise samples are drawn at once.
+            `checkpoint` is a file to which snapshots of the simulation are written every `checkpoint_interval`
+            (simulation time) and at the end of the simulation (`.npz` archives, see `to_file`). `resume` is a
+            checkpoint file from which the simulation is continued (see `_integrate`). Checkpoints require an
+            `out_sink`, which persists the output samples. `events` is a list of tuples, each containing an
+            `events.Event` instance (or name) and the variables it is evaluated on (in the same format as `outputs`, or
+            None for all state variables). Events are evaluated after each integration step and terminal events stop the simulation early,
+            in which case only the samples until then are returned. If a `compile_report` (see
+            `pyrates.ir.compile_report.CompileReport`) is passed, the time of the code generation is recorded in it.
+            `preallocate` enables work arrays for the results of ufuncs and inner products (see `compile`).
 
         Returns
         -------
@@ -1006,6 +1327,7 @@ class NumpyBackend(object):
             If not, a tuple containing only the results dictionary is returned which contains a numpy array with results
              for each output key that was provided via `outputs`. This allows to call the run functioon like this:
              `output, *time = run(*args, **kwargs)`
+            If an output sink was provided, it takes the place of the results dictionary.
 
         """
 
@@ -1025,8 +1347,19 @@ class NumpyBackend(object):
             t0 = time.time()
 
         # add inputs to graph
-        continuous = 'scipy' in solver
-        t = self.add_input_layer(inputs=inputs, T=T, continuous=continuous)
+        continuous = solver in continuous_solvers
+        t = self.add_input_layer(inputs=inputs, T=T, continuous=continuous,
+                                 interpolation=kwargs.pop('input_interpolation', 'linear'), dt=dt,
+                                 block_size=kwargs.pop('input_block_size', 1000))
+
+        # add noise to graph
+        noise_vars = kwargs.pop('noise_vars', [])
+        seed = kwargs.pop('seed', None)
+        noise_block_size = kwargs.pop('noise_block_size', 1000)
+        if solver in stochastic_solvers and noise_vars:
+            self.add_noise_layer(noise_vars, dt=dt, block_size=noise_block_size, seed=seed)
+        else:
+            self._noise = None
 
         if verbose:
             print("    ...user-defined inputs have been added to the model.")
@@ -1037,26 +1370,74 @@ class NumpyBackend(object):
         # map layers that need to be executed to compiled network structure
         decorator = kwargs.pop('decorator', None)
         decorator_kwargs = kwargs.pop('decorator_kwargs', {})
-        rhs_func, args, state_vars, var_map = self.compile(self._build_dir, decorator=decorator, **decorator_kwargs)
+        fused_loop = kwargs.pop('fused_loop', False)
+        out_sink = kwargs.pop('out_sink', None)
+        self._out_sink = get_output_sink(out_sink) if out_sink is not None else None
+        if profile == 'ops':
+            decorator_kwargs = dict(decorator_kwargs, profile_ops=True)
+        compile_report = kwargs.pop('compile_report', None)
+        if compile_report:
+            compile_report.reset_timer()
+        rhs_func, args, state_vars, var_map = self.compile(self._build_dir, decorator=decorator, fused_loop=fused_loop,
+                                                           solver=solver, preallocate=kwargs.pop('preallocate', False),
+                                                           **decorator_kwargs)
+        if compile_report:
+            compile_report.add_phase('code_generation')
+
+        # input sources, checkpoints and events are handled by the integration loop of `_integrate`
+        fixed_step = not (self._loop_func or solver == 'scipy' or 'e' in rk_tableaus.get(solver, {}))
+        if self._input_sources and not fixed_step:
+            raise ValueError(f'Input sources are only available for the native solvers with a fixed step-size and '
+                             f'without fused integration loop. Please choose another solver than `{solver}`, disable '
+                             f'`fused_loop` or pass the inputs as arrays.')
+
+        # prepare checkpoints
+        checkpoint = kwargs.pop('checkpoint', None)
+        checkpoint_interval = kwargs.pop('checkpoint_interval', None)
+        self._resume = kwargs.pop('resume', None)
+        if (checkpoint or self._resume) and not fixed_step:
+            raise ValueError(f'Checkpoints are only available for the native solvers with a fixed step-size and '
+                             f'without fused integration loop. Please choose another solver than `{solver}` or '
+                             f'disable `fused_loop`.')
+        if (checkpoint or self._resume) and not self._out_sink:
+            raise ValueError('Checkpoints require an output sink that persists the collected output samples. Please '
+                             'pass an output sink via `out_sink`.')
+        self._checkpoint = (checkpoint, int(np.round(checkpoint_interval / dt, decimals=0)) if checkpoint_interval
+                            else None) if checkpoint else None
+
+        # prepare events
+        events = kwargs.pop('events', None)
+        if events and not fixed_step:
+            raise ValueError(f'Events are only available for the native solvers with a fixed step-size and without '
+                             f'fused integration loop. Please choose another solver than `{solver}` or disable '
+                             f'`fused_loop`.')
+        self._events = []
+        for event, event_vars in (events if events else []):
+            event = get_event(event)
+            event.open(np.asarray(self._get_state_indices(event_vars), dtype=np.int64) if event_vars else None)
+            self._events.append(event)
 
         if verbose:
             print("    ...the run function has been compiled.")
 
-        # create output indices
-        output_indices = []
+        # create a single, flat index into the state vector for all output variables and a map from the output keys
+        # to the respective columns of the results
+        output_indices, output_columns = [], {}
         if outputs:
             for out_key, out_vars in outputs.items():
-                for n, (idx, _) in enumerate(out_vars):
-                    output_indices.append([i-self.idx_start for i in idx] if type(idx) is list else idx-self.idx_start)
-                    outputs[out_key][n][0] = len(output_indices)-1
+                col_start = len(output_indices)
+                output_indices += self._get_state_indices(out_vars)
+                output_columns[out_key] = (col_start, len(output_indices))
         else:
             for i in range(len(self.state_vars)):
                 output_indices.append(i)
+                output_columns[self.state_vars[i]] = (i, i+1)
                 out_key = self.state_vars[i]
                 if len(self.vars[out_key].shape) > 0:
                     outputs[out_key] = [(i, [f"{out_key}_{j}" for j in range(self.vars[out_key].shape[0])])]
                 else:
                     outputs[out_key] = [(i, [out_key])]
+        output_indices = np.asarray(output_indices, dtype=np.int64)
 
         # simulate backend behavior for each time-step
         func_args = self._process_func_args(args, var_map, dt)
@@ -1073,12 +1454,29 @@ class NumpyBackend(object):
         # output storage and clean-up
         #############################
 
-        # store output variables in output dictionary
-        for i, (out_key, out_vars) in enumerate(outputs.items()):
-            node_col = []
-            for _, node_keys in out_vars:
-                node_col += node_keys
-            outputs[out_key] = (np.asarray(results[i]), node_col)
+        # collect output variables in a single array of shape (samples, n_outputs)
+        if results is not None and not (isinstance(results, np.ndarray) and results.ndim == 2):
+            results = np.concatenate([np.reshape(r, (np.shape(r)[0], -1)) for r in results], axis=1)
+
+        # pass output variables to the output sink
+        if self._out_sink:
+            if results is not None:
+                self._out_sink.open(times[:results.shape[0]], results.shape[1])
+                for idx in range(0, results.shape[0], self._out_sink.chunk_size):
+                    self._out_sink.write(results[idx:idx+self._out_sink.chunk_size])
+            columns = []
+            for out_key, out_vars in outputs.items():
+                columns += [(out_key,) + tuple(node_key.split('/')) for node_key in self._get_output_keys(out_vars)]
+            self._out_sink.close(columns)
+            outputs, self._out_sink = self._out_sink, None
+            if profile:
+                return outputs, times, time.time() - t0
+            return outputs, times
+
+        # store output variables in output dictionary (as views on the columns of the results array)
+        for out_key, out_vars in outputs.items():
+            col_start, col_stop = output_columns[out_key]
+            outputs[out_key] = (results[:, col_start:col_stop], self._get_output_keys(out_vars))
 
         # store profiling results
         if profile:
@@ -1270,8 +1668,15 @@ class NumpyBackend(object):
 
                 # for assign operations with index, apply index temporarily and broadcast rhs to match indexed lhs
                 arg1_tmp = self._create_op('index', 'test_idx', args[0], args[2])
-                args_tmp = self.broadcast(arg1_tmp, args[1])
-                args_new = (args[0], args_tmp[1], args[2])
+                if not tuple(arg1_tmp.shape) and hasattr(args[1], 'shape') and all(s == 1 for s in args[1].shape):
+
+                    # squeeze single-entry updates of single entries (state variables that are extracted from the
+                    # state vector are scalars at run time, such that they cannot be indexed)
+                    args_new = (args[0], self.add_op('squeeze', args[1]), args[2])
+
+                else:
+                    args_tmp = self.broadcast(arg1_tmp, args[1])
+                    args_new = (args[0], args_tmp[1], args[2])
 
             else:
 
@@ -1377,20 +1782,47 @@ class NumpyBackend(object):
 
         return output_col
 
-    def add_input_layer(self, inputs: list, T: float, continuous=True) -> NumpyVar:
-        """
+    def add_input_layer(self, inputs: list, T: float, continuous=True, interpolation: str = 'linear',
+                        dt: Optional[float] = None, block_size: int = 1000) -> NumpyVar:
+        """Adds a layer to the beginning of the graph that applies extrinsic inputs to their target variables and
+        creates the time variable.
 
         Parameters
         ----------
         inputs
+            List of tuples, each containing an input array (time in the first dimension), the target variable and the
+            indices of the target variable the input is applied to (or None).
         T
+            Simulation time.
         continuous
+            If true, inputs are looked up at arbitrary points in time on the uniform time grid of the input arrays
+            (which spans the simulation time). Else, the input arrays are indexed via an integration step counter.
+        interpolation
+            Only relevant if `continuous` is true. Lookup of inputs between the points of the time grid: 'linear' for
+            piecewise-linear interpolation, 'zoh' for a zero-order hold.
+        dt
+            Integration step-size. Only required for inputs that are provided via `input_sources.InputSource`
+            instances.
+        block_size
+            Number of integration steps for which the samples of `input_sources.InputSource` instances are kept in
+            memory at once. If any of the inputs is an input source, all inputs are stored in buffers that are refilled
+            by the native solvers via `_fill_inputs`.
 
         Returns
         -------
+        NumpyVar
+            Time variable.
 
         """
 
+        if interpolation not in ('linear', 'zoh'):
+            raise ValueError(f'Invalid input interpolation: {interpolation}. Please choose `linear` or `zoh`.')
+
+        # apply inputs to contiguous indices of their target variables via slices instead of index lists
+        if inputs:
+            inputs = [(inp, target_var, f"{idx[0]}:{idx[-1]+1}" if type(idx) is list and len(idx) and
+                       list(idx) == list(range(idx[0], idx[-1]+1)) else idx) for inp, target_var, idx in inputs]
+
         # add inputs to graph
         if self._input_layer_added:
             self.bottom_layer()
@@ -1401,12 +1833,79 @@ class NumpyBackend(object):
         t = self.add_var('state_var', name='t', value=0.0, dtype=self._float_def, shape=())
         self.lhs_vars.append(t.short_name)
 
-        if inputs:
+        self._input_sources = None
+        if inputs and any(isinstance(inp, InputSource) for inp, _, _ in inputs):
+
+            # inputs are provided block-wise by input sources: all inputs are stored in buffers for `block_size`
+            # integration steps
+            sources = [inp if isinstance(inp, InputSource) else get_input_source(inp) for inp, _, _ in inputs]
+            for source in sources:
+                source.open(T)
+
+            if continuous:
+
+                # each buffer covers the time grid of its input from its time offset on and contains at least one
+                # additional sample in each direction, as required for the interpolation. Inputs may differ in their
+                # number of samples and thus receive their own time scale and offset.
+                lookup_op = 'interpolate_uniform' if interpolation == 'linear' else 'hold_uniform'
+                scale_val = [(source.n_samples - 1) / T for source in sources]
+                in_idx = []
+
+            else:
+
+                # the buffers are indexed via a counting index that is reset each time the buffers are refilled
+                scale_val, n_rows = None, block_size
+                in_idx = self.add_var(vtype='state_var', name='in_block_idx', dtype='int32', shape=(1,), value=0,
+                                      scope="network_inputs")
+
+            buffers = []
+            for i, (source, (_, target_var, idx)) in enumerate(zip(sources, inputs)):
+
+                # create unique name of input buffer
+                in_name_tmp = f"{target_var.short_name}_inp"
+                counter = 0
+                in_name = in_name_tmp
+                while in_name in self._input_names:
+                    in_name = f"{in_name_tmp}_{counter}"
+                    counter += 1
+                self._input_names.append(in_name)
+
+                # create input buffer and the operator that applies the current input to the target variable
+                if continuous:
+                    n_rows = int(np.ceil(block_size * dt * scale_val[i])) + 3
+                    scale = self.add_var(vtype='constant', name=f'{in_name}_time_scale', value=scale_val[i],
+                                         dtype='float64', scope="network_inputs")
+                    in_idx.append(self.add_var(vtype='state_var', name=f'{in_name}_time_offset', value=0.0,
+                                               dtype='float64', shape=(), scope="network_inputs"))
+                shape = (n_rows,) if source.n_columns == 1 else (n_rows, source.n_columns)
+                buffer = self.add_var(vtype='state_var', name=f"network_inputs/{in_name}", scope="network_inputs",
+                                      value=np.zeros(shape, dtype=self._float_def))
+                if continuous:
+                    in_var = self.add_op(lookup_op, buffer, t, scale, in_idx[i], scope="network_inputs")
+                else:
+                    in_var = self.add_op('index', buffer, in_idx, scope="network_inputs")
+                if idx:
+                    self.add_op('=', target_var, in_var, idx, scope="network_inputs")
+                else:
+                    self.add_op('=', target_var, in_var, scope="network_inputs")
+                buffers.append(buffer)
+
+            if not continuous:
+
+                # create increment operator for counting index
+                in_step = self.add_var('constant', name='in_block_idx_increment', value=np.ones((1,), dtype='int32'),
+                                       scope="network_inputs")
+                self.add_op('+=', in_idx, in_step, scope="network_inputs")
+
+            self._input_sources = (sources, buffers, in_idx, scale_val, block_size)
+
+        elif inputs:
 
             if continuous:
 
-                from scipy.interpolate import interp1d
-                time = np.linspace(0, T, inputs[0][0].shape[0])
+                # inputs are looked up via index arithmetic on a uniform time grid from 0 to T (with a time scale for
+                # each input, as inputs may differ in their number of samples)
+                lookup_op = 'interpolate_uniform' if interpolation == 'linear' else 'hold_uniform'
 
                 for (inp, target_var, idx) in inputs:
 
@@ -1419,13 +1918,15 @@ class NumpyBackend(object):
                         counter += 1
                     self._input_names.append(in_name)
 
-                    # create interpolation operator
+                    # create lookup operator (multi-stage solvers may evaluate inputs slightly beyond the simulation
+                    # time due to rounding errors, for which the boundary values of the input are used)
                     if len(inp.shape) > 1:
-                        inp = inp.squeeze()
-                    f = interp1d(time, inp, axis=0, copy=False, kind='linear')
-                    f.shape = inp.shape[1:]
-                    f = self.add_var(vtype='state_var', name=f"network_inputs/{in_name}", value=f)
-                    in_var_interp = self.add_op('interpolate', f, t, scope="network_inputs")
+                        inp = inp.squeeze(axis=tuple(i for i in range(1, len(inp.shape)) if inp.shape[i] == 1))
+                    in_var = self.add_var(vtype='state_var', name=f"network_inputs/{in_name}", scope="network_inputs",
+                                          value=inp)
+                    scale = self.add_var(vtype='constant', name=f'{in_name}_time_scale', value=(inp.shape[0] - 1) / T,
+                                         dtype='float64', scope="network_inputs")
+                    in_var_interp = self.add_op(lookup_op, in_var, t, scale, scope="network_inputs")
 
                     # apply input to target variable
                     if idx:
@@ -1468,6 +1969,99 @@ class NumpyBackend(object):
 
         return t
 
+    def add_noise_layer(self, noise_vars: list, dt: float, block_size: int = 1000, seed: Optional[int] = None) -> None:
+        """Adds operations to the input layer that set each noise variable to a sample of Gaussian white noise at each
+        integration step. Noise samples are stored in buffers for `block_size` steps, which are refilled by the
+        stochastic solvers via `_draw_noise`. Has to be called after `add_input_layer`.
+
+        Parameters
+        ----------
+        noise_vars
+            Noise variables of the network.
+        dt
+            Integration step-size. The standard normal noise samples are scaled by `1/sqrt(dt)`, such that the Euler
+            step `dt * noise` is a Wiener increment.
+        block_size
+            Number of integration steps for which noise samples are drawn at once.
+        seed
+            Seed of the random number generator.
+
+        Returns
+        -------
+        None
+
+        """
+
+        # create counting index for the noise buffers
+        noise_idx = self.add_var(vtype='state_var', name='noise_idx', dtype='int32', shape=(1,), value=0,
+                                 scope="network_inputs")
+
+        buffers = []
+        for var in noise_vars:
+
+            # create unique name of noise buffer
+            buffer_name_tmp = f"{var.short_name}_noise"
+            counter = 0
+            buffer_name = buffer_name_tmp
+            while buffer_name in self._input_names:
+                buffer_name = f"{buffer_name_tmp}_{counter}"
+                counter += 1
+            self._input_names.append(buffer_name)
+
+            # create noise buffer and apply its current sample to the noise variable
+            buffer = self.add_var(vtype='state_var', name=f"network_inputs/{buffer_name}", scope="network_inputs",
+                                  value=np.zeros((block_size,) + tuple(var.shape), dtype=var.dtype))
+            buffer_indexed = self.add_op('index', buffer, noise_idx, scope="network_inputs")
+            self.add_op('=', var, buffer_indexed, scope="network_inputs")
+            buffers.append(buffer)
+
+        # create increment operator for counting index
+        noise_step = self.add_var('constant', name='noise_idx_increment', value=np.ones((1,), dtype='int32'),
+                                  scope="network_inputs")
+        self.add_op('+=', noise_idx, noise_step, scope="network_inputs")
+
+        self._noise = (buffers, noise_idx, np.random.default_rng(seed), block_size, 1 / np.sqrt(dt))
+
+    def add_batch_dim(self, n_batch: int, values: Optional[list] = None) -> None:
+        """Adds a batch dimension to the compiled model, such that `n_batch` parametrizations of the model are simulated
+        in parallel. The state vector receives the shape `(n_state, n_batch)`, i.e. a trailing batch axis, on which it
+        is advanced as a whole by each integration step. It is passed to the solvers as a flat vector and re-shaped at
+        the beginning of the right-hand side evaluation, such that the state variables and their derivatives are
+        views with a trailing batch axis as well. Since the model equations index and combine their variables along
+        the leading (node) axes only, they apply to all batch members without any changes. The parameters are expanded
+        at compile time (see `_get_batch_values`). Has to be called after all equations have been parsed.
+
+        Parameters
+        ----------
+        n_batch
+            Number of batch members.
+        values
+            List of tuples, each containing a backend variable (a parameter or the state vector `y`), the indices of
+            the variable the batched values apply to (or None for all entries) and a sequence with one value per batch
+            member.
+
+        Returns
+        -------
+        None
+
+        """
+
+        batch_values = []
+        y = self.vars['y']
+        y_batch = np.repeat(np.asarray(y)[:, None], n_batch, axis=1)
+        for var, idx, val in (values if values else []):
+            val = np.asarray(val)
+            if val.shape != (n_batch,):
+                raise ValueError(f'Wrong number of batched values for variable {var.short_name}. Expected {n_batch} '
+                                 f'values (one per batch member), but received {val.shape[0] if val.ndim else 1}.')
+            if var is y:
+                y_batch[self._get_state_indices([(idx, None)], batched=False)] = val
+            else:
+                batch_values.append((var, idx, val))
+        self.vars['y'], _ = self._create_var(vtype=y.vtype, dtype=y.dtype, shape=None, value=y_batch.reshape(-1),
+                                             name=y.name, squeeze=False)
+        self._batch = (n_batch, batch_values)
+
     def next_layer(self) -> None:
         """Jump to next layer in stack. If we are already at end of layer stack, add new layer to the stack and jump to
         that.
@@ -1541,8 +2135,9 @@ class NumpyBackend(object):
         self.var_counter = 0
         self.layer = 0
         rmtree(self._build_dir)
-        if 'rhs_func' in sys.modules:
-            del sys.modules['rhs_func']
+        if self._module is not None and sys.modules.get(self._module.__name__, None) is self._module:
+            del sys.modules[self._module.__name__]
+        self._module = None
 
     def get_layer(self, idx) -> list:
         """Retrieve layer from graph.
@@ -1587,7 +2182,9 @@ class NumpyBackend(object):
         """
         return self.vars[var].numpy()
 
-    def compile(self, build_dir: Optional[str] = None, decorator: Optional[Callable] = None, **kwargs) -> tuple:
+    def compile(self, build_dir: Optional[str] = None, decorator: Optional[Callable] = None, fused_loop: bool = False,
+                solver: str = 'euler', profile_ops: bool = False, preallocate: bool = False,
+                **kwargs) -> tuple:
         """Compile the graph layers/operations. Creates python files containing the functions in each layer.
 
         Parameters
@@ -1596,6 +2193,24 @@ class NumpyBackend(object):
             Directory in which to create the file structure for the simulation.
         decorator
             Decorator function that should be applied to the right-hand side evaluation function.
+        fused_loop
+            If true, an additional function `run_loop` will be generated that contains the full time-stepping loop
+            (state updates, sampling and output collection). The decorator will be applied to this function as well,
+            such that the whole integration can be compiled as a single unit (e.g. via `numba.njit`).
+        solver
+            Numerical solver that will be used for the simulation. For the native runge-kutta solvers (see
+            `rk_tableaus`), an additional function `step_eval` will be generated that evaluates all stages of the
+            solver and returns the weighted right-hand side update (as well as the local error estimate for embedded
+            schemes and the last stage for schemes with the first-same-as-last property, which receive it as their
+            first stage at the next step). The decorator will be applied to this function as well.
+        profile_ops
+            If true, the equations of the right-hand side evaluation are grouped by their operator scope (e.g.
+            `node/op` or `node/edge_from_source`) and each group is wrapped in timing counters. The cumulative time
+            and the number of evaluations per operator can be retrieved via `get_op_profile` after the simulation.
+        preallocate
+            If true, the results of numpy ufuncs and inner products are written into work arrays that are allocated
+            once and passed to the right-hand side evaluation as additional parameters (e.g. `np.add(a, b, out=buf)`),
+            instead of allocating new arrays at each evaluation (see `optimization.preallocate_buffers`).
         kwargs
             decorator keyword arguments
 
@@ -1609,6 +2224,24 @@ class NumpyBackend(object):
         # preparations
         ##############
 
+        tableau = rk_tableaus.get(solver, None)
+        if fused_loop and tableau and 'e' in tableau:
+            raise ValueError(f'Fused integration loops are only available for solvers with a fixed step-size. Please '
+                             f'choose another solver than `{solver}` or set `fused_loop` to False.')
+        if fused_loop and solver in stochastic_solvers:
+            raise ValueError(f'Fused integration loops are not available for stochastic solvers. Please choose another '
+                             f'solver than `{solver}` or set `fused_loop` to False.')
+        if profile_ops and (fused_loop or decorator):
+            raise ValueError('Operator profiling is only available for pure python right-hand side evaluations. Please '
+                             'disable `fused_loop` and remove the function decorator.')
+        if preallocate and decorator:
+            raise ValueError('Preallocated work arrays are only available for pure python right-hand side evaluations. '
+                             'Please remove the function decorator or set `preallocate` to False.')
+        if decorator and any(issparse(var) for var in self.vars.values()):
+            raise ValueError('Sparse edge weight matrices are only available for pure python right-hand side '
+                             'evaluations. Please remove the function decorator or compile the network with '
+                             '`sparse_edges=None`.')
+
         # remove empty layers and operators
         new_layer_idx = 0
         for layer_idx, layer in enumerate(self.layers.copy()):
@@ -1620,10 +2253,6 @@ class NumpyBackend(object):
             else:
                 new_layer_idx += 1
 
-        # remove previously imported rhs_funcs from system
-        if 'rhs_func' in sys.modules:
-            del sys.modules['rhs_func']
-
         # collect state variable and parameter vectors
         state_vars, params, var_map = self._process_vars()
 
@@ -1635,6 +2264,114 @@ class NumpyBackend(object):
                 var.args[0] = y
                 var.build_op(var.args)
 
+        # collect code lines of the right-hand side evaluation
+        ######################################################
+
+        # add equations
+        equation_lines = []
+        equation_scopes = []
+        for i, layer in enumerate(self.layers):
+            for j, op in enumerate(layer):
+                equation_lines.append(op.value)
+                equation_scopes.append(op.name.rsplit('/', 1)[0])
+
+        # expand the parameters of batched models by a batch axis (see `add_batch_dim`)
+        batch_values = self._get_batch_values(params, equation_lines) if self._batch else {}
+
+        # remove equations that neither the state derivatives nor the inputs depend on, fold subexpressions on
+        # constants into additional parameters and share repeated subexpressions
+        y_delta = self.vars['y_delta'].short_name
+        variables = {var.short_name for _, var in params + state_vars} | {'t', 'y', 'y_batch', 'params'}
+        namespace = {}
+        for import_line in self._imports:
+            exec(import_line, namespace)
+        op_names = {}
+        for op in self.ops.values():
+            op_names.setdefault(op['call'], op['name'])
+        new_params, used_names = [], None
+        if self._optimize_rhs:
+            roots = {y_delta} | {extract_lhs_var(line) for line, scope in zip(equation_lines, equation_scopes)
+                                 if scope == 'network_inputs'}
+            equation_lines, equation_scopes = eliminate_dead_code(equation_lines, equation_scopes, roots=roots,
+                                                                  variables=variables)
+            constants = {var.short_name: batch_values.get(id(var), var) for _, var in params
+                         if var.vtype == 'constant'}
+            constants.pop(y_delta, None)
+            equation_lines, equation_scopes, new_params = optimize_equations(
+                equation_lines, equation_scopes, constants=constants, variables=variables, namespace=namespace,
+                name_func=lambda func: op_names.get(func, 'expr'))
+            used_names = get_names(equation_lines) | {y_delta}
+
+        # declare constants (parameters that are not used by any equation are removed from the parameter vector)
+        args, constant_lines, updates = [], [], {}
+        for key, (vtype, idx) in var_map.copy().items():
+            if vtype == 'constant':
+                var = params[idx][1]
+                if used_names is not None and var.short_name not in used_names:
+                    var_map.pop(key)
+                    continue
+                var_map[key] = (vtype, len(args))
+                constant_lines.append(f"{var.short_name} = params[{len(args)}]")
+                if var.short_name != y_delta:
+                    updates[var.short_name] = len(args)
+                args.append(batch_values.get(id(var), var))
+        for name, val in new_params:
+            constant_lines.append(f"{name} = params[{len(args)}]")
+            args.append(val)
+
+        # extract state variables from input vector y (for batched models, from its view with a trailing batch axis)
+        state_lines, y_name = [], y.short_name
+        if self._batch:
+            n_batch = self._batch[0]
+            state_lines.append(f"y_batch = {y_name}.reshape(({y.shape[0] // n_batch}, {n_batch}))")
+        for key, (vtype, idx) in var_map.items():
+            var = self.get_var(key)
+            if vtype == 'state_var' and (used_names is None or var.short_name in used_names):
+                value = var.value
+                if self._batch and value.startswith(f"{y_name}["):
+                    value = f"y_batch{value[len(y_name):]}"
+                state_lines.append(f"{var.short_name} = {value}")
+
+        # the state derivatives are returned as a flat vector
+        y_delta_flat = f"{y_delta}.reshape({y.shape[0]})" if self._batch else y_delta
+
+        # write the results of ufuncs and inner products into work arrays that are passed as additional parameters
+        if preallocate:
+            values = {line.split(' = ')[0]: arg for line, arg in zip(constant_lines, args)}
+            y = self.vars['y']
+            if solver == 'scipy' or solver in implicit_solvers:
+                # these solvers evaluate the right-hand side on double precision state vectors
+                y = np.asarray(y, dtype=np.float64)
+            values.update(t=self.vars['t'] if 't' in self.vars else 0.0, y=y)
+            equation_lines, buffers = preallocate_buffers(equation_lines, values=values, variables=variables,
+                                                          namespace=namespace, init_lines=state_lines,
+                                                          name_func=lambda func: op_names.get(func, 'expr'))
+            for name, val in buffers:
+                constant_lines.append(f"{name} = params[{len(args)}]")
+                args.append(val)
+
+        # parameters that are changed by the equations are written back to the parameter vector
+        arg_updates = []
+        for line in equation_lines:
+            lhs = extract_lhs_var(line)
+            if lhs in updates and (lhs, updates[lhs]) not in arg_updates:
+                arg_updates.append((lhs, updates[lhs]))
+
+        # wrap consecutive equations of the same operator scope in timing counters
+        self._op_scopes = []
+        rhs_lines = equation_lines
+        if profile_ops:
+            rhs_lines = []
+            for idx, (line, scope) in enumerate(zip(equation_lines, equation_scopes)):
+                if idx == 0 or scope != equation_scopes[idx-1]:
+                    if scope not in self._op_scopes:
+                        self._op_scopes.append(scope)
+                        rhs_lines.append(f"op_profile[{self._op_scopes.index(scope)}, 1] += 1")
+                    rhs_lines.append("t_op = perf_counter()")
+                rhs_lines.append(line)
+                if idx == len(equation_lines)-1 or scope != equation_scopes[idx+1]:
+                    rhs_lines.append(f"op_profile[{self._op_scopes.index(scope)}, 0] += perf_counter() - t_op")
+
         # create rhs evaluation function
         ################################
 
@@ -1645,6 +2382,14 @@ class NumpyBackend(object):
             func_gen.add_linebreak()
         func_gen.add_linebreak()
 
+        # define timing counters (cumulative time and number of evaluations of each operator)
+        if profile_ops:
+            func_gen.add_code_line("from time import perf_counter")
+            func_gen.add_linebreak()
+            func_gen.add_code_line(f"op_profile = np.zeros(({len(self._op_scopes)}, 2))")
+            func_gen.add_linebreak()
+            func_gen.add_linebreak()
+
         # define function head
         func_gen.add_code_line("def rhs_eval(t, y, params):")
         func_gen.add_linebreak()
@@ -1652,77 +2397,241 @@ class NumpyBackend(object):
         func_gen.add_linebreak()
 
         # declare constants
-        args = [None for _ in range(len(params))]
         func_gen.add_code_line("# declare constants")
         func_gen.add_linebreak()
-        updates, indices = [], []
-        i = 0
-        for key, (vtype, idx) in var_map.items():
-            if vtype == 'constant':
-                var = params[idx][1]
-                func_gen.add_code_line(f"{var.short_name} = params[{idx}]")
-                func_gen.add_linebreak()
-                args[idx] = var
-                if var.short_name != "y_delta":
-                    updates.append(f"{var.short_name}")
-                    indices.append(i)
-                    i += 1
+        func_gen.add_code_lines(constant_lines)
         func_gen.add_linebreak()
 
         # extract state variables from input vector y
         func_gen.add_code_line("# extract state variables from input vector")
         func_gen.add_linebreak()
-        for key, (vtype, idx) in var_map.items():
-            var = self.get_var(key)
-            if vtype == 'state_var':
-                func_gen.add_code_line(f"{var.short_name} = {var.value}")
-                func_gen.add_linebreak()
+        func_gen.add_code_lines(state_lines)
         func_gen.add_linebreak()
 
         # add equations
         func_gen.add_code_line("# calculate right-hand side update of equation system")
         func_gen.add_linebreak()
-        arg_updates = []
-        for i, layer in enumerate(self.layers):
-            for j, op in enumerate(layer):
-                lhs = extract_lhs_var(op.value)
-                find_arg = [arg == lhs for arg in updates]
-                if any(find_arg):
-                    idx = find_arg.index(True)
-                    arg_updates.append((updates[idx], indices[idx]))
-                func_gen.add_code_line(op.value)
-                func_gen.add_linebreak()
+        func_gen.add_code_lines(rhs_lines)
         func_gen.add_linebreak()
 
-        # update parameters where necessary
+        # update parameters where necessary (the fused runge-kutta loop passes the parameters as a tuple of arrays,
+        # which are updated in place)
         func_gen.add_code_line("# update system parameters")
         func_gen.add_linebreak()
-        for upd, idx in arg_updates:
-            update_str = f"params[{idx}] = {upd}"
-            if f"    {update_str}" not in func_gen.code:
-                func_gen.add_code_line(update_str)
-                func_gen.add_linebreak()
+        if fused_loop and tableau:
+            func_gen.add_code_lines([f"params[{idx}][...] = {upd}" for upd, idx in arg_updates])
+        else:
+            func_gen.add_code_lines([f"params[{idx}] = {upd}" for upd, idx in arg_updates])
 
         # add return line
-        func_gen.add_code_line(f"return {self.vars['y_delta'].short_name}")
+        func_gen.add_code_line(f"return {y_delta_flat}")
         func_gen.add_linebreak()
+        func_gen.remove_indent()
+
+        # create runge-kutta step function
+        ##################################
+
+        if tableau:
+
+            func_gen.add_linebreak()
+            func_gen.add_linebreak()
 
-        # save rhs function to file
-        fname = f'{self._build_dir}/rhs_func'
-        with open(f'{fname}.py', 'w') as f:
-            f.writelines(func_gen.code)
-            f.close()
+            # define function head (schemes with the first-same-as-last property receive their first stage)
+            fsal = tableau.get('fsal', False)
+            func_gen.add_code_line(f"def step_eval(t, y, params, dt{', k0' if fsal else ''}):")
+            func_gen.add_linebreak()
+            func_gen.add_indent()
+            func_gen.add_linebreak()
 
-        # import function from file
-        exec(f"from rhs_func import rhs_eval", globals())
-        rhs_eval = globals().pop('rhs_eval')
+            # evaluate the stages of the runge-kutta scheme (right-hand side updates are written into the same
+            # parameter vector at each call and thus need to be copied)
+            func_gen.add_code_line("# evaluate stages of the runge-kutta scheme")
+            func_gen.add_linebreak()
+            n_stages = len(tableau['c'])
+            for i, (c, a) in enumerate(zip(tableau['c'], tableau['a'])):
+                if fsal and i == 0:
+                    continue
+                t_stage = f"t + {c}*dt" if c else "t"
+                y_stage = self._weighted_sum(a, 'k')
+                y_stage = f"y + dt*({y_stage})" if y_stage else "y"
+                copy = ".copy()" if i < n_stages-1 or fsal else ""
+                func_gen.add_code_line(f"k{i} = rhs_eval({t_stage}, {y_stage}, params){copy}")
+                func_gen.add_linebreak()
+            func_gen.add_linebreak()
+
+            # add return line
+            func_gen.add_code_line("# return weighted stage average")
+            func_gen.add_linebreak()
+            if fsal:
+                func_gen.add_code_line(f"return {self._weighted_sum(tableau['b'], 'k')}, "
+                                       f"{self._weighted_sum(tableau['e'], 'k')}, k{n_stages-1}")
+            elif 'e' in tableau:
+                func_gen.add_code_line(f"return {self._weighted_sum(tableau['b'], 'k')}, "
+                                       f"{self._weighted_sum(tableau['e'], 'k')}")
+            else:
+                func_gen.add_code_line(f"return {self._weighted_sum(tableau['b'], 'k')}")
+            func_gen.add_linebreak()
+            func_gen.remove_indent()
+
+        # create fused integration loop
+        ###############################
+
+        if fused_loop:
+
+            func_gen.add_linebreak()
+            func_gen.add_linebreak()
+
+            # define function head
+            func_gen.add_code_line("def run_loop(t, y, params, dt, steps, sampling_step, out_idx, results):")
+            func_gen.add_linebreak()
+            func_gen.add_indent()
+            func_gen.add_linebreak()
+
+            if tableau:
+
+                # define loop head
+                func_gen.add_code_line(f"# solve equation system via {solver} algorithm")
+                func_gen.add_linebreak()
+                func_gen.add_code_line("sampling_idx = 0")
+                func_gen.add_linebreak()
+                func_gen.add_code_line("for step in range(steps):")
+                func_gen.add_linebreak()
+                func_gen.add_indent()
+                func_gen.add_linebreak()
+
+                # update state variables
+                func_gen.add_code_line("# update state variables")
+                func_gen.add_linebreak()
+                func_gen.add_code_line("y += dt * step_eval(t, y, params, dt)")
+                func_gen.add_linebreak()
+                func_gen.add_code_line("t += dt")
+                func_gen.add_linebreak()
+                func_gen.add_linebreak()
+
+            else:
+
+                # declare constants
+                func_gen.add_code_line("# declare constants")
+                func_gen.add_linebreak()
+                func_gen.add_code_lines(constant_lines)
+                func_gen.add_linebreak()
+
+                # define loop head
+                func_gen.add_code_line("# solve equation system via explicit euler algorithm")
+                func_gen.add_linebreak()
+                func_gen.add_code_line("sampling_idx = 0")
+                func_gen.add_linebreak()
+                func_gen.add_code_line("for step in range(steps):")
+                func_gen.add_linebreak()
+                func_gen.add_indent()
+                func_gen.add_linebreak()
+
+                # evaluate right-hand side of equation system
+                func_gen.add_code_line("# extract state variables from input vector")
+                func_gen.add_linebreak()
+                func_gen.add_code_lines(state_lines)
+                func_gen.add_linebreak()
+                func_gen.add_code_line("# calculate right-hand side update of equation system")
+                func_gen.add_linebreak()
+                func_gen.add_code_lines(equation_lines)
+                func_gen.add_linebreak()
+
+                # update state variables
+                func_gen.add_code_line("# update state variables")
+                func_gen.add_linebreak()
+                func_gen.add_code_line("t += dt")
+                func_gen.add_linebreak()
+                func_gen.add_code_line(f"y += dt * {y_delta_flat}")
+                func_gen.add_linebreak()
+                func_gen.add_linebreak()
+
+            # collect outputs
+            func_gen.add_code_line("# collect outputs")
+            func_gen.add_linebreak()
+            func_gen.add_code_line("if step % sampling_step == 0:")
+            func_gen.add_linebreak()
+            func_gen.add_indent()
+            func_gen.add_code_line("results[sampling_idx, :] = y[out_idx]")
+            func_gen.add_linebreak()
+            func_gen.add_code_line("sampling_idx += 1")
+            func_gen.add_linebreak()
+            func_gen.remove_indent()
+            func_gen.remove_indent()
+            func_gen.add_linebreak()
+
+            # return updated time and parameters
+            func_gen.add_code_line("# return updated time and parameters")
+            func_gen.add_linebreak()
+            if tableau:
+                func_gen.add_code_line("return t, params")
+            else:
+                param_names = [line.split(' = ')[0] for line in constant_lines]
+                func_gen.add_code_line(f"return t, ({', '.join(param_names)}{',' if len(param_names) == 1 else ''})")
+            func_gen.add_linebreak()
+            func_gen.remove_indent()
+
+        # save rhs function to file (in the cache directory, modules are stored under a content-addressed name and
+        # only written if they do not exist yet)
+        source = func_gen.generate()
+        if self._cache_dir:
+            module_dir, module = self._cache_dir, self._get_module_name(source, decorator, **kwargs)
+            if decorator and getattr(decorator, '__module__', '').startswith('numba'):
+                kwargs.setdefault('cache', True)
+        else:
+            module_dir, module = self._build_dir, 'rhs_func'
+        fname = f'{module_dir}/{module}.py'
+        if module == 'rhs_func' or not os.path.exists(fname):
+            os.makedirs(module_dir, exist_ok=True)
+            fd, fname_tmp = mkstemp(suffix='.tmp', dir=module_dir)
+            with os.fdopen(fd, 'w') as f:
+                f.write(source)
+            os.replace(fname_tmp, fname)
+        self._module_name = module
+
+        # import function from file. Each compiled model receives its own module object, such that the functions and
+        # their decorated globals are not shared with other compiled models. Modules written to the build directory
+        # receive a unique name, whereas cached modules keep their content-addressed name, which allows numba to
+        # resolve the module when loading jit-compiled functions from its cache.
+        self._module = self._load_module(fname, f"{module}_{next(module_counter)}" if module == 'rhs_func' else module)
+        rhs_eval = self._module.rhs_eval
+        self._step_func = self._module.step_eval if tableau else None
+        self._loop_func = self._module.run_loop if fused_loop else None
 
         # apply function decorator
         if decorator:
+            func_globals = rhs_eval.__globals__
+            if self._step_func or self._loop_func:
+
+                # apply decorator to all pyrates functions that are called within the generated functions as well
+                for key, val in func_globals.copy().items():
+                    if callable(val) and getattr(val, '__module__', '') == 'pyrates.backend.funcs':
+                        func_globals[key] = decorator(val, **kwargs)
+
             rhs_eval = decorator(rhs_eval, **kwargs)
+            if self._step_func:
+                func_globals['rhs_eval'] = rhs_eval
+                self._step_func = decorator(self._step_func, **kwargs)
+                func_globals['step_eval'] = self._step_func
+            if self._loop_func:
+                self._loop_func = decorator(self._loop_func, **kwargs)
 
         return rhs_eval, args, state_vars, var_map
 
+    def get_op_profile(self) -> dict:
+        """Returns the timing counters of a model that was compiled with `profile_ops=True` (see `compile`).
+
+        Returns
+        -------
+        dict
+            Cumulative evaluation time (in seconds) and number of right-hand side evaluations for each operator scope,
+            sorted by the cumulative time in descending order.
+
+        """
+        if not self._op_scopes or not hasattr(self._module, 'op_profile'):
+            return {}
+        profile = {scope: (float(t), int(n)) for scope, (t, n) in zip(self._op_scopes, self._module.op_profile)}
+        return dict(sorted(profile.items(), key=lambda item: item[1][0], reverse=True))
+
     def broadcast(self, op1: Any, op2: Any, **kwargs) -> tuple:
         """Tries to match the shapes of op1 and op2 such that op can be applied.
 
@@ -1803,33 +2712,57 @@ class NumpyBackend(object):
         """
         return self.add_op('asarray', vars)
 
-    def to_file(self, fn: str):
-        """Writes backend to file
+    def to_file(self, fn: str, **kwargs) -> None:
+        """Writes the state vector of the backend together with additional state information to a file. The file is a
+        `.npz` archive, which stores all arrays as separate entries and the remaining state information as JSON
+        string, such that it can be loaded without unpickling (i.e. without executing code from the file). The file is
+        replaced atomically, such that an interrupted write never corrupts an existing file.
 
         Parameters
         ----------
         fn
+            File name.
+        kwargs
+            Additional state information (e.g. simulation time and parameter values), which may consist of arrays,
+            numbers, strings, None and (nested) lists, tuples and dictionaries with string keys. Tuples are restored as
+            lists.
 
         Returns
         -------
+        None
 
         """
 
-        pass
+        arrays = {'y': np.array(self.vars['y'])}
+        meta = self._encode_state(kwargs, arrays)
+        with open(f"{fn}.tmp", 'wb') as f:
+            np.savez(f, __meta__=np.asarray(json.dumps(meta)), **arrays)
+        os.replace(f"{fn}.tmp", fn)
 
-    def from_file(self, fn: str):
-        """
+    def from_file(self, fn: str) -> dict:
+        """Loads a file written by `to_file` and sets the state vector of the backend to the stored state vector.
 
         Parameters
         ----------
         fn
+            File name.
 
         Returns
         -------
+        dict
+            Additional state information that was stored in the file.
 
         """
 
-        pass
+        with np.load(fn, allow_pickle=False) as f:
+            arrays = {key: f[key] for key in f.files}
+        state = self._decode_state(json.loads(str(arrays.pop('__meta__'))), arrays)
+        y = arrays['y']
+        if self.vars['y'].shape != y.shape:
+            raise ValueError(f'Wrong shape of the state vector stored in {fn}: {y.shape}. The state vector of the '
+                             f'backend has shape {self.vars["y"].shape}.')
+        self.vars['y'][:] = y
+        return state
 
     @staticmethod
     def eval(ops: list) -> list:
@@ -1893,11 +2826,43 @@ class NumpyBackend(object):
         # choose solver
         ###############
 
-        if solver == 'euler':
+        if solver in rk_tableaus and 'e' in rk_tableaus[solver]:
 
+            rhs_first = rhs_func if rk_tableaus[solver].get('fsal', False) else None
+            times, results = self._integrate_adaptive(step_func=self._step_func, func_args=func_args, T=T, dt=dt,
+                                                      dts=dts, t=t, output_indices=output_indices,
+                                                      rhs_func=rhs_first, **kwargs)
+
+        elif (solver == 'euler' or solver in rk_tableaus) and self._loop_func:
+
+            times, results = self._integrate_fused(func_args=func_args, T=T, dt=dt, dts=dts, t=t,
+                                                   output_indices=output_indices)
+
+        elif solver == 'euler' or solver in stochastic_solvers:
+
+            # stochastic solvers use the euler scheme as well, with the noise variables being set to new samples at
+            # each step (see `add_noise_layer`)
             times, results = self._integrate(rhs_func=rhs_func, func_args=func_args, T=T, dt=dt, dts=dts, t=t,
                                              output_indices=output_indices)
 
+        elif solver in implicit_solvers:
+
+            # the implicit step function returns the right-hand side update that corresponds to the solution of the
+            # implicit scheme, which can be integrated just like the right-hand side update of the euler scheme
+            step_func = self._get_implicit_step_func(rhs_func=rhs_func, func_args=func_args, t=float(t), dt=dt,
+                                                     solver=solver, **kwargs)
+            times, results = self._integrate(rhs_func=step_func, func_args=func_args, T=T, dt=dt, dts=dts, t=t,
+                                             output_indices=output_indices)
+
+        elif solver in rk_tableaus:
+
+            # the step function returns the weighted right-hand side update of the runge-kutta scheme, which can be
+            # integrated just like the right-hand side update of the euler scheme
+            step_func = self._step_func
+            times, results = self._integrate(rhs_func=lambda t_tmp, y, params: step_func(t_tmp, y, params, dt),
+                                             func_args=func_args, T=T, dt=dt, dts=dts, t=t,
+                                             output_indices=output_indices)
+
         elif solver == 'scipy':
 
             from scipy.integrate import solve_ivp
@@ -1907,9 +2872,15 @@ class NumpyBackend(object):
             if dts:
                 times = np.arange(0, T, dts)
                 kwargs['t_eval'] = times
+            if kwargs.pop('sparse_jac', False) and kwargs.get('method', None) in sparse_scipy_methods and \
+                    'jac' not in kwargs and 'jac_sparsity' not in kwargs:
+                from scipy.sparse import csr_matrix
+                n = self.vars['y'].shape[0]
+                rows, cols = self._get_jac_sparsity(fun, t=float(t.numpy()), y=self.vars['y'])
+                kwargs['jac_sparsity'] = csr_matrix((np.ones((len(rows),)), (rows, cols)), shape=(n, n))
             outputs = solve_ivp(fun=fun, t_span=(float(t.numpy()), T), y0=self.vars['y'], first_step=dt,
                                 **kwargs)
-            results = [outputs['y'].T[:, idx] for idx in output_indices]
+            results = outputs['y'].T[:, output_indices]
             times = outputs['t']
             self.vars['y'] = outputs['y'].T[:, -1]
 
@@ -1925,39 +2896,184 @@ class NumpyBackend(object):
         sampling_steps = int(np.round(T / dts, decimals=0))
         steps = int(np.round(T / dt, decimals=0))
 
-        # initialize results storage vectors
-        results = []
-        for i, idx in enumerate(output_indices):
-            if type(idx) is tuple:
-                var_dim = idx[1]-idx[0]
-            elif type(idx) is list:
-                if all(np.diff(idx, n=1) == 1):
-                    output_indices[i] = (idx[0], idx[-1]+1)
-                    var_dim = idx[-1]+1-idx[0]
-                else:
-                    var_dim = len(idx)
-            else:
-                var_dim = 1
-            results.append(np.zeros((sampling_steps, var_dim)))
+        # initialize results storage (only for a single chunk of samples, if an output sink is used)
+        sink = self._out_sink
+        buffer_steps = min(sink.chunk_size, sampling_steps) if sink else sampling_steps
+        results = np.zeros((buffer_steps, len(output_indices)))
+        if sink:
+            sink.open(np.arange(sampling_steps) * dts, len(output_indices), resume=bool(self._resume))
+
+        # continue from checkpoint
+        start_step, sampling_idx = 0, 0
+        if self._resume:
+            start_step = self._load_checkpoint(self._resume, func_args, t)
 
         # solve via pyrates internal explicit euler algorithm
         state_vars = self.vars['y']
-        sampling_idx = 0
-        for i in range(steps):
+        noise_block_size = self._noise[3] if self._noise else 0
+        input_block_size = self._input_sources[4] if self._input_sources else 0
+        checkpoint, checkpoint_steps = self._checkpoint if self._checkpoint else (None, None)
+        events = self._events
+        n_steps = steps
+        for i in range(start_step, steps):
+            if noise_block_size and i % noise_block_size == 0:
+                self._draw_noise()
+            if input_block_size and (i - start_step) % input_block_size == 0:
+                self._fill_inputs(i, float(t))
             deltas = rhs_func(t, state_vars, func_args)
             t += dt
             state_vars += dt * deltas
             if i % sampling_step == 0:
-                for idx1, idx2 in enumerate(output_indices):
-                    results[idx1][sampling_idx, :] = state_vars[idx2[0]:idx2[1]] if type(idx2) is tuple \
-                        else state_vars[idx2]
+                results[sampling_idx] = np.take(state_vars, output_indices)
                 sampling_idx += 1
+                if sink and sampling_idx == buffer_steps:
+                    sink.write(results)
+                    sampling_idx = 0
+            if events and self._update_events(events, float(t), state_vars, deltas):
+                n_steps = i+1
+                break
+            if checkpoint_steps and (i+1) % checkpoint_steps == 0 and i+1 < steps:
+                sampling_idx = self._write_checkpoint(checkpoint, func_args, t, i+1, results[:sampling_idx])
+        if checkpoint:
+            sampling_idx = self._write_checkpoint(checkpoint, func_args, t, n_steps, results[:sampling_idx])
 
         self.vars['y'] = state_vars
         times = np.arange(0, T, dts)
 
+        # a terminal event stopped the simulation early: only the samples until then are returned
+        if n_steps < steps:
+            times = times[:int(np.ceil(n_steps / sampling_step))]
+            if not sink:
+                results = results[:sampling_idx]
+
+        if sink:
+            if sampling_idx:
+                sink.write(results[:sampling_idx])
+            return times, None
         return times, results
 
+    def _integrate_adaptive(self, step_func, func_args, T, dt, dts, t, output_indices, rhs_func=None, rtol=1e-3,
+                            atol=1e-6, max_step=np.inf, safety=0.9, min_factor=0.2, max_factor=10.0):
+
+        # sampling points at which outputs are collected (after the first step, as for the fixed step-size solvers)
+        t0 = float(t)
+        times = np.arange(0, T, dts)
+        sampling_times = t0 + dt + times
+        t_end = max(t0 + T, sampling_times[-1]) if len(times) else t0 + T
+
+        # initialize results storage (only for a single chunk of samples, if an output sink is used)
+        sink = self._out_sink
+        buffer_steps = min(sink.chunk_size, len(times)) if sink else len(times)
+        results = np.zeros((buffer_steps, len(output_indices)))
+        if sink:
+            sink.open(times, len(output_indices))
+
+        def collect(y, sampling_idx):
+            buffer_idx = sampling_idx % buffer_steps
+            results[buffer_idx] = np.take(y, output_indices)
+            if sink and (buffer_idx == buffer_steps-1 or sampling_idx == len(times)-1):
+                sink.write(results[:buffer_idx+1])
+
+        # solve via pyrates internal embedded runge-kutta algorithm. The step-size is adapted based on the local error
+        # estimate and clipped such that the integration hits all sampling points exactly. For schemes with the
+        # first-same-as-last property, the right-hand side is only evaluated once at the initial state (`rhs_func`),
+        # and the last stage of each accepted step is used as the first stage of the next step.
+        state_vars = self.vars['y']
+        k_first = np.array(rhs_func(t0, state_vars, func_args)) if rhs_func else None
+        error_order = 1 / 5
+        h = dt
+        sampling_idx = 0
+        t_tmp = t0
+        while t_tmp < t_end:
+
+            # choose step-size
+            t_next = sampling_times[sampling_idx] if sampling_idx < len(times) else t_end
+            h = min(h, max_step)
+            h_step = min(h, t_next - t_tmp)
+            if h_step < 10 * np.finfo(float).eps * max(abs(t_tmp), 1.0):
+                raise ValueError(f'Step-size of the adaptive solver became too small at t = {t_tmp}. Please consider '
+                                 f'adjusting the error tolerances `rtol` and `atol` or using an implicit solver.')
+
+            # perform step and estimate local error
+            if k_first is None:
+                y_delta, y_error = step_func(t_tmp, state_vars, func_args, h_step)
+            else:
+                y_delta, y_error, k_last = step_func(t_tmp, state_vars, func_args, h_step, k_first)
+            y_new = state_vars + h_step * y_delta
+            scale = atol + rtol * np.maximum(np.abs(state_vars), np.abs(y_new))
+            error = np.sqrt(np.mean((h_step * y_error / scale) ** 2))
+
+            # accept or reject step
+            if error <= 1.0:
+                t_tmp = t_next if h_step == t_next - t_tmp else t_tmp + h_step
+                state_vars[:] = y_new
+                if k_first is not None:
+                    k_first = k_last
+                if sampling_idx < len(times) and t_tmp == sampling_times[sampling_idx]:
+                    collect(state_vars, sampling_idx)
+                    sampling_idx += 1
+                factor = max_factor if error == 0 else min(max_factor, safety * error ** -error_order)
+                h = max(h, h_step * factor) if h_step < h else h_step * factor
+            else:
+                h = h_step * max(min_factor, safety * error ** -error_order)
+
+        t[()] = t_tmp
+        self.vars['y'] = state_vars
+
+        return times, None if sink else results
+
+    def _integrate_fused(self, func_args, T, dt, dts, t, output_indices):
+
+        sampling_step = int(np.round(dts / dt, decimals=0))
+        sampling_steps = int(np.round(T / dts, decimals=0))
+        steps = int(np.round(T / dt, decimals=0))
+
+        # initialize results storage (only for a single chunk of samples, if an output sink is used)
+        sink = self._out_sink
+        buffer_steps = min(sink.chunk_size, sampling_steps) if sink else sampling_steps
+        results = np.zeros((buffer_steps, len(output_indices)))
+
+        # solve via the generated integration loop (a tuple of plain numpy arrays and scalars, such that it can be
+        # compiled as a whole). Runge-Kutta steps call the right-hand side evaluation function, which updates the
+        # parameter arrays in place, whereas the euler loop keeps the parameters as local variables. Both loops return
+        # the updated parameters, which are passed on to the next chunk and written back to the parameter vector.
+        state_vars = self.vars['y']
+        args = []
+        for arg in func_args:
+            if isinstance(arg, np.ndarray):
+                arg = np.asarray(arg)
+                if not arg.shape and not self._step_func:
+                    arg = arg[()]
+            args.append(arg)
+        args = tuple(args)
+
+        # the loop receives the time variable itself (as a 0-dimensional array), such that the time is advanced with
+        # its data type and the right-hand side is evaluated at the same times as in `_integrate`
+        time = np.asarray(t)
+        if sink:
+
+            # run the integration loop chunk-wise and pass each chunk of samples to the output sink
+            sink.open(np.arange(sampling_steps) * dts, len(output_indices))
+            chunk_steps = buffer_steps * sampling_step
+            for step in range(0, steps, chunk_steps):
+                n_steps = min(chunk_steps, steps - step)
+                t_new, args = self._loop_func(time, np.asarray(state_vars), args, dt, n_steps, sampling_step,
+                                              output_indices, results)
+                t[()] = t_new
+                sink.write(results[:int(np.ceil(n_steps / sampling_step))])
+
+        else:
+
+            t_new, args = self._loop_func(time, np.asarray(state_vars), args, dt, steps, sampling_step,
+                                          output_indices, results)
+            t[()] = t_new
+
+        func_args[:] = list(args)
+        self.vars['y'] = state_vars
+        times = np.arange(0, T, dts)
+
+        return times, None if sink else results
+
     def _match_shapes(self, op1: Any, op2: Any, adjust_second: bool = True) -> tuple:
         """Re-shapes op1 and op2 such that they can be combined via mathematical operations.
 
@@ -2064,10 +3180,10 @@ class NumpyBackend(object):
                 idx_str = ",".join([f"{idx.short_name}[:,{i}]" for i in range(idx.shape[1])])
                 args = (var, upd, idx_str, idx)
             return PyRatesAssignOp(self.ops[op]['call'], self.ops[op]['name'], name, *args,
-                                   idx_l=self.idx_l, idx_r=self.idx_r)
+                                   idx_l=self.idx_l, idx_r=self.idx_r, check=self._check_ops)
         elif op is "index":
             return PyRatesIndexOp(self.ops[op]['call'], self.ops[op]['name'], name, *args, idx_l=self.idx_l,
-                                  idx_r=self.idx_r)
+                                  idx_r=self.idx_r, check=self._check_ops)
         else:
             if op is "cast":
                 args = list(args)
@@ -2076,7 +3192,7 @@ class NumpyBackend(object):
                         args[1] = f"np.{dtype}"
                         break
                 args = tuple(args)
-            return PyRatesOp(self.ops[op]['call'], self.ops[op]['name'], name, *args)
+            return PyRatesOp(self.ops[op]['call'], self.ops[op]['name'], name, *args, check=self._check_ops)
 
     def _process_update_args_old(self, var, update, idx):
         """Preprocesses the index and a variable update to match the variable shape.
@@ -2210,6 +3326,434 @@ class NumpyBackend(object):
     def _is_state_var(self, key):
         return key, key in self.state_vars
 
+    @staticmethod
+    def _get_jac_sparsity(rhs_func: Callable, t: float, y: np.ndarray, n_probes: int = 3) -> tuple:
+        """Detects the sparsity pattern of the jacobian of the right-hand side function by perturbing each state variable
+        separately, at several randomly perturbed states around `y` (such that derivatives that vanish at a single state
+        are not missed). Since the pattern is detected numerically, dependencies that only show up at other states
+        (e.g. behind thresholds) can still be missed, which is why sparse jacobians have to be requested explicitly.
+
+        Parameters
+        ----------
+        rhs_func
+            Right-hand side function with the signature `rhs_func(t, y)`.
+        t
+            Time at which the sparsity pattern is detected.
+        y
+            State vector around which the sparsity pattern is detected.
+        n_probes
+            Number of perturbed states at which the sparsity pattern is detected.
+
+        Returns
+        -------
+        tuple
+            Row and column indices of the non-zero entries of the jacobian, sorted by rows.
+
+        """
+
+        n = y.shape[0]
+        y = np.asarray(y, dtype=np.float64)
+        f0 = np.array(rhs_func(t, y))
+        steps = np.sqrt(np.finfo(f0.dtype).eps) * np.maximum(1.0, np.abs(y))
+
+        rng = np.random.default_rng(0)
+        rows_col = [{col} for col in range(n)]
+        for probe in range(n_probes):
+            y_probe = y + 10.0**probe * steps * rng.uniform(1.0, 2.0, size=n) * rng.choice([-1.0, 1.0], size=n)
+            f_probe = np.array(rhs_func(t, y_probe))
+            h_probe = 1e3 * np.sqrt(np.finfo(f0.dtype).eps) * np.maximum(1.0, np.abs(y_probe))
+            for col in range(n):
+                y_tmp = y_probe.copy()
+                y_tmp[col] += h_probe[col]
+                rows_col[col] |= set(np.nonzero(np.asarray(rhs_func(t, y_tmp)) != f_probe)[0])
+        rows_col = [np.asarray(sorted(rows), dtype=np.int64) for rows in rows_col]
+
+        rows = np.concatenate(rows_col)
+        cols = np.concatenate([np.zeros_like(r) + col for col, r in enumerate(rows_col)])
+        order = np.lexsort((cols, rows))
+        return rows[order], cols[order]
+
+    @staticmethod
+    def _get_jacobian_func(rhs_func: Callable, t: float, y: np.ndarray, sparse: bool = False,
+                           n_probes: int = 3) -> Callable:
+        """Creates a function `jac_eval(t, y)` that evaluates the jacobian of the right-hand side function via forward
+        finite differences. By default, the jacobian is treated as dense matrix and each state variable is perturbed
+        separately. For sparse jacobians, the sparsity pattern is detected once (see `_get_jac_sparsity`) and all
+        structurally independent columns (i.e. state variables that do not affect the same right-hand side entries) are
+        grouped greedily and perturbed at once, such that a single jacobian evaluation requires one right-hand side
+        evaluation per group of independent columns instead of one per state variable.
+
+        Parameters
+        ----------
+        rhs_func
+            Right-hand side function with the signature `rhs_func(t, y)`.
+        t
+            Time at which the sparsity pattern is detected.
+        y
+            State vector at which the sparsity pattern is detected.
+        sparse
+            If true, the jacobian is returned as `scipy.sparse.csr_matrix` with a detected sparsity pattern, else as
+            dense array.
+        n_probes
+            Number of perturbed states at which the sparsity pattern is detected.
+
+        Returns
+        -------
+        Callable
+            Jacobian evaluation function `jac_eval(t, y)`.
+
+        """
+
+        from scipy.sparse import csr_matrix
+
+        n = y.shape[0]
+        eps = np.sqrt(np.finfo(np.asarray(rhs_func(t, np.asarray(y, dtype=np.float64))).dtype).eps)
+        steps = lambda y_tmp: eps * np.maximum(1.0, np.abs(y_tmp))
+
+        if not sparse:
+
+            def jac_eval(t_tmp, y_tmp):
+                f = np.array(rhs_func(t_tmp, y_tmp))
+                h = steps(y_tmp)
+                jac = np.zeros((n, n))
+                for col in range(n):
+                    y_perturbed = np.array(y_tmp, dtype=np.float64)
+                    y_perturbed[col] += h[col]
+                    jac[:, col] = (np.asarray(rhs_func(t_tmp, y_perturbed)) - f) / h[col]
+                return jac
+
+            return jac_eval
+
+        # create csr structure of the jacobian
+        rows, cols = NumpyBackend._get_jac_sparsity(rhs_func, t=t, y=y, n_probes=n_probes)
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n))])
+
+        # group structurally independent columns greedily: each column joins the first group that does not contain any
+        # column with a non-zero entry in the same row
+        col_group = np.zeros((n,), dtype=np.int64)
+        group_rows = []
+        for col in range(n):
+            col_rows = rows[cols == col]
+            for idx, occupied in enumerate(group_rows):
+                if not np.any(occupied[col_rows]):
+                    break
+            else:
+                idx = len(group_rows)
+                group_rows.append(np.zeros((n,), dtype=bool))
+            group_rows[idx][col_rows] = True
+            col_group[col] = idx
+        groups = [(np.nonzero(col_group == i)[0], np.nonzero(col_group[cols] == i)[0])
+                  for i in range(len(group_rows))]
+
+        def jac_eval(t_tmp, y_tmp):
+            f = np.array(rhs_func(t_tmp, y_tmp))
+            h = steps(y_tmp)
+            data = np.zeros((len(rows),))
+            for group_cols, entries in groups:
+                y_perturbed = np.array(y_tmp, dtype=np.float64)
+                y_perturbed[group_cols] += h[group_cols]
+                df = np.asarray(rhs_func(t_tmp, y_perturbed)) - f
+                data[entries] = df[rows[entries]] / h[cols[entries]]
+            return csr_matrix((data, cols, indptr), shape=(n, n))
+
+        return jac_eval
+
+    def _get_implicit_step_func(self, rhs_func: Callable, func_args: list, t: float, dt: float, solver: str,
+                                jac_update: int = 10, newton_tol: float = 1e-6, max_iter: int = 10,
+                                sparse_jac: bool = False) -> Callable:
+        """Creates the step function of an implicit solver, which returns the right-hand side update
+        `(y_next - y) / dt` for a step from `y` to the solution `y_next` of the implicit scheme. Both schemes solve
+        linear systems with the matrix `I - gamma*dt*J`, where `J` is the jacobian of the right-hand side (see
+        `_get_jacobian_func`). The jacobian and the LU factorization of this matrix are only refreshed every
+        `jac_update` steps.
+
+        Parameters
+        ----------
+        rhs_func
+            Right-hand side function.
+        func_args
+            Arguments of the right-hand side function.
+        t
+            Initial time.
+        dt
+            Integration step-size.
+        solver
+            Implicit scheme:
+            - 'backward_euler' solves the backward Euler equation `y_next = y + dt*f(t+dt, y_next)` via simplified
+              Newton iterations (1st order, L-stable).
+            - 'ros2' is the linearly implicit, two-stage Rosenbrock scheme of Verwer et al. (1999), which requires no
+              iterations and remains 2nd order for inexact (outdated) jacobians (L-stable).
+        jac_update
+            Number of steps after which the jacobian and its factorization are refreshed. For `backward_euler`, they
+            are refreshed as well if the Newton iterations do not converge.
+        newton_tol
+            Tolerance of the (scaled) Newton updates for `backward_euler`.
+        max_iter
+            Maximum number of Newton iterations for `backward_euler`.
+        sparse_jac
+            If true, the jacobian is treated as sparse matrix with a detected sparsity pattern (see
+            `_get_jacobian_func`).
+
+        Returns
+        -------
+        Callable
+            Step function with the same signature as the right-hand side function.
+
+        """
+
+        from scipy.linalg import lu_factor, lu_solve
+        from scipy.sparse import csc_matrix, identity, issparse
+        from scipy.sparse.linalg import splu
+
+        fun = lambda t_tmp, y_tmp: np.array(rhs_func(t_tmp, y_tmp, func_args), dtype=np.float64)
+        jac_eval = self._get_jacobian_func(fun, t=t, y=self.vars['y'], sparse=sparse_jac)
+        gamma = 1.0 if solver == 'backward_euler' else 1.0 + 1.0/np.sqrt(2.0)
+        n = self.vars['y'].shape[0]
+
+        # factorization of the iteration matrix, which is refreshed at the first step and every `jac_update` steps
+        lin_solve = [None]
+
+        def factorize(t_tmp, y_tmp):
+            jac = jac_eval(t_tmp, y_tmp)
+            if issparse(jac):
+                lu = splu(csc_matrix(identity(n, format='csc') - gamma * dt * jac))
+                lin_solve[0] = lu.solve
+            else:
+                lu = lu_factor(np.eye(n) - gamma * dt * jac)
+                lin_solve[0] = lambda b: lu_solve(lu, b)
+
+        step_idx = [0]
+
+        def backward_euler_step(t_tmp, y, params):
+            t_tmp, y = float(t_tmp), np.asarray(y, dtype=np.float64)
+            if step_idx[0] % jac_update == 0:
+                factorize(t_tmp, y)
+            step_idx[0] += 1
+
+            # simplified newton iterations, starting from the explicit euler prediction
+            for attempt in range(2):
+                y_next = y + dt * fun(t_tmp, y)
+                for _ in range(max_iter):
+                    y_delta = lin_solve[0](y + dt * fun(t_tmp + dt, y_next) - y_next)
+                    y_next += y_delta
+                    if np.sqrt(np.mean((y_delta / (1.0 + np.abs(y_next)))**2)) < newton_tol:
+                        return (y_next - y) / dt
+
+                # refresh the jacobian at the current state if the iterations did not converge
+                factorize(t_tmp, y)
+
+            raise ValueError(f'Newton iterations of the backward Euler solver did not converge at t = {t_tmp}. Please '
+                             f'consider reducing the step-size.')
+
+        def ros2_step(t_tmp, y, params):
+            t_tmp, y = float(t_tmp), np.asarray(y, dtype=np.float64)
+            if step_idx[0] % jac_update == 0:
+                factorize(t_tmp, y)
+            step_idx[0] += 1
+            k1 = lin_solve[0](fun(t_tmp, y))
+            k2 = lin_solve[0](fun(t_tmp + dt, y + dt * k1) - 2.0 * k1)
+            return 1.5 * k1 + 0.5 * k2
+
+        return backward_euler_step if solver == 'backward_euler' else ros2_step
+
+    @staticmethod
+    def _load_module(fn: str, name: str) -> Any:
+        """Loads a module from a file via `importlib`, without altering `sys.path`. The module is registered under
+        `name` in `sys.modules`, replacing previously loaded modules of the same name.
+        """
+        spec = importlib.util.spec_from_file_location(name, fn)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        return module
+
+    def _get_module_name(self, source: str, decorator: Optional[Callable] = None, **kwargs) -> str:
+        """Returns a content-addressed module name for the generated source code, i.e. a hash of the source code, the
+        backend type, the default float precision, the function decorator and its keyword arguments.
+        """
+        decorator_key = f"{getattr(decorator, '__module__', '')}.{getattr(decorator, '__qualname__', repr(decorator))}" \
+            if decorator else ""
+        key = "\n".join([type(self).__name__, str(self._float_def), decorator_key, repr(sorted(kwargs.items())),
+                         source])
+        return f"rhs_func_{hashlib.sha256(key.encode()).hexdigest()[:32]}"
+
+    def _get_state_indices(self, var_list: list, batched: bool = True) -> list:
+        """Returns the flat indices into the state vector of a list of variables (tuples of state vector indices and
+        node keys, as passed via `outputs` to `run`). For batched models (see `add_batch_dim`), the indices of all batch
+        members are returned (one batch member after the other), unless `batched` is false.
+        """
+        indices = []
+        for idx, _ in var_list:
+            if type(idx) is list:
+                indices += [i-self.idx_start for i in idx]
+            else:
+                indices.append(idx-self.idx_start)
+        if self._batch and batched:
+            n_batch = self._batch[0]
+            indices = [i*n_batch + k for k in range(n_batch) for i in indices]
+        return indices
+
+    def _get_output_keys(self, var_list: list) -> list:
+        """Returns the node keys of a list of variables (see `_get_state_indices`) in the order of their state vector
+        indices. For batched models, the node keys of each batch member are preceded by its label `batch_{idx}`.
+        """
+        node_keys = []
+        for _, keys in var_list:
+            node_keys += keys
+        if self._batch:
+            node_keys = [f"batch_{k}/{key}" for k in range(self._batch[0]) for key in node_keys]
+        return node_keys
+
+    def _get_batch_values(self, params: list, equation_lines: list) -> dict:
+        """Returns the values of the parameters of a batched model (see `add_batch_dim`), with the ids of the parameter
+        variables as keys. Floating point parameters that are changed by any of the equations or that take different
+        values across the batch receive a trailing batch axis, which contains the value of each batch member. All other
+        floating point vectors are shared by the batch members and receive a trailing axis of size one, such that they
+        broadcast against the batched variables, as do the input arrays (time in the first dimension) with more than
+        one column. Scalars, integer arrays (e.g. indices) and matrices (e.g. edge weight matrices) are shared as they
+        are, whereas noise buffers are replaced by buffers that contain independent samples for each batch member.
+        """
+
+        n_batch, batch_values = self._batch
+        changed = {extract_lhs_var(line).rstrip('+-*/') for line in equation_lines}
+        batched = {}
+        for var, idx, val in batch_values:
+            batched.setdefault(id(var), []).append((idx, val))
+        noise_buffers = [id(buffer) for buffer in self._noise[0]] if self._noise else []
+
+        values = {}
+        for _, var in params:
+            if callable(var) or issparse(var) or not np.issubdtype(var.dtype, np.inexact):
+                continue
+            value = np.asarray(var)
+            if id(var) in noise_buffers:
+                value = np.zeros(value.shape + (n_batch,), dtype=value.dtype)
+            elif var.short_name in changed or id(var) in batched:
+                value = np.repeat(value[..., None], n_batch, axis=-1)
+                for idx, val in batched.get(id(var), []):
+                    value[... if idx is None or value.ndim == 1 else idx] = val
+            elif var.name.startswith('network_inputs/') and value.ndim > 1:
+                value = value[..., None]
+            elif value.ndim == 1 and not var.name.startswith('network_inputs/'):
+                value = value[:, None]
+            else:
+                continue
+            values[id(var)] = value
+
+        # noise buffers are refilled via `_draw_noise`
+        if noise_buffers:
+            self._noise = ([values[id(buffer)] for buffer in self._noise[0]],) + self._noise[1:]
+
+        return values
+
+    @staticmethod
+    def _encode_state(state: Any, arrays: dict) -> Any:
+        """Converts state information into a JSON-compatible structure for `to_file`. Arrays are moved into `arrays`
+        and replaced by references to their keys.
+        """
+        if isinstance(state, np.ndarray):
+            key = f"arr_{len(arrays)}"
+            arrays[key] = state
+            return {'__array__': key}
+        if isinstance(state, np.generic):
+            return state.item()
+        if isinstance(state, dict):
+            return {str(key): NumpyBackend._encode_state(val, arrays) for key, val in state.items()}
+        if isinstance(state, (list, tuple)):
+            return [NumpyBackend._encode_state(val, arrays) for val in state]
+        if state is None or isinstance(state, (bool, int, float, str)):
+            return state
+        raise ValueError(f'Invalid type of state information: {type(state)}. Only arrays, numbers, strings, None and '
+                         f'(nested) lists, tuples and dictionaries of those can be written to file.')
+
+    @staticmethod
+    def _decode_state(state: Any, arrays: dict) -> Any:
+        """Inverse of `_encode_state`.
+        """
+        if isinstance(state, dict):
+            if set(state) == {'__array__'}:
+                return arrays[state['__array__']]
+            return {key: NumpyBackend._decode_state(val, arrays) for key, val in state.items()}
+        if isinstance(state, list):
+            return [NumpyBackend._decode_state(val, arrays) for val in state]
+        return state
+
+    @staticmethod
+    def _update_events(events: list, t: float, y: np.ndarray, dy: np.ndarray) -> bool:
+        """Updates all events with the current state. Returns true, if any of the events terminates the simulation.
+        """
+        terminate = False
+        for event in events:
+            terminate = event.update(t, y, dy) or terminate
+        return terminate
+
+    def _write_checkpoint(self, fn: str, func_args: list, t: NumpyVar, step: int, results: np.ndarray) -> int:
+        """Passes the collected but not yet flushed output samples to the output sink, which persists them, and writes
+        a snapshot of the simulation to a file: state vector, time, integration step, all parameters (which contain
+        delay buffers, input indices and noise buffers), random generator state and the states of the output sink and
+        the events. Returns the number of output samples that remain in the buffer (i.e. zero).
+        """
+        if results.shape[0]:
+            self._out_sink.write(results)
+        self.to_file(fn, t=float(t), step=step,
+                     params=[np.array(arg) if isinstance(arg, np.ndarray) else None for arg in func_args],
+                     rng=self._noise[2].bit_generator.state if self._noise else None,
+                     sink=self._out_sink.get_state() if self._out_sink else None,
+                     events=[event.get_state() for event in self._events])
+        return 0
+
+    def _load_checkpoint(self, fn: str, func_args: list, t: NumpyVar) -> int:
+        """Restores a snapshot written by `_write_checkpoint` and returns the integration step at which the simulation
+        is continued.
+        """
+        state = self.from_file(fn)
+        if len(state['params']) != len(func_args):
+            raise ValueError(f'The checkpoint {fn} does not match the compiled model: It contains '
+                             f'{len(state["params"])} parameters, but the model has {len(func_args)} parameters.')
+        for i, param in enumerate(state['params']):
+            if param is not None and isinstance(func_args[i], np.ndarray) and func_args[i].shape == param.shape:
+                func_args[i][...] = param
+            elif param is not None:
+                func_args[i] = param
+        t[()] = state['t']
+        if self._noise and state['rng']:
+            self._noise[2].bit_generator.state = state['rng']
+        if self._out_sink and state['sink']:
+            self._out_sink.set_state(state['sink'])
+        for event, event_state in zip(self._events, state.get('events', [])):
+            event.set_state(event_state)
+        return state['step']
+
+    def _fill_inputs(self, step: int, t: float) -> None:
+        """Refills the input buffers (see `add_input_layer`) with the samples of the input sources, starting at the
+        current integration step (discrete inputs) or at the current position on the time grid of the inputs
+        (continuous inputs). Buffers that reach beyond the end of an input are padded with its last sample.
+        """
+        sources, buffers, in_idx, scales, _ = self._input_sources
+        if scales is None:
+            in_idx[...] = 0
+        for i, (source, buffer) in enumerate(zip(sources, buffers)):
+            if scales is None:
+                start = step
+            else:
+                start = int(t * scales[i])
+                in_idx[i][...] = start
+            block = np.reshape(source.get(start, start + buffer.shape[0]), (-1,) + tuple(buffer.shape[1:]))
+            n = block.shape[0]
+            if n:
+                buffer[:n] = block
+                buffer[n:] = block[-1]
+
+    def _draw_noise(self):
+        buffers, noise_idx, rng, _, scale = self._noise
+        for buffer in buffers:
+            buffer[:] = rng.standard_normal(buffer.shape) * scale
+        noise_idx[...] = 0
+
+    @staticmethod
+    def _weighted_sum(weights, prefix):
+        return " + ".join([f"{w}*{prefix}{i}" for i, w in enumerate(weights) if w])
+
     @staticmethod
     def _process_func_args(args, var_map, dt):
         for key, var_info in var_map.items():
@@ -2278,6 +3822,13 @@ class CodeGen:
         """
         self.code.append("\t" * self.lvl + code_str)
 
+    def add_code_lines(self, code_strs):
+        """Add multiple code lines to code, each followed by a line-break.
+        """
+        for code_str in code_strs:
+            self.add_code_line(code_str)
+            self.add_linebreak()
+
     def add_linebreak(self):
         """Add a line-break to the code.
         """
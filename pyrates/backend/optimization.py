@@ -0,0 +1,670 @@
+# -*- coding: utf-8 -*-
+#
+#
+# PyRates software framework for flexible implementation of neural
+# network model_templates and simulations. See also:
+# https://github.com/pyrates-neuroscience/PyRates
+#
+# Copyright (C) 2017-2018 the original authors (Richard Gast and
+# Daniel Rose), the Max-Planck-Institute for Human Cognitive Brain
+# Sciences ("MPI CBS") and contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+# CITATION:
+#
+# Richard Gast and Daniel Rose et. al. in preparation
+"""Contains optimization passes over the equations of the generated right-hand side evaluation function
+`rhs_eval`. Equations are parsed into python syntax trees, which are transformed and turned back into code lines:
+
+- constant folding: subexpressions that depend on constants only are evaluated once at compile time and are passed to
+  `rhs_eval` as additional parameters.
+- common-subexpression elimination: subexpressions that are evaluated repeatedly with identical arguments are
+  evaluated once and stored in temporary variables.
+- dead-code elimination: equations that neither the state derivatives nor the inputs depend on are removed.
+- buffer preallocation: results of numpy ufuncs and inner products are written into arrays that are allocated once and
+  passed to `rhs_eval` as additional parameters, instead of allocating new arrays at each evaluation.
+
+"""
+
+# external imports
+from typing import Optional, Callable
+from collections import Counter
+from copy import deepcopy
+from numbers import Number
+import numpy as np
+import ast
+import re
+
+# meta infos
+__author__ = "Richard Gast"
+__status__ = "development"
+
+# syntax tree nodes that can be folded or shared between equations
+_expression_nodes = (ast.Call, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.Subscript)
+
+# function names that indicate non-deterministic functions, which must be evaluated at each call
+_impure_calls = ('rand', 'random')
+
+
+def optimize_equations(lines: list, scopes: list, constants: dict, variables: set, namespace: dict,
+                       name_func: Optional[Callable] = None, fold_constants: bool = True, eliminate_cse: bool = True
+                       ) -> tuple:
+    """Applies constant folding and common-subexpression elimination to the equations of a right-hand side evaluation
+    function.
+
+    Parameters
+    ----------
+    lines
+        Code lines of the equations, in the order of their evaluation.
+    scopes
+        Operator scope of each code line (see `NumpyBackend.compile`).
+    constants
+        Values of all parameters of the function that have been declared as constants, with their names as keys.
+        Constants that are changed by any of the equations are not folded.
+    variables
+        Names of all local variables of the function (state variables, parameters and function arguments). Any other
+        name is considered a global (e.g. an imported module or function).
+    namespace
+        Global namespace of the generated module, in which the folded subexpressions are evaluated.
+    name_func
+        Function that receives the called function (e.g. `np.add`) of a folded or shared subexpression and returns the
+        base name of the variable it is stored in.
+    fold_constants
+        If true, subexpressions that only depend on constants are evaluated and replaced by new parameters.
+    eliminate_cse
+        If true, repeated subexpressions are evaluated once and replaced by temporary variables.
+
+    Returns
+    -------
+    tuple
+        New code lines, their operator scopes and a list of (name, value) tuples with the new parameters.
+
+    """
+
+    if not hasattr(ast, 'unparse'):
+        return lines, scopes, []
+
+    # parse equations (lines that are not single assignments are kept as they are)
+    try:
+        statements = [_parse_line(line) for line in lines]
+    except SyntaxError:
+        return lines, scopes, []
+
+    variables = set(variables)
+    for stmt in statements:
+        if stmt is not None:
+            variables |= {node.id for node in ast.walk(stmt) if isinstance(node, ast.Name) and
+                          isinstance(node.ctx, ast.Store)}
+    used_names = variables | set(namespace)
+    if name_func is None:
+        name_func = lambda func: 'expr'
+
+    # analyze which variables are changed by the equations and which variables may share memory with each other
+    aliases, changed, mutated = _analyze_assignments(lines, statements, variables)
+    mutated = {aliases.find(name) for name in mutated}
+    constants = {key: val for key, val in constants.items() if key not in changed and aliases.find(key) not in mutated}
+
+    # fold constant subexpressions
+    params = []
+    if fold_constants:
+        folder = _ConstantFolder(constants, variables, namespace, name_func, used_names)
+        for stmt in statements:
+            if stmt is not None:
+                stmt.value = folder.visit(stmt.value)
+        params = folder.params
+
+    # eliminate common subexpressions
+    pre_lines = [[] for _ in statements]
+    if eliminate_cse:
+        eliminator = _SubexpressionEliminator(variables, aliases, mutated, name_func, used_names)
+        eliminator.count(statements)
+        pre_lines = eliminator.replace(statements)
+
+    # generate new code lines
+    new_lines, new_scopes = [], []
+    for line, scope, stmt, pre in zip(lines, scopes, statements, pre_lines):
+        new_lines += pre + [line if stmt is None else ast.unparse(stmt)]
+        new_scopes += [scope] * (len(pre) + 1)
+    return new_lines, new_scopes, params
+
+
+def eliminate_dead_code(lines: list, scopes: list, roots: set, variables: set) -> tuple:
+    """Removes all equations from a right-hand side evaluation function that the values of the root variables do not
+    depend on. Since the function is evaluated repeatedly, values that are assigned by an equation and read by an
+    equation of the next evaluation (e.g. parameters that are written back or buffers that are updated in-place) are
+    traced across evaluations as well.
+
+    Parameters
+    ----------
+    lines
+        Code lines of the equations, in the order of their evaluation.
+    scopes
+        Operator scope of each code line (see `NumpyBackend.compile`).
+    roots
+        Names of the variables that have to be computed, e.g. the vector of state derivatives and the targets of
+        extrinsic inputs.
+    variables
+        Names of all local variables of the function (state variables, parameters and function arguments).
+
+    Returns
+    -------
+    tuple
+        Code lines and operator scopes of the remaining equations.
+
+    """
+
+    try:
+        statements = [_parse_line(line) for line in lines]
+    except SyntaxError:
+        return lines, scopes
+
+    variables = set(variables) | set(roots)
+    for stmt in statements:
+        if stmt is not None:
+            variables |= {node.id for node in ast.walk(stmt) if isinstance(node, ast.Name) and
+                          isinstance(node.ctx, ast.Store)}
+    aliases, _, _ = _analyze_assignments(lines, statements, variables)
+    members = {}
+    for name in variables:
+        members.setdefault(aliases.find(name), set()).add(name)
+
+    # propagate the liveness of variables backwards through the equations, until the variables that are live at the
+    # beginning of the function (and thus at the end of the previous evaluation) do not change anymore
+    is_live = [stmt is None for stmt in statements]
+    live_start = set()
+    while True:
+        live = set(roots) | live_start
+        for i in range(len(statements) - 1, -1, -1):
+            stmt = statements[i]
+            if stmt is None:
+                live |= _names(ast.parse(lines[i])) & variables
+                continue
+            rebound, inplace = _get_targets(stmt)
+            uses = _names(stmt.value) & variables
+            if inplace:
+                uses |= _names(stmt.targets[0] if isinstance(stmt, ast.Assign) else stmt.target) & variables
+
+                # in-place changes affect all variables that may share memory with the changed variable
+                is_live[i] = is_live[i] or any(live & members.get(aliases.find(name), {name}) for name in inplace)
+                if is_live[i]:
+                    live |= uses
+
+            else:
+
+                # re-assignments of variables end their liveness
+                is_live[i] = is_live[i] or bool(live & rebound)
+                live -= rebound
+                if is_live[i]:
+                    live |= uses
+
+        if live <= live_start:
+            break
+        live_start |= live
+
+    new_lines = [line for line, keep in zip(lines, is_live) if keep]
+    new_scopes = [scope for scope, keep in zip(scopes, is_live) if keep]
+    return new_lines, new_scopes
+
+
+def get_names(lines: list) -> set:
+    """Returns all identifiers that occur in a list of code lines.
+    """
+    return set(re.findall(r"[A-Za-z_][A-Za-z0-9_]*", "\n".join(lines)))
+
+
+def preallocate_buffers(lines: list, values: dict, variables: set, namespace: dict, init_lines: Optional[list] = None,
+                        name_func: Optional[Callable] = None) -> tuple:
+    """Writes the results of numpy ufuncs and inner products (`np.dot`) into preallocated buffers via their `out`
+    argument. Only calls are considered whose results are consumed immediately, i.e. calls that are arguments of
+    other ufuncs or inner products, that are assigned to parts of a variable (which copies the result) or that are
+    assigned to variables that do not share memory with any other variable. Shapes and data-types of the buffers are
+    determined by evaluating the equations once, on copies of all variables that are changed in-place.
+
+    Parameters
+    ----------
+    lines
+        Code lines of the equations, in the order of their evaluation.
+    values
+        Values of all parameters and arguments of the function, with their names as keys.
+    variables
+        Names of all local variables of the function (state variables, parameters and function arguments).
+    namespace
+        Global namespace of the generated module, in which the equations are evaluated.
+    init_lines
+        Code lines that have to be evaluated before the equations (e.g. the extraction of state variables).
+    name_func
+        Function that receives the called function (e.g. `np.add`) and returns the base name of its buffer.
+
+    Returns
+    -------
+    tuple
+        New code lines and a list of (name, value) tuples with the buffers, which have to be passed as additional
+        parameters.
+
+    """
+
+    if not hasattr(ast, 'unparse'):
+        return lines, []
+    try:
+        statements = [_parse_line(line) for line in lines]
+    except SyntaxError:
+        return lines, []
+
+    variables = set(variables) | set(values)
+    for stmt in statements:
+        if stmt is not None:
+            variables |= {node.id for node in ast.walk(stmt) if isinstance(node, ast.Name) and
+                          isinstance(node.ctx, ast.Store)}
+    if name_func is None:
+        name_func = lambda func: 'expr'
+    allocator = _BufferAllocator(namespace, name_func, variables | set(namespace))
+
+    # find variables that may share memory with other variables (the results of functions other than ufuncs and inner
+    # products may refer to their arguments)
+    aliases = _Aliases()
+    for line, stmt in zip(lines, statements):
+        if stmt is None:
+            aliases.union(*(_names(ast.parse(line)) & variables))
+        elif isinstance(stmt, ast.Assign) and isinstance(stmt.targets[0], ast.Name) and \
+                not allocator.is_fresh(stmt.value):
+            aliases.union(stmt.targets[0].id, *(_names(stmt.value) & variables))
+    members = {}
+    for name in variables:
+        members.setdefault(aliases.find(name), set()).add(name)
+
+    # variables that are changed in-place (and all variables that may share memory with them) are copied for the
+    # evaluation of the equations
+    aliases_changed, _, mutated = _analyze_assignments(lines, statements, variables)
+    mutated = {aliases_changed.find(name) for name in mutated}
+    local_vars = {}
+    for name, val in values.items():
+        if name == 'y' or aliases_changed.find(name) in mutated:
+            val = np.array(val) if isinstance(val, np.ndarray) else deepcopy(val)
+        local_vars[name] = val
+
+    # mark the calls whose results are consumed immediately
+    for stmt in statements:
+        if stmt is not None:
+            if isinstance(stmt, ast.Assign) and isinstance(stmt.targets[0], ast.Name):
+                name = stmt.targets[0].id
+                consumed = name not in values and members[aliases.find(name)] == {name}
+            else:
+                consumed = True
+            stmt.value = allocator.mark(stmt.value, consumed)
+    if not allocator.calls:
+        return lines, []
+
+    # evaluate the equations once to record the shapes and data-types of the results of the marked calls
+    records = {}
+
+    def record(k, func, *args):
+        result = func(*args)
+        if isinstance(result, np.ndarray) and result.ndim and all(isinstance(arg, (np.ndarray, Number))
+                                                                  for arg in args):
+            records[k] = (result.shape, result.dtype)
+        return result
+
+    source = "\n".join(list(init_lines if init_lines else []) +
+                       [line if stmt is None else ast.unparse(stmt) for line, stmt in zip(lines, statements)])
+    try:
+        exec(source, dict(namespace, **{allocator.record_func: record}), local_vars)
+    except Exception:
+        return lines, []
+
+    # add buffers to the marked calls
+    new_lines = []
+    for line, stmt in zip(lines, statements):
+        if stmt is not None:
+            stmt.value = allocator.finalize(stmt.value, records)
+            line = ast.unparse(stmt)
+        new_lines.append(line)
+    return new_lines, allocator.params
+
+
+class _Aliases:
+    """Union-find structure over variable names. Variables in the same set may refer to the same memory, e.g. because
+    an identity operation or a view was assigned to one of them.
+    """
+
+    def __init__(self):
+        self.parents = {}
+
+    def find(self, name: str) -> str:
+        parent = self.parents.setdefault(name, name)
+        if parent != name:
+            parent = self.find(parent)
+            self.parents[name] = parent
+        return parent
+
+    def union(self, *names) -> None:
+        roots = [self.find(name) for name in names]
+        for root in roots[1:]:
+            self.parents[root] = roots[0]
+
+
+class _ConstantFolder(ast.NodeTransformer):
+    """Replaces maximal subexpressions that only depend on constants and literals by new parameters, which contain the
+    evaluated subexpressions. Identical subexpressions are replaced by the same parameter.
+    """
+
+    def __init__(self, constants: dict, variables: set, namespace: dict, name_func: Callable, used_names: set):
+        self.constants = constants
+        self.variables = variables
+        self.namespace = namespace
+        self.name_func = name_func
+        self.used_names = used_names
+        self.params = []
+        self._folded = {}
+
+    def visit(self, node):
+        if isinstance(node, _expression_nodes) and _is_foldable(node, self.constants, self.variables):
+            key = ast.dump(node)
+            if key not in self._folded:
+                try:
+                    value = eval(compile(ast.Expression(body=node), '<rhs_eval>', 'eval'), self.namespace,
+                                 dict(self.constants))
+                except Exception:
+                    return self.generic_visit(node)
+                name = _unique_name(f"{self.name_func(_get_func(node))}_evaluated", self.used_names)
+                self.params.append((name, value))
+                self._folded[key] = name
+            return ast.Name(id=self._folded[key], ctx=ast.Load())
+        return self.generic_visit(node)
+
+
+class _SubexpressionEliminator(ast.NodeTransformer):
+    """Finds subexpressions that are evaluated repeatedly with identical arguments, i.e. without any of their
+    variables being changed in between, and stores them in temporary variables at their first evaluation. If nested
+    subexpressions are repeated, the outermost repeated subexpression is shared. Subexpressions whose results may be
+    assigned to a variable that is changed in-place are not shared, since the change would affect all other uses of
+    the temporary variable as well.
+    """
+
+    def __init__(self, variables: set, aliases: _Aliases, mutated: set, name_func: Callable, used_names: set):
+        self.variables = variables
+        self.aliases = aliases
+        self.mutated = mutated
+        self.name_func = name_func
+        self.used_names = used_names
+        self.shared = set()
+        self._members = {}
+        for name in variables:
+            self._members.setdefault(aliases.find(name), set()).add(name)
+        self._versions = Counter()
+        self._epoch = 0
+        self._temps = {}
+        self._pre_lines = []
+
+    def count(self, statements: list) -> None:
+        """Counts the evaluations of each subexpression and selects the subexpressions that are shared.
+        """
+
+        counts, sizes, children, unsafe = Counter(), {}, {}, set()
+        for stmt in statements:
+            if stmt is not None:
+                unsafe |= {self._key(node) for node in self._bound_nodes(stmt)}
+                for node in ast.walk(stmt.value):
+                    if self._is_candidate(node):
+                        key = self._key(node)
+                        counts[key] += 1
+                        if key not in sizes:
+                            sizes[key] = sum(1 for _ in ast.walk(node))
+                            children[key] = Counter(self._key(child) for child in ast.walk(node)
+                                                    if child is not node and self._is_candidate(child))
+            self._update_versions(stmt)
+
+        # subexpressions within a shared subexpression are evaluated only once per shared subexpression
+        for key in sorted(counts, key=lambda k: sizes[k], reverse=True):
+            if counts[key] > 1 and key not in unsafe:
+                self.shared.add(key)
+                for child, n in children[key].items():
+                    counts[child] -= (counts[key] - 1) * n
+
+        self._versions.clear()
+        self._epoch = 0
+
+    def replace(self, statements: list) -> list:
+        """Replaces shared subexpressions by temporary variables and returns the code lines that define the temporary
+        variables for each equation.
+        """
+        pre_lines = []
+        for stmt in statements:
+            self._pre_lines = []
+            if stmt is not None and self.shared:
+                stmt.value = self.visit(stmt.value)
+            pre_lines.append(self._pre_lines)
+            self._update_versions(stmt)
+        return pre_lines
+
+    def visit(self, node):
+        if self._is_candidate(node):
+            key = self._key(node)
+            if key in self.shared:
+                if key not in self._temps:
+                    node = self.generic_visit(node)
+                    name = _unique_name(f"{self.name_func(_get_func(node))}_shared", self.used_names)
+                    self._pre_lines.append(f"{name} = {ast.unparse(node)}")
+                    self._temps[key] = name
+                return ast.Name(id=self._temps[key], ctx=ast.Load())
+        return self.generic_visit(node)
+
+    def _is_candidate(self, node) -> bool:
+        return isinstance(node, _expression_nodes) and _is_pure(node) and \
+               any(isinstance(n, ast.Name) and n.id in self.variables for n in ast.walk(node))
+
+    def _bound_nodes(self, stmt: ast.stmt) -> list:
+        """Returns the subexpressions of an equation whose results may be bound to a variable that is changed in-place,
+        i.e. the right-hand side and all subexpressions it may return a view of (the arguments of function calls and
+        the indexed values of subscripts). The results of arithmetic operations are always new arrays.
+        """
+        if not isinstance(stmt, ast.Assign) or not isinstance(stmt.targets[0], ast.Name) or \
+                self.aliases.find(stmt.targets[0].id) not in self.mutated:
+            return []
+        nodes, stack = [], [stmt.value]
+        while stack:
+            node = stack.pop()
+            if self._is_candidate(node):
+                nodes.append(node)
+            if isinstance(node, ast.Call):
+                stack += node.args + [keyword.value for keyword in node.keywords]
+            elif isinstance(node, ast.Subscript):
+                stack.append(node.value)
+            elif isinstance(node, (ast.BoolOp, ast.IfExp)):
+                stack += node.values if isinstance(node, ast.BoolOp) else [node.body, node.orelse]
+        return nodes
+
+    def _key(self, node) -> tuple:
+        names = sorted({n for n in _names(node) if n in self.variables})
+        return ast.dump(node), self._epoch, tuple((n, self._versions[n]) for n in names)
+
+    def _update_versions(self, stmt: Optional[ast.stmt]) -> None:
+        """Invalidates all subexpressions that depend on variables that have been changed by an equation.
+        """
+        if stmt is None:
+            self._epoch += 1
+            return
+        rebound, inplace = _get_targets(stmt)
+        for name in rebound:
+            self._versions[name] += 1
+        for name in inplace:
+            for alias in self._members.get(self.aliases.find(name), {name}):
+                self._versions[alias] += 1
+
+
+class _BufferAllocator:
+    """Marks calls of ufuncs and inner products whose results are consumed immediately (see `preallocate_buffers`) by
+    wrapping them into a recording function, and replaces the marked calls by calls with preallocated output buffers.
+    """
+
+    record_func = '__record_call'
+
+    def __init__(self, namespace: dict, name_func: Callable, used_names: set):
+        self.namespace = namespace
+        self.name_func = name_func
+        self.used_names = used_names
+        self.calls = []
+        self.params = []
+
+    def is_fresh(self, node: ast.AST) -> bool:
+        """Checks whether a node is a call of a ufunc or an inner product, which always returns a new array.
+        """
+        if not isinstance(node, ast.Call) or node.keywords or any(isinstance(arg, ast.Starred) for arg in node.args):
+            return False
+        func = _get_func(node)
+        if func is None or func.split('.')[0] not in self.namespace:
+            return False
+        try:
+            func = eval(func, self.namespace)
+        except Exception:
+            return False
+        if isinstance(func, np.ufunc):
+            return len(node.args) == func.nin
+        return func is np.dot and len(node.args) == 2
+
+    def mark(self, node: ast.AST, consumed: bool) -> ast.AST:
+        if isinstance(node, ast.Call):
+            fresh = self.is_fresh(node)
+            node.args = [self.mark(arg, fresh) for arg in node.args]
+            for keyword in node.keywords:
+                keyword.value = self.mark(keyword.value, False)
+            if consumed and fresh:
+                self.calls.append(_get_func(node))
+                return ast.Call(func=ast.Name(id=self.record_func, ctx=ast.Load()),
+                                args=[ast.Constant(value=len(self.calls)-1), node.func] + node.args, keywords=[])
+            return node
+        return _map_children(node, lambda child: self.mark(child, False))
+
+    def finalize(self, node: ast.AST, records: dict) -> ast.AST:
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == self.record_func:
+            k = node.args[0].value
+            call = ast.Call(func=node.args[1], args=[self.finalize(arg, records) for arg in node.args[2:]],
+                            keywords=[])
+            if k in records:
+                shape, dtype = records[k]
+                name = _unique_name(f"{self.name_func(self.calls[k])}_buffer", self.used_names)
+                self.params.append((name, np.zeros(shape, dtype=dtype)))
+                call.keywords.append(ast.keyword(arg='out', value=ast.Name(id=name, ctx=ast.Load())))
+            return call
+        return _map_children(node, lambda child: self.finalize(child, records))
+
+
+def _analyze_assignments(lines: list, statements: list, variables: set) -> tuple:
+    """Returns the variables that may share memory with each other, the variables that are changed by any equation and
+    the variables that are changed in-place.
+    """
+    aliases = _Aliases()
+    changed, mutated = set(), set()
+    for line, stmt in zip(lines, statements):
+        if stmt is None:
+            names = _names(ast.parse(line)) & variables
+            changed |= names
+            mutated |= names
+            aliases.union(*names)
+        else:
+            rebound, inplace = _get_targets(stmt)
+            changed |= rebound | inplace
+            mutated |= inplace
+            if not inplace:
+                aliases.union(*rebound, *(_names(stmt.value) & variables))
+    return aliases, changed, mutated
+
+
+def _parse_line(line: str) -> Optional[ast.stmt]:
+    body = ast.parse(line).body
+    if len(body) == 1 and (isinstance(body[0], ast.AugAssign) or
+                           (isinstance(body[0], ast.Assign) and len(body[0].targets) == 1 and
+                            isinstance(body[0].targets[0], (ast.Name, ast.Subscript)))):
+        return body[0]
+    return None
+
+
+def _get_targets(stmt: ast.stmt) -> tuple:
+    """Returns the variables that are re-assigned and the variables that are changed in-place by an assignment.
+    """
+    target = stmt.targets[0] if isinstance(stmt, ast.Assign) else stmt.target
+    while isinstance(target, (ast.Subscript, ast.Attribute)):
+        target = target.value
+    name = {target.id} if isinstance(target, ast.Name) else set()
+    if isinstance(stmt, ast.Assign) and isinstance(stmt.targets[0], ast.Name):
+        return name, set()
+    return name, name
+
+
+def _names(node: ast.AST) -> set:
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+
+def _get_func(node: ast.AST) -> Optional[str]:
+    """Returns the full name of the function that is called by a node (e.g. `np.add`), if any.
+    """
+    if not isinstance(node, ast.Call):
+        return None
+    func, parts = node.func, []
+    while isinstance(func, ast.Attribute):
+        parts.append(func.attr)
+        func = func.value
+    if not isinstance(func, ast.Name):
+        return None
+    return ".".join([func.id] + parts[::-1])
+
+
+def _is_pure(node: ast.AST) -> bool:
+    for n in ast.walk(node):
+        if isinstance(n, ast.Call):
+            func = _get_func(n)
+            if func is None or any(name in func.lower() for name in _impure_calls):
+                return False
+    return True
+
+
+def _is_foldable(node: ast.AST, constants: dict, variables: set) -> bool:
+    """Checks whether a subexpression depends on constants only and contains any function call or constant.
+    """
+    if not _is_pure(node):
+        return False
+    has_content = False
+    for n in ast.walk(node):
+        if isinstance(n, ast.Call):
+            if _get_func(n).split('.')[0] in variables:
+                return False
+            has_content = True
+        elif isinstance(n, ast.Name):
+            if n.id in constants:
+                has_content = True
+            elif n.id in variables:
+                return False
+        elif isinstance(n, (ast.Lambda, ast.NamedExpr, ast.comprehension)):
+            return False
+    return has_content
+
+
+def _map_children(node: ast.AST, func: Callable) -> ast.AST:
+    """Replaces all child nodes of a node by the results of `func`.
+    """
+    for field, value in ast.iter_fields(node):
+        if isinstance(value, list):
+            setattr(node, field, [func(child) if isinstance(child, ast.AST) else child for child in value])
+        elif isinstance(value, ast.AST):
+            setattr(node, field, func(value))
+    return node
+
+
+def _unique_name(name: str, used_names: set) -> str:
+    new_name, counter = name, 0
+    while new_name in used_names:
+        new_name = f"{name}_{counter}"
+        counter += 1
+    used_names.add(new_name)
+    return new_name
@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+#
+#
+# PyRates software framework for flexible implementation of neural
+# network model_templates and simulations. See also:
+# https://github.com/pyrates-neuroscience/PyRates
+#
+# Copyright (C) 2017-2018 the original authors (Richard Gast and
+# Daniel Rose), the Max-Planck-Institute for Human Cognitive Brain
+# Sciences ("MPI CBS") and contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+# CITATION:
+#
+# Richard Gast and Daniel Rose et. al. in preparation
+
+"""Contains output sinks that receive the sampled output variables of a simulation in fixed-size chunks, such that the
+memory consumption of a simulation does not scale with the simulation time.
+
+"""
+
+# external imports
+from typing import Callable, Optional, Union
+from copy import deepcopy
+import numpy as np
+
+# meta infos
+__author__ = "Richard Gast"
+__status__ = "development"
+
+
+class OutputSink:
+    """Base class for output sinks. Output sinks are opened by the backend before the simulation starts, receive the
+    sampled output variables in chunks of at most `chunk_size` samples during the simulation and are closed after the
+    simulation finished.
+
+    Parameters
+    ----------
+    chunk_size
+        Maximum number of samples that are kept in memory before they are passed to the sink.
+    dtype
+        Data type of the stored output variables.
+
+    """
+
+    def __init__(self, chunk_size: int = 1000, dtype: str = 'float64'):
+        self.chunk_size = chunk_size
+        self.dtype = dtype
+        self.times = None
+        self.columns = None
+        self._idx = 0
+
+    def open(self, times: np.ndarray, n_outputs: int, resume: bool = False) -> None:
+        """Prepares the sink for receiving `len(times)` samples of `n_outputs` output variables. If `resume` is true,
+        samples that have been stored previously are kept, such that a simulation can be continued from a checkpoint.
+        """
+        self.times = times
+        self._idx = 0
+
+    def write(self, chunk: np.ndarray) -> None:
+        """Passes a chunk of samples (1. dimension) of all output variables (2. dimension) to the sink.
+        """
+        self._write(chunk, self._idx)
+        self._idx += chunk.shape[0]
+
+    def close(self, columns: list) -> None:
+        """Finalizes the sink. `columns` contains a key for each output variable (2. dimension of the samples). If
+        fewer samples than announced in `open` were received (e.g. because the simulation was terminated by an event),
+        the sampling times are cut to the received samples.
+        """
+        self.columns = columns
+        self.times = self.times[:self._idx]
+
+    def get_state(self) -> dict:
+        """Returns the state of the sink that is required to continue writing samples after a checkpoint.
+        """
+        return {'idx': self._idx}
+
+    def set_state(self, state: dict) -> None:
+        """Restores a state returned by `get_state`.
+        """
+        self._idx = state['idx']
+
+    def _write(self, chunk: np.ndarray, idx: int) -> None:
+        raise NotImplementedError
+
+
+class NpySink(OutputSink):
+    """Writes the output variables into a memory-mapped `.npy` file of shape `(n_samples, n_outputs)`.
+
+    Parameters
+    ----------
+    path
+        Path to the `.npy` file.
+    chunk_size
+        Maximum number of samples that are kept in memory before they are written to the file.
+    dtype
+        Data type of the stored output variables.
+
+    """
+
+    def __init__(self, path: str, chunk_size: int = 1000, dtype: str = 'float64'):
+        super().__init__(chunk_size=chunk_size, dtype=dtype)
+        self.path = path
+        self._data = None
+
+    def open(self, times: np.ndarray, n_outputs: int, resume: bool = False) -> None:
+        super().open(times, n_outputs, resume)
+        if resume:
+            self._data = np.lib.format.open_memmap(self.path, mode='r+')
+        else:
+            self._data = np.lib.format.open_memmap(self.path, mode='w+', dtype=self.dtype,
+                                                   shape=(len(times), n_outputs))
+
+    def close(self, columns: list) -> None:
+        super().close(columns)
+        self._data.flush()
+        self._data = None
+
+    def load(self, mmap_mode: Optional[str] = 'r'):
+        """Loads the stored output variables into a `pandas.DataFrame` (by default backed by a memory-map).
+        """
+        from pandas import DataFrame, MultiIndex
+        data = np.load(self.path, mmap_mode=mmap_mode)[:len(self.times)]
+        return DataFrame(data, index=self.times, columns=MultiIndex.from_tuples(self.columns))
+
+    def _write(self, chunk: np.ndarray, idx: int) -> None:
+        self._data[idx:idx+chunk.shape[0], :] = chunk
+
+
+class HDF5Sink(OutputSink):
+    """Writes the output variables into a dataset of shape `(n_samples, n_outputs)` in an HDF5 file. Sampling times
+    and column keys are stored as the datasets `{dataset}_times` and `{dataset}_columns`. Requires `h5py`.
+
+    Parameters
+    ----------
+    path
+        Path to the HDF5 file.
+    dataset
+        Name of the dataset in the HDF5 file.
+    chunk_size
+        Maximum number of samples that are kept in memory before they are written to the file.
+    dtype
+        Data type of the stored output variables.
+
+    """
+
+    def __init__(self, path: str, dataset: str = 'results', chunk_size: int = 1000, dtype: str = 'float64'):
+        super().__init__(chunk_size=chunk_size, dtype=dtype)
+        self.path = path
+        self.dataset = dataset
+        self._file = None
+
+    def open(self, times: np.ndarray, n_outputs: int, resume: bool = False) -> None:
+        import h5py
+        super().open(times, n_outputs, resume)
+        self._file = h5py.File(self.path, 'a')
+        if resume and self.dataset in self._file:
+            if f"{self.dataset}_columns" in self._file:
+                del self._file[f"{self.dataset}_columns"]
+            return
+        for key in [self.dataset, f"{self.dataset}_times", f"{self.dataset}_columns"]:
+            if key in self._file:
+                del self._file[key]
+        self._file.create_dataset(self.dataset, shape=(len(times), n_outputs), dtype=self.dtype,
+                                  chunks=(max(1, min(self.chunk_size, len(times))), max(1, n_outputs)))
+        self._file.create_dataset(f"{self.dataset}_times", data=times)
+
+    def close(self, columns: list) -> None:
+        super().close(columns)
+        self._file.create_dataset(f"{self.dataset}_columns", data=np.asarray(["/".join(c) for c in columns],
+                                                                             dtype='S'))
+        self._file.close()
+        self._file = None
+
+    def load(self):
+        """Loads the stored output variables into a `pandas.DataFrame`.
+        """
+        import h5py
+        from pandas import DataFrame, MultiIndex
+        with h5py.File(self.path, 'r') as f:
+            data = f[self.dataset][:len(self.times)]
+        return DataFrame(data, index=self.times, columns=MultiIndex.from_tuples(self.columns))
+
+    def _write(self, chunk: np.ndarray, idx: int) -> None:
+        self._file[self.dataset][idx:idx+chunk.shape[0], :] = chunk
+
+
+class CallbackSink(OutputSink):
+    """Passes each chunk of output variables to a user-defined callback.
+
+    Parameters
+    ----------
+    callback
+        Function with the signature `callback(times, chunk)`, where `times` contains the sampling times of the chunk
+        and `chunk` is an array of shape `(n_samples, n_outputs)`. The array is re-used by the backend after the
+        callback returned, so it has to be copied if it should be stored.
+    chunk_size
+        Maximum number of samples that are kept in memory before they are passed to the callback.
+    dtype
+        Data type of the output variables.
+
+    """
+
+    def __init__(self, callback: Callable, chunk_size: int = 1000, dtype: str = 'float64'):
+        super().__init__(chunk_size=chunk_size, dtype=dtype)
+        self.callback = callback
+
+    def _write(self, chunk: np.ndarray, idx: int) -> None:
+        self.callback(self.times[idx:idx+chunk.shape[0]], chunk)
+
+
+class ReductionSink(OutputSink):
+    """Reduces the output variables chunk-wise while they are received from the backend, such that only the reduced
+    outputs (and the output variables without reduction) are kept in memory. Available reductions are:
+        - 'mean', 'var', 'std', 'min' and 'max' for statistics over all samples
+        - ('decimate', n) for block-averaging over `n` consecutive samples, i.e. a low-pass filtered signal with an
+          `n` times lower sampling rate.
+
+    Parameters
+    ----------
+    reductions
+        Reduction for each output variable (2. dimension of the samples). Each entry is either None (no reduction), the
+        name of a reduction, or a tuple with the name of a reduction and its arguments.
+    chunk_size
+        Maximum number of samples that are kept in memory before they are reduced.
+    dtype
+        Data type of the output variables.
+
+    """
+
+    def __init__(self, reductions: list, chunk_size: int = 1000, dtype: str = 'float64'):
+        super().__init__(chunk_size=chunk_size, dtype=dtype)
+        self.reductions = [(r,) if type(r) is str else r for r in reductions]
+        self._accumulators = []
+
+    def open(self, times: np.ndarray, n_outputs: int, resume: bool = False) -> None:
+        super().open(times, n_outputs, resume)
+        if n_outputs != len(self.reductions):
+            raise ValueError(f'Wrong number of output reductions: {len(self.reductions)}. Each of the {n_outputs} '
+                             f'output variables requires an entry (`None` for output variables without reduction).')
+
+        # group output variables with the same reduction
+        groups = {}
+        for i, r in enumerate(self.reductions):
+            groups.setdefault(tuple(r) if r else (None,), []).append(i)
+        self._accumulators = [_Accumulator(r[0], r[1:], cols) for r, cols in groups.items()]
+
+    def get_state(self) -> dict:
+        state = super().get_state()
+        state['accumulators'] = [acc.get_state() for acc in self._accumulators]
+        return state
+
+    def set_state(self, state: dict) -> None:
+        super().set_state(state)
+        for acc, acc_state in zip(self._accumulators, state['accumulators']):
+            acc.set_state(acc_state)
+
+    def load(self):
+        """Collects the reduced output variables in a `pandas.DataFrame`. Statistics over all samples are stored at the
+        last sampling time, decimated output variables at the last sampling time of each block.
+        """
+        from pandas import DataFrame, MultiIndex, concat
+        frames = []
+        for acc in self._accumulators:
+            times, values = acc.result(self.times)
+            frames.append(DataFrame(values, index=times,
+                                    columns=MultiIndex.from_tuples([self.columns[c] for c in acc.columns])))
+        results = concat(frames, axis=1).sort_index() if len(frames) > 1 else frames[0]
+        return results.loc[:, MultiIndex.from_tuples(self.columns)]
+
+    def _write(self, chunk: np.ndarray, idx: int) -> None:
+        times = self.times[idx:idx+chunk.shape[0]]
+        for acc in self._accumulators:
+            acc.update(times, chunk[:, acc.columns])
+
+
+class _Accumulator:
+    """Accumulates a single reduction over chunks of samples of a set of output variables.
+    """
+
+    def __init__(self, reduction: Optional[str], args: tuple, columns: list):
+        if reduction not in output_reductions and reduction is not None:
+            raise ValueError(f'Invalid output reduction: {reduction}. Supported reductions are: '
+                             f'{output_reductions}.')
+        if reduction == 'decimate' and (len(args) != 1 or int(args[0]) < 1):
+            raise ValueError('The output reduction `decimate` requires the decimation factor (positive integer) as '
+                             'single argument, e.g. `(\'node/op/var\', \'decimate\', 10)`.')
+        self.reduction = reduction
+        self.args = args
+        self.columns = columns
+        self.n = 0
+        self.state = []
+        self._rest = None
+
+    def get_state(self) -> dict:
+        return {'n': self.n, 'state': deepcopy(self.state), 'rest': deepcopy(self._rest)}
+
+    def set_state(self, state: dict) -> None:
+        self.n = state['n']
+        self.state = deepcopy(state['state'])
+        self._rest = deepcopy(state['rest'])
+
+    def update(self, times: np.ndarray, x: np.ndarray) -> None:
+
+        if self.reduction is None:
+
+            # keep full output variables
+            self.state.append((times, x.copy()))
+
+        elif self.reduction in ['mean', 'var', 'std']:
+
+            # combine mean and sum of squared deviations with those of the chunk (Chan et al.)
+            n, mean, m2 = x.shape[0], np.mean(x, axis=0), np.sum((x - np.mean(x, axis=0))**2, axis=0)
+            if self.n:
+                n_old, mean_old, m2_old = self.n, self.state[0], self.state[1]
+                delta = mean - mean_old
+                mean = mean_old + delta * n / (n_old + n)
+                m2 = m2_old + m2 + delta**2 * n_old * n / (n_old + n)
+            self.state = [mean, m2]
+            self.n += n
+
+        elif self.reduction in ['min', 'max']:
+
+            # running extrema
+            f = np.min if self.reduction == 'min' else np.max
+            self.state = [f(x, axis=0) if not self.n else f(np.asarray([self.state[0], f(x, axis=0)]), axis=0)]
+            self.n += x.shape[0]
+
+        else:
+
+            # block-average over `n` consecutive samples, samples of incomplete blocks are kept for the next chunk
+            n = int(self.args[0])
+            if self._rest:
+                times, x = np.concatenate([self._rest[0], times]), np.concatenate([self._rest[1], x], axis=0)
+            n_blocks = x.shape[0] // n
+            if n_blocks:
+                values = np.mean(np.reshape(x[:n_blocks*n], (n_blocks, n, x.shape[1])), axis=1)
+                self.state.append((times[n-1:n_blocks*n:n], values))
+            self._rest = (times[n_blocks*n:], x[n_blocks*n:].copy()) if x.shape[0] > n_blocks*n else None
+
+    def result(self, times: np.ndarray) -> tuple:
+
+        if self.reduction is None or self.reduction == 'decimate':
+            if not self.state:
+                return np.zeros((0,)), np.zeros((0, len(self.columns)))
+            return np.concatenate([s[0] for s in self.state]), np.concatenate([s[1] for s in self.state], axis=0)
+
+        if self.reduction == 'mean':
+            values = self.state[0]
+        elif self.reduction == 'var':
+            values = self.state[1] / self.n
+        elif self.reduction == 'std':
+            values = np.sqrt(self.state[1] / self.n)
+        else:
+            values = self.state[0]
+        return times[-1:], np.reshape(values, (1, len(self.columns)))
+
+
+output_reductions = ('mean', 'var', 'std', 'min', 'max', 'decimate')
+
+
+def get_output_sink(out_sink: Union[OutputSink, str, Callable], **kwargs) -> OutputSink:
+    """Creates an output sink from a file path (`.npy` for memory-mapped numpy files, `.h5`/`.hdf5` for HDF5 files,
+    optionally followed by `:dataset`) or a callback. Output sink instances are returned as they are.
+
+    Parameters
+    ----------
+    out_sink
+        Output sink instance, file path or callback.
+    kwargs
+        Additional keyword arguments passed to the output sink initialization (e.g. `chunk_size`).
+
+    Returns
+    -------
+    OutputSink
+        Output sink instance.
+
+    """
+
+    if isinstance(out_sink, OutputSink):
+        return out_sink
+    if isinstance(out_sink, str):
+        if out_sink.endswith('.npy'):
+            return NpySink(out_sink, **kwargs)
+        for ext in ['.h5', '.hdf5']:
+            if out_sink.endswith(ext):
+                return HDF5Sink(out_sink, **kwargs)
+            if f"{ext}:" in out_sink:
+                path, dataset = out_sink.rsplit(f"{ext}:", 1)
+                return HDF5Sink(f"{path}{ext}", dataset=dataset, **kwargs)
+        raise ValueError(f'Invalid file type of output sink: {out_sink}. Supported file types are `.npy`, `.h5` and '
+                         f'`.hdf5`.')
+    if callable(out_sink):
+        return CallbackSink(out_sink, **kwargs)
+    raise ValueError(f'Invalid output sink: {out_sink}. Please provide an `OutputSink` instance, a file path or a '
+                     f'callback.')
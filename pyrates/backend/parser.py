@@ -34,6 +34,7 @@ operations.
 import math
 import typing as tp
 from numbers import Number
+from collections import OrderedDict
 from pyparsing import Literal, CaselessLiteral, Word, Combine, Optional, \
     ZeroOrMore, Forward, nums, alphas, ParserElement
 
@@ -42,6 +43,219 @@ __author__ = "Richard Gast"
 __status__ = "development"
 
 
+# expression grammar
+####################
+
+
+class ExpressionGrammar:
+    """Pyparsing grammar for mathematical expressions. Parsing an expression string yields the expression stack, i.e. a
+    list representation of the syntax tree of the expression that is processed from last to first item by
+    `ExpressionParser.parse`.
+
+    The grammar does not depend on the parsed expression. Hence, it is built only once per process (see
+    `get_expression_grammar`) and shared by all instances of `ExpressionParser`, whereas the expression stack is
+    created anew for each call of `parse`. The expression stacks are identical with and without pyparsing's packrat
+    parsing (`ParserElement.enablePackrat`), but packrat parsing is not enabled, since the memoization is slower than
+    re-parsing for the expressions of the model templates.
+
+    Since the expression stack depends on the expression string only, parse results are cached by expression string.
+    Equations that differ only in their scope (e.g. the equations of the `edge_from_*` operators or of nodes that have
+    not been vectorized) are thus tokenized only once per process, also across repeated compilations of circuits.
+
+    Parameters
+    ----------
+    cache_size
+        Maximum number of cached parse results. If exceeded, the least recently used parse result is removed from the
+        cache.
+
+    Attributes
+    ----------
+    expr
+        Symbolic (Pyparsing-based) representation of a mathematical expression.
+    cache_size
+        Maximum number of cached parse results.
+    cache_hits
+        Number of calls of `parse` that were served from the cache.
+    cache_misses
+        Number of calls of `parse` that required tokenizing the expression.
+
+    """
+
+    def __init__(self, cache_size: int = 10000) -> None:
+        """Builds the grammar.
+        """
+
+        self._expr_stack = []
+        self._cache = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # general symbols
+        point = Literal(".")
+        comma = Literal(",")
+        colon = Literal(":")
+        e = CaselessLiteral("E")
+        pi = CaselessLiteral("PI")
+
+        # parentheses
+        par_l = Literal("(")
+        par_r = Literal(")").setParseAction(self._push_first)
+        idx_l = Literal("[")
+        idx_r = Literal("]")
+
+        # basic mathematical operations
+        plus = Literal("+")
+        minus = Literal("-")
+        mult = Literal("*")
+        div = Literal("/")
+        mod = Literal("%")
+        dot = Literal("@")
+        exp_1 = Literal("^")
+        exp_2 = Combine(mult + mult)
+        transp = Combine(point + Literal("T"))
+        inv = Combine(point + Literal("I"))
+
+        # numeric types
+        num_float = Combine(Word("-" + nums, nums) +
+                            Optional(point + Optional(Word(nums))) +
+                            Optional(e + Word("-" + nums, nums)))
+        num_int = Word("-" + nums, nums)
+
+        # variables and functions
+        name = Word(alphas, alphas + nums + "_$")
+        func_name = Combine(name + par_l, adjacent=True)
+
+        # math operation groups
+        op_add = plus | minus
+        op_mult = mult | div | dot | mod
+        op_exp = exp_1 | exp_2 | inv | transp
+
+        # logical operations
+        greater = Literal(">")
+        less = Literal("<")
+        equal = Combine(Literal("=") + Literal("="))
+        unequal = Combine(Literal("!") + Literal("="))
+        greater_equal = Combine(Literal(">") + Literal("="))
+        less_equal = Combine(Literal("<") + Literal("="))
+
+        # logical operations group
+        op_logical = greater_equal | less_equal | unequal | equal | less | greater
+
+        # pre-allocations
+        self.expr = Forward()
+        exponential = Forward()
+        index_multiples = Forward()
+
+        # basic organization units
+        index_start = idx_l.setParseAction(self._push_first)
+        index_end = idx_r.setParseAction(self._push_first)
+        index_comb = colon.setParseAction(self._push_first)
+        arg_comb = comma.setParseAction(self._push_first)
+        arg_tuple = par_l + ZeroOrMore(self.expr.suppress() + Optional(arg_comb)) + par_r
+        func_arg = arg_tuple | self.expr.suppress()
+
+        # basic computation unit
+        atom = (func_name + Optional(func_arg.suppress()) + ZeroOrMore(arg_comb.suppress() + func_arg.suppress()) +
+                par_r.suppress() | name | pi | e | num_float | num_int).setParseAction(self._push_neg_or_first) | \
+               (par_l.setParseAction(self._push_last) + self.expr.suppress() + par_r).setParseAction(self._push_neg)
+
+        # apply indexing to atoms
+        indexed = (Optional(minus) + atom).setParseAction(self._push_neg) + \
+                  ZeroOrMore((index_start + index_multiples + index_end))
+        index_base = (self.expr.suppress() | index_comb)
+        index_full = index_base + ZeroOrMore((index_comb + index_base)) + ZeroOrMore(index_comb)
+        index_multiples << index_full + ZeroOrMore((arg_comb + index_full))
+
+        # hierarchical relationships between mathematical and logical operations
+        boolean = indexed + Optional((op_logical + indexed).setParseAction(self._push_first))
+        exponential << boolean + ZeroOrMore((op_exp + Optional(exponential)).setParseAction(self._push_first))
+        factor = exponential + ZeroOrMore((op_mult + exponential).setParseAction(self._push_first))
+        expr = factor + ZeroOrMore((op_add + factor).setParseAction(self._push_first))
+        self.expr << expr
+
+    def parse(self, expr_str: str) -> tuple:
+        """Parses a string-based mathematical expression.
+
+        Parameters
+        ----------
+        expr_str
+            Mathematical expression in string format.
+
+        Returns
+        -------
+        tuple
+            Parsed tokens and expression stack of the expression. Both are copies that can be altered by the caller.
+
+        """
+
+        # look up cached parse result
+        if expr_str in self._cache:
+            self.cache_hits += 1
+            self._cache.move_to_end(expr_str)
+            expr_list, expr_stack = self._cache[expr_str]
+            return expr_list.copy(), list(expr_stack)
+
+        # tokenize expression
+        self.cache_misses += 1
+        expr_stack = []
+        self._expr_stack = expr_stack
+        try:
+            expr_list = self.expr.parseString(expr_str)
+        finally:
+            self._expr_stack = []
+
+        # cache parse result
+        self._cache[expr_str] = (expr_list, tuple(expr_stack))
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        return expr_list.copy(), expr_stack
+
+    def clear_cache(self) -> None:
+        """Removes all cached parse results.
+        """
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _push_first(self, strg, loc, toks):
+        """Push tokens in first-to-last order to expression stack.
+        """
+        self._expr_stack.append(toks[0])
+
+    def _push_neg(self, strg, loc, toks):
+        """Push negative one multiplier if on first position in toks.
+        """
+        if toks and toks[0] == '-':
+            self._expr_stack.append('-one')
+
+    def _push_neg_or_first(self, strg, loc, toks):
+        """Push neg one multipler to expression stack if on first position in toks, else push toks from first-to-last.
+        """
+        if toks and toks[0] == '-':
+            self._expr_stack.append('-one')
+        else:
+            self._expr_stack.append(toks[0])
+
+    def _push_last(self, strg, loc, toks):
+        """Push tokens in last-to-first order to expression stack.
+        """
+        self._expr_stack.append(toks[-1])
+
+
+_expression_grammar = None
+
+
+def get_expression_grammar() -> ExpressionGrammar:
+    """Returns the expression grammar of the current process, which is built at the first call.
+    """
+    global _expression_grammar
+    if _expression_grammar is None:
+        _expression_grammar = ExpressionGrammar()
+    return _expression_grammar
+
+
 # expression parsers (lhs/rhs of an equation)
 #############################################
 
@@ -75,6 +289,8 @@ class ExpressionParser(ParserElement):
         Only relevant for lhs expressions. If True, lhs will be treated as a first-order ordinary differential equation.
     expr_str
         String representation of the mathematical expression
+    grammar
+        Expression grammar that is shared by all expression parsers (see `get_expression_grammar`).
     expr
         Symbolic (Pyparsing-based) representation of mathematical expression.
     expr_stack
@@ -124,100 +340,15 @@ class ExpressionParser(ParserElement):
 
         # additional attributes
         self.expr_str = expr_str
-        self.expr = None
         self.expr_stack = []
         self.expr_list = []
         self.op = None
         self._finished_rhs = False
         self._instantaneous = kwargs.pop('instantaneous', False)
 
-        # define algebra
-        ################
-
-        if not self.expr:
-
-            # general symbols
-            point = Literal(".")
-            comma = Literal(",")
-            colon = Literal(":")
-            e = CaselessLiteral("E")
-            pi = CaselessLiteral("PI")
-
-            # parentheses
-            par_l = Literal("(")
-            par_r = Literal(")").setParseAction(self._push_first)
-            idx_l = Literal("[")
-            idx_r = Literal("]")
-
-            # basic mathematical operations
-            plus = Literal("+")
-            minus = Literal("-")
-            mult = Literal("*")
-            div = Literal("/")
-            mod = Literal("%")
-            dot = Literal("@")
-            exp_1 = Literal("^")
-            exp_2 = Combine(mult + mult)
-            transp = Combine(point + Literal("T"))
-            inv = Combine(point + Literal("I"))
-
-            # numeric types
-            num_float = Combine(Word("-" + nums, nums) +
-                                Optional(point + Optional(Word(nums))) +
-                                Optional(e + Word("-" + nums, nums)))
-            num_int = Word("-" + nums, nums)
-
-            # variables and functions
-            name = Word(alphas, alphas + nums + "_$")
-            func_name = Combine(name + par_l, adjacent=True)
-
-            # math operation groups
-            op_add = plus | minus
-            op_mult = mult | div | dot | mod
-            op_exp = exp_1 | exp_2 | inv | transp
-
-            # logical operations
-            greater = Literal(">")
-            less = Literal("<")
-            equal = Combine(Literal("=") + Literal("="))
-            unequal = Combine(Literal("!") + Literal("="))
-            greater_equal = Combine(Literal(">") + Literal("="))
-            less_equal = Combine(Literal("<") + Literal("="))
-
-            # logical operations group
-            op_logical = greater_equal | less_equal | unequal | equal | less | greater
-
-            # pre-allocations
-            self.expr = Forward()
-            exponential = Forward()
-            index_multiples = Forward()
-
-            # basic organization units
-            index_start = idx_l.setParseAction(self._push_first)
-            index_end = idx_r.setParseAction(self._push_first)
-            index_comb = colon.setParseAction(self._push_first)
-            arg_comb = comma.setParseAction(self._push_first)
-            arg_tuple = par_l + ZeroOrMore(self.expr.suppress() + Optional(arg_comb)) + par_r
-            func_arg = arg_tuple | self.expr.suppress()
-
-            # basic computation unit
-            atom = (func_name + Optional(func_arg.suppress()) + ZeroOrMore(arg_comb.suppress() + func_arg.suppress()) +
-                    par_r.suppress() | name | pi | e | num_float | num_int).setParseAction(self._push_neg_or_first) | \
-                   (par_l.setParseAction(self._push_last) + self.expr.suppress() + par_r).setParseAction(self._push_neg)
-
-            # apply indexing to atoms
-            indexed = (Optional(minus) + atom).setParseAction(self._push_neg) + \
-                      ZeroOrMore((index_start + index_multiples + index_end))
-            index_base = (self.expr.suppress() | index_comb)
-            index_full = index_base + ZeroOrMore((index_comb + index_base)) + ZeroOrMore(index_comb)
-            index_multiples << index_full + ZeroOrMore((arg_comb + index_full))
-
-            # hierarchical relationships between mathematical and logical operations
-            boolean = indexed + Optional((op_logical + indexed).setParseAction(self._push_first))
-            exponential << boolean + ZeroOrMore((op_exp + Optional(exponential)).setParseAction(self._push_first))
-            factor = exponential + ZeroOrMore((op_mult + exponential).setParseAction(self._push_first))
-            expr = factor + ZeroOrMore((op_add + factor).setParseAction(self._push_first))
-            self.expr << expr #(Optional(minus) + expr).setParseAction(self._push_neg)
+        # grammar (shared by all expression parsers)
+        self.grammar = get_expression_grammar()
+        self.expr = self.grammar.expr
 
     def parse_expr(self) -> tuple:
         """Parses string-based mathematical expression/equation.
@@ -229,7 +360,7 @@ class ExpressionParser(ParserElement):
         """
 
         # extract symbols and operations from equations right-hand side
-        self.expr_list = self.expr.parseString(self.rhs)
+        self.expr_list, self.expr_stack = self.grammar.parse(self.rhs)
         self._check_parsed_expr(self.rhs)
 
         # parse rhs into backend
@@ -242,7 +373,7 @@ class ExpressionParser(ParserElement):
         self._finished_rhs = True
 
         # extract symbols and operations from left-hand side
-        self.expr_list = self.expr.parseString(self.lhs)
+        self.expr_list, self.expr_stack = self.grammar.parse(self.lhs)
         self._check_parsed_expr(self.lhs)
 
         # parse lhs into backend
@@ -588,30 +719,6 @@ class ExpressionParser(ParserElement):
 
         return lhs, rhs, diff_eq, assign_type, lhs_key
 
-    def _push_first(self, strg, loc, toks):
-        """Push tokens in first-to-last order to expression stack.
-        """
-        self.expr_stack.append(toks[0])
-
-    def _push_neg(self, strg, loc, toks):
-        """Push negative one multiplier if on first position in toks.
-        """
-        if toks and toks[0] == '-':
-            self.expr_stack.append('-one')
-
-    def _push_neg_or_first(self, strg, loc, toks):
-        """Push neg one multipler to expression stack if on first position in toks, else push toks from first-to-last.
-        """
-        if toks and toks[0] == '-':
-            self.expr_stack.append('-one')
-        else:
-            self.expr_stack.append(toks[0])
-
-    def _push_last(self, strg, loc, toks):
-        """Push tokens in last-to-first order to expression stack.
-        """
-        self.expr_stack.append(toks[-1])
-
     def _apply_idx(self, op: tp.Any, idx: tp.Any, update: tp.Optional[tp.Any] = None,
                    update_type: tp.Optional[str] = None, **kwargs) -> tp.Any:
         """Apply index idx to operation op.
@@ -35,7 +35,9 @@ import tensorflow as tf
 
 # pyrates internal imports
 from .funcs import *
-from .numpy_backend import NumpyBackend, NumpyVar, PyRatesIndexOp, PyRatesAssignOp, PyRatesOp, CodeGen
+from .numpy_backend import NumpyBackend, NumpyVar, PyRatesIndexOp, PyRatesAssignOp, PyRatesOp, CodeGen, rk_tableaus, \
+    stochastic_solvers, implicit_solvers
+from .input_sources import InputSource
 
 # meta infos
 __author__ = "Richard Gast"
@@ -80,6 +82,7 @@ class TensorflowVar(NumpyVar, tf.Variable):
 class TensorflowOp(PyRatesOp):
 
     var_class = TensorflowVar
+    static_inference = False
 
     def _generate_func(self):
         """Generates a function from operator value and arguments"""
@@ -124,6 +127,7 @@ class TensorflowOp(PyRatesOp):
 class TensorflowAssignOp(PyRatesAssignOp):
 
     var_class = TensorflowVar
+    static_inference = False
 
     def _generate_func(self):
         """Generates a function from operator value and arguments"""
@@ -182,6 +186,7 @@ class TensorflowAssignOp(PyRatesAssignOp):
 class TensorflowIndexOp(PyRatesIndexOp):
 
     var_class = TensorflowVar
+    static_inference = False
 
     def _generate_func(self):
         """Generates a function from operator value and arguments"""
@@ -249,6 +254,9 @@ class TensorflowBackend(NumpyBackend):
 
         super().__init__(ops, dtypes, name, float_default_type, imports)
 
+        # equations are not optimized during code generation, since tensorflow optimizes its graphs itself
+        self._optimize_rhs = False
+
         # define operations and datatypes of the backend
         ################################################
 
@@ -346,6 +354,16 @@ class TensorflowBackend(NumpyBackend):
             Contains tuples of layer run functions and their respective arguments.
 
         """
+        solver = kwargs.get('solver', 'euler')
+        if solver in rk_tableaus or solver in stochastic_solvers or solver in implicit_solvers:
+            raise NotImplementedError(f'The solver `{solver}` is not implemented for this backend ({self.name}). '
+                                      f'Please choose another solver (e.g. `euler`) or another backend.')
+        if kwargs.get('profile_ops', False):
+            raise NotImplementedError(f'Operator profiling is not implemented for this backend ({self.name}). '
+                                      f'Please choose another backend (e.g. `numpy`) for this feature.')
+        if kwargs.get('preallocate', False):
+            raise NotImplementedError(f'Preallocated work arrays are not implemented for this backend ({self.name}). '
+                                      f'Please choose another backend (e.g. `numpy`) for this feature.')
         return super().compile(build_dir=build_dir, decorator=decorator, **kwargs)
 
     def broadcast(self, op1: Any, op2: Any, **kwargs) -> tuple:
@@ -393,7 +411,11 @@ class TensorflowBackend(NumpyBackend):
                     var_count[var.short_name] = 0
         return self.add_op('stack', vars)
 
-    def add_input_layer(self, inputs: list, T: float, continuous=False) -> NumpyVar:
+    def add_input_layer(self, inputs: list, T: float, continuous=False, interpolation: str = 'linear', **kwargs
+                        ) -> NumpyVar:
+        if any(isinstance(inp, InputSource) for inp, _, _ in inputs):
+            raise NotImplementedError(f'Input sources are not implemented for this backend ({self.name}). Please '
+                                      f'consider using the numpy backend instead or pass the inputs as arrays.')
         if continuous:
             raise ValueError('Invalid input structure. The tensorflow backend can only be used with fixed step-size '
                              'solvers and thus only supports inputs with discrete time steps. Either change the '
@@ -449,13 +471,14 @@ class TensorflowBackend(NumpyBackend):
 
     def _integrate(self, rhs_func, func_args, T, dt, dts, t, output_indices):
 
+        if self._events:
+            raise NotImplementedError(f'Events are not implemented for this backend ({self.name}). Please consider '
+                                      f'using the numpy backend instead.')
+
         sampling_steps = int(np.round(T / dts, decimals=0))
 
-        # initialize results storage vectors
-        results = []
-        for idx in output_indices:
-            var_dim = idx[1] - idx[0] if type(idx) is tuple else 1
-            results.append(tf.Variable(np.zeros((sampling_steps, var_dim), dtype=self._float_def)))
+        # initialize results storage
+        results = tf.Variable(np.zeros((sampling_steps, len(output_indices)), dtype=self._float_def))
 
         # solve via pyrates internal explicit euler algorithm
         sampling_idx = tf.Variable(0, dtype='int32')
@@ -464,9 +487,9 @@ class TensorflowBackend(NumpyBackend):
         steps = tf.constant(int(np.round(T / dt, decimals=0)))
         results = self._run(rhs_func=rhs_func, func_args=func_args, t=t, dt=dt, steps=steps,
                             sampling_steps=sampling_steps, results=results, sampling_idx=sampling_idx,
-                            output_indices=output_indices)
+                            output_indices=tf.constant(output_indices, dtype=tf.int32))
 
-        results = np.asarray([r.numpy() for r in results])
+        results = results.numpy()
         times = np.arange(0, T, dts)
 
         return times, results
@@ -486,8 +509,7 @@ class TensorflowBackend(NumpyBackend):
 
             if tf.equal(tf.math.floormod(step, sampling_steps), zero):
 
-                for r, idx in zip(results, output_indices):
-                    r.scatter_nd_update([[sampling_idx, 0]], [state_vars[idx]])
+                results.scatter_nd_update([[sampling_idx]], [tf.gather(state_vars, output_indices)])
 
                 sampling_idx.assign_add(1)
 
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#
+#
+# PyRates software framework for flexible implementation of neural
+# network model_templates and simulations. See also:
+# https://github.com/pyrates-neuroscience/PyRates
+#
+# Copyright (C) 2017-2018 the original authors (Richard Gast and
+# Daniel Rose), the Max-Planck-Institute for Human Cognitive Brain
+# Sciences ("MPI CBS") and contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+# CITATION:
+#
+# Richard Gast and Daniel Rose et. al. in preparation
+"""Command line interface of the benchmark suite. Example:
+
+    pyrates-benchmarks --models jansen_rit montbrio --sizes 10 100 --densities 0.1 --solvers euler rk4
+                       --out results.json --baseline baseline.json
+
+Exits with status 1, if any benchmark regressed compared to the baseline.
+"""
+
+# external imports
+from typing import Optional, Sequence
+import argparse
+import sys
+
+# pyrates internal imports
+from pyrates.benchmarks.suite import benchmark_models, run_suite, compare, save, load
+
+# meta infos
+__author__ = "Richard Gast"
+__status__ = "development"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Runs the benchmark suite with the command line arguments `argv` and returns the exit status.
+    """
+
+    parser = argparse.ArgumentParser(prog='pyrates-benchmarks',
+                                     description='Runs performance benchmarks on networks of the PyRates model '
+                                                 'templates.')
+    parser.add_argument('--models', nargs='+', default=list(benchmark_models), choices=list(benchmark_models),
+                        help='models to benchmark')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100], help='network sizes')
+    parser.add_argument('--densities', nargs='+', type=float, default=[0.1, 0.5], help='coupling densities')
+    parser.add_argument('--backends', nargs='+', default=['numpy'], help='backends')
+    parser.add_argument('--solvers', nargs='+', default=['euler'], help='numerical solvers')
+    parser.add_argument('--T', type=float, default=0.1, help='simulation time')
+    parser.add_argument('--dt', type=float, default=1e-4, help='integration step-size')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random coupling matrices')
+    parser.add_argument('--reps', type=int, default=1, help='number of repetitions of each benchmark')
+    parser.add_argument('--no-isolate', action='store_true',
+                        help='run all benchmarks in the current process instead of a separate process each')
+    parser.add_argument('--out', default=None, help='JSON file to store the results in')
+    parser.add_argument('--baseline', default=None, help='JSON file with baseline results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='tolerated relative increase of a metric compared to the baseline')
+    args = parser.parse_args(argv)
+
+    # run benchmarks
+    results = run_suite(models=args.models, sizes=args.sizes, densities=args.densities, backends=args.backends,
+                        solvers=args.solvers, n_reps=args.reps, isolate=not args.no_isolate, T=args.T, dt=args.dt,
+                        seed=args.seed)
+    if args.out:
+        save(results, args.out)
+
+    # compare against baseline
+    if args.baseline:
+        regressions = compare(results, load(args.baseline), tolerance=args.tolerance)
+        for reg in regressions:
+            print(f"Regression: model = {reg['model']}, n = {reg['n']}, p = {reg['p']}, backend = {reg['backend']}, "
+                  f"solver = {reg['solver']}, {reg['metric']}: {reg['baseline']} -> {reg['value']}")
+        if regressions:
+            return 1
+        print("No regressions compared to the baseline.")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+#
+#
+# PyRates software framework for flexible implementation of neural
+# network model_templates and simulations. See also:
+# https://github.com/pyrates-neuroscience/PyRates
+#
+# Copyright (C) 2017-2018 the original authors (Richard Gast and
+# Daniel Rose), the Max-Planck-Institute for Human Cognitive Brain
+# Sciences ("MPI CBS") and contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+# CITATION:
+#
+# Richard Gast and Daniel Rose et. al. in preparation
+"""Benchmark suite that measures compile time, run time, integration steps per second and peak memory of randomly
+coupled networks of the shipped model templates, for different network sizes, coupling densities, backends and
+solvers. Results are stored as JSON and can be compared against a stored baseline.
+"""
+
+# external imports
+from typing import Sequence
+from time import perf_counter
+import multiprocessing as mp
+import itertools
+import datetime
+import platform
+import traceback
+import json
+import numpy as np
+
+# pyrates internal imports
+from pyrates import __version__
+from pyrates.ir.compile_report import get_peak_memory
+
+# meta infos
+__author__ = "Richard Gast"
+__status__ = "development"
+
+
+# model definitions: circuit template of a single network node, source and target variable of the coupling between
+# nodes, output variable and edge template (None for linear coupling)
+benchmark_models = {
+    'jansen_rit': {'circuit': "model_templates.jansen_rit.simple_jansenrit.JRC",
+                   'source': "PC/PRO/m_out", 'target': "PC/RPO_e_pc/m_in", 'output': "PC/OBS/V", 'edge': None},
+    'montbrio': {'circuit': "model_templates.montbrio.simple_montbrio.QIF_exc",
+                 'source': "p/Op_e/r", 'target': "p/Op_e/r_in", 'output': "p/Op_e/r", 'edge': None},
+    'wilson_cowan': {'circuit': "model_templates.wilson_cowan.simple_wilsoncowan.WC_simple",
+                     'source': "E/Op_rate/r", 'target': "E/Op_rate/I_ext", 'output': "E/Op_rate/r", 'edge': None},
+    'kuramoto': {'circuit': "model_templates.kuramoto.simple_kuramoto.KM_single",
+                 'source': "p1/Op_base/theta", 'target': "p1/Op_base/net_in", 'output': "p1/Op_base/theta",
+                 'edge': "model_templates.kuramoto.simple_kuramoto.Sin_edge"},
+}
+
+# metrics that are compared against a baseline (larger values are worse)
+compared_metrics = ('compile_time', 'run_time', 'peak_memory')
+
+
+def build_network(model: str, n: int, p: float, seed: int = 0):
+    """Creates a network of `n` nodes of a model, which are coupled randomly with a coupling density of `p`. The
+    coupling weights of each target node are normalized to sum up to one.
+
+    Parameters
+    ----------
+    model
+        Name of the model (see `benchmark_models`).
+    n
+        Number of network nodes.
+    p
+        Coupling density, i.e. the probability of each pair of nodes to be connected.
+    seed
+        Seed of the random number generator that creates the coupling matrix.
+
+    Returns
+    -------
+    CircuitIR
+        Network of `n` circuits of the model.
+
+    """
+
+    from pyrates.ir.circuit import CircuitIR
+    from pyrates.frontend import CircuitTemplate, EdgeTemplate
+
+    if model not in benchmark_models:
+        raise ValueError(f'Invalid benchmark model: {model}. Please choose one of the following models: '
+                         f'{list(benchmark_models)}.')
+    m = benchmark_models[model]
+
+    # define coupling matrix
+    C = np.random.default_rng(seed).uniform(size=(n, n))
+    C[C > p] = 0.
+    c_sum = np.sum(C, axis=0)
+    C[:, c_sum > 0] /= c_sum[c_sum > 0]
+
+    # set up network
+    net = CircuitIR(label=f"{model}_network")
+    labels = [f"{model}_{i}" for i in range(n)]
+    template = CircuitTemplate.from_yaml(m['circuit'])
+    for label in labels:
+        net.add_circuit(label, template)
+    edge_kwargs = {'template': EdgeTemplate.from_yaml(m['edge'])} if m['edge'] else {}
+    net.add_edges_from_matrix(source_var=m['source'], target_var=m['target'], nodes=labels, weight=C, **edge_kwargs)
+
+    return net
+
+
+def run_benchmark(model: str, n: int, p: float, backend: str = 'numpy', solver: str = 'euler', T: float = 0.1,
+                  dt: float = 1e-4, seed: int = 0, **kwargs) -> dict:
+    """Runs a single benchmark in the current process.
+
+    Parameters
+    ----------
+    model
+        Name of the model (see `benchmark_models`).
+    n
+        Number of network nodes.
+    p
+        Coupling density.
+    backend
+        Backend that the network is compiled for.
+    solver
+        Numerical solver.
+    T
+        Simulation time.
+    dt
+        Integration step-size.
+    seed
+        Seed of the random coupling matrix.
+    kwargs
+        Additional keyword arguments that are passed to `CircuitIR.compile`. Generated modules are not cached by the
+        numpy and fortran backends (`cache_dir=None`), unless a `cache_dir` is passed.
+
+    Returns
+    -------
+    dict
+        Benchmark settings and the measured network construction time, compile time (including the code generation),
+        simulation time, integration steps per second, peak memory of the process (MB, if available) and the phases of
+        the compile report. If the benchmark failed, the error message is stored under `error` instead.
+
+    """
+
+    result = {'model': model, 'n': n, 'p': p, 'backend': backend, 'solver': solver, 'T': T, 'dt': dt}
+    if backend in ('numpy', 'fortran'):
+        kwargs.setdefault('cache_dir', None)
+    net = None
+    try:
+
+        # build and compile the network
+        t0 = perf_counter()
+        circuit = build_network(model, n, p, seed=seed)
+        t1 = perf_counter()
+        net = circuit.compile(vectorization=True, backend=backend, step_size=dt, solver=solver, verbose=False,
+                              **kwargs)
+        t2 = perf_counter()
+
+        # simulate the network (the right-hand side module is generated as part of the first run)
+        outputs = {'out': f"all/{benchmark_models[model]['output']}"}
+        net.run(T, outputs=outputs, sampling_step_size=dt*10, verbose=False)
+        t3 = perf_counter()
+
+        # collect the measurements
+        report = net.compile_report
+        codegen_time = report.phases['code_generation']['time'] if 'code_generation' in report.phases else 0.
+        run_time = t3 - t2 - codegen_time
+        result.update(build_time=t1 - t0, compile_time=t2 - t1 + codegen_time, run_time=run_time,
+                      steps_per_second=int(np.round(T / dt)) / run_time if run_time > 0 else None,
+                      peak_memory=get_peak_memory(),
+                      compile_phases={key: phase['time'] for key, phase in report.phases.items()},
+                      stats=dict(report.stats))
+
+    except Exception as e:
+        result['error'] = "".join(traceback.format_exception_only(type(e), e)).strip()
+
+    finally:
+        if net is not None:
+            try:
+                net.clear()
+            except Exception:
+                pass
+
+    return result
+
+
+def _run_benchmark_in_queue(queue, args, kwargs):
+    queue.put(run_benchmark(*args, **kwargs))
+
+
+def run_suite(models: Sequence[str] = tuple(benchmark_models), sizes: Sequence[int] = (10, 100),
+              densities: Sequence[float] = (0.1, 0.5), backends: Sequence[str] = ('numpy',),
+              solvers: Sequence[str] = ('euler',), n_reps: int = 1, isolate: bool = True, verbose: bool = True,
+              **kwargs) -> dict:
+    """Runs a benchmark for each combination of model, network size, coupling density, backend and solver.
+
+    Parameters
+    ----------
+    models
+        Names of the models (see `benchmark_models`).
+    sizes
+        Network sizes.
+    densities
+        Coupling densities.
+    backends
+        Backends.
+    solvers
+        Numerical solvers.
+    n_reps
+        Number of repetitions of each benchmark. The minimal times and the maximal peak memory across repetitions are
+        reported.
+    isolate
+        If true, each benchmark is run in a separate process, such that the peak memory is measured per benchmark and
+        compile times do not profit from previous benchmarks.
+    verbose
+        If true, the progress is printed.
+    kwargs
+        Additional keyword arguments that are passed to `run_benchmark` (e.g. `T`, `dt`, `seed`).
+
+    Returns
+    -------
+    dict
+        Meta information about the benchmark environment (`meta`) and a list of benchmark results (`results`).
+
+    """
+
+    for model in models:
+        if model not in benchmark_models:
+            raise ValueError(f'Invalid benchmark model: {model}. Please choose one of the following models: '
+                             f'{list(benchmark_models)}.')
+
+    results = []
+    ctx = mp.get_context('spawn')
+    for model, n, p, backend, solver in itertools.product(models, sizes, densities, backends, solvers):
+
+        if verbose:
+            print(f"Running benchmark: model = {model}, n = {n}, p = {p}, backend = {backend}, solver = {solver}")
+
+        # run repetitions of the benchmark
+        reps = []
+        for _ in range(n_reps):
+            args = (model, n, p, backend, solver)
+            if isolate:
+                queue = ctx.Queue()
+                proc = ctx.Process(target=_run_benchmark_in_queue, args=(queue, args, kwargs))
+                proc.start()
+                reps.append(queue.get())
+                proc.join()
+            else:
+                reps.append(run_benchmark(*args, **kwargs))
+            if 'error' in reps[-1]:
+                break
+
+        # summarize repetitions
+        result = reps[0]
+        if 'error' not in result:
+            for key in ('build_time', 'compile_time', 'run_time'):
+                result[key] = min(rep[key] for rep in reps)
+            if all(rep['peak_memory'] is not None for rep in reps):
+                result['peak_memory'] = max(rep['peak_memory'] for rep in reps)
+            result['steps_per_second'] = int(np.round(result['T'] / result['dt'])) / result['run_time']
+        results.append(result)
+
+        if verbose:
+            if 'error' in result:
+                print(f"    ...failed: {result['error']}")
+            else:
+                print(f"    ...compile time: {result['compile_time']:.3f} s, run time: {result['run_time']:.3f} s, "
+                      f"steps per second: {result['steps_per_second']:.1f}")
+
+    meta = {'pyrates_version': __version__, 'numpy_version': np.__version__, 'python_version': platform.python_version(),
+            'platform': platform.platform(), 'processor': platform.processor(),
+            'date': datetime.datetime.now().isoformat(timespec='seconds'), 'n_reps': n_reps, 'isolate': isolate}
+    return {'meta': meta, 'results': results}
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.2, metrics: Sequence[str] = compared_metrics
+            ) -> list:
+    """Compares benchmark results against a baseline.
+
+    Parameters
+    ----------
+    results
+        Benchmark results as returned by `run_suite`.
+    baseline
+        Baseline benchmark results in the same format. Only benchmarks with identical settings (model, network size,
+        coupling density, backend, solver, simulation time and step-size) are compared.
+    tolerance
+        Relative increase of a metric compared to the baseline that is tolerated.
+    metrics
+        Metrics that are compared.
+
+    Returns
+    -------
+    list
+        Regressions, each a dictionary with the benchmark settings, the metric, its baseline value and its new value.
+        Benchmarks that succeeded in the baseline but fail now are reported with the metric `error`.
+
+    """
+
+    settings_keys = ('model', 'n', 'p', 'backend', 'solver', 'T', 'dt')
+
+    def key(res):
+        return tuple(res[k] for k in settings_keys)
+
+    base = {key(res): res for res in baseline['results']}
+    regressions = []
+    for res in results['results']:
+        ref = base.get(key(res), None)
+        if ref is None or 'error' in ref:
+            continue
+        settings = dict(zip(settings_keys, key(res)))
+        if 'error' in res:
+            regressions.append({**settings, 'metric': 'error', 'baseline': None, 'value': res['error']})
+            continue
+        for metric in metrics:
+            old, new = ref.get(metric, None), res.get(metric, None)
+            if old is not None and new is not None and new > old * (1 + tolerance):
+                regressions.append({**settings, 'metric': metric, 'baseline': old, 'value': new})
+    return regressions
+
+
+def save(results: dict, fn: str) -> None:
+    """Stores benchmark results as JSON file.
+    """
+    with open(fn, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load(fn: str) -> dict:
+    """Loads benchmark results from a JSON file.
+    """
+    with open(fn, 'r') as f:
+        return json.load(f)
@@ -48,6 +48,7 @@ from pyrates.frontend.template.node import NodeTemplate
 
 # meta infos
 from pyrates.ir.circuit import CircuitIR
+from pyrates.ir.compile_report import CompileReport
 from pyrates.ir.edge import EdgeIR
 
 __author__ = "Richard Gast, Daniel Rose"
@@ -137,6 +138,7 @@ class CircuitTemplate(AbstractBaseTemplate):
         """
         if not label:
             label = self.label
+        report = CompileReport()
 
         # reformat node templates to NodeIR instances
         if node_values is None:
@@ -241,7 +243,12 @@ class CircuitTemplate(AbstractBaseTemplate):
                           edge_dict
                           ))
 
-        return CircuitIR(label, self.circuits, nodes, edges, self.path)
+        # create circuit and record the time of the template application as the first phase of its compilation
+        circuit = CircuitIR(label, self.circuits, nodes, edges, self.path)
+        report.add_phase('apply')
+        circuit.compile_report = report
+
+        return circuit
 
     def _get_edge_templates(self, edges: List[Union[tuple, dict]]):
         """
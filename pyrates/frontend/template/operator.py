@@ -249,6 +249,8 @@ def _parse_defaults(expr: Union[str, int, float]):
             vtype = "constant"
         elif expr.startswith("placeholder"):
             vtype = "placeholder"
+        elif expr.startswith("noise"):
+            vtype = "noise"
         else:
             try:
                 # if "." in expr:
@@ -33,7 +33,8 @@ from typing import Union, Dict, Iterator, Optional, List, Tuple
 from warnings import filterwarnings
 from copy import deepcopy
 from networkx import MultiDiGraph, subgraph, DiGraph
-from pandas import DataFrame
+from pandas import DataFrame, MultiIndex
+from scipy.sparse import csr_matrix
 import numpy as np
 
 # pyrates-internal imports
@@ -42,6 +43,11 @@ from pyrates.ir.node import NodeIR, VectorizedNodeIR
 from pyrates.ir.edge import EdgeIR
 from pyrates.ir.abc import AbstractBaseIR
 from pyrates.backend.parser import parse_equations, is_diff_eq, replace
+from pyrates.backend.numpy_backend import continuous_solvers
+from pyrates.backend.output_sinks import OutputSink, ReductionSink
+from pyrates.backend.events import get_event
+from pyrates.backend.input_sources import InputSource, get_input_source, is_input_source
+from pyrates.ir.compile_report import CompileReport
 
 __author__ = "Daniel Rose, Richard Gast"
 __status__ = "Development"
@@ -53,7 +59,8 @@ class CircuitIR(AbstractBaseIR):
 
     # _node_label_grammar = Word(alphanums+"_") + Suppress(".") + Word(nums)
     __slots__ = ["label", "label_map", "graph", "sub_circuits", "_reference_map", "_buffered",
-                 "_first_run", "_vectorized", "_compiled", "_backend", "step_size", "solver", "_edge_idx_counter"]
+                 "_first_run", "_vectorized", "_compiled", "_backend", "step_size", "solver", "_edge_idx_counter",
+                 "_noise_vars", "op_profile", "compile_report"]
 
     def __init__(self, label: str = "circuit", circuits: dict = None, nodes: Dict[str, NodeIR] = None,
                  edges: list = None, template: str = None):
@@ -103,6 +110,9 @@ class CircuitIR(AbstractBaseIR):
         self.solver = None
         self.step_size = None
         self._edge_idx_counter = 0
+        self._noise_vars = []
+        self.op_profile = None
+        self.compile_report = None
 
     def _collect_references(self, edge_or_node):
         """Collect all references of nodes or edges to unique operator_graph instances in local `_reference_map`.
@@ -639,6 +649,83 @@ class CircuitIR(AbstractBaseIR):
 
         return self
 
+    def _get_batch_targets(self, n_batch: int, batch_params: Optional[dict] = None) -> list:
+        """Collects the node variables that take different values across the batch of a batched circuit.
+
+        Parameters
+        ----------
+        n_batch
+            Number of batch members.
+        batch_params
+            Key-value pairs of node variables ('node/op/var') and their values for each batch member.
+
+        Returns
+        -------
+        list
+            Tuples of node name, operator name, variable name and the values of the variable for each batch member.
+
+        """
+
+        targets = []
+        for key, values in (batch_params.items() if batch_params else []):
+
+            if len(values) != n_batch:
+                raise ValueError(f'Wrong number of values for batched parameter {key}. Expected {n_batch} values '
+                                 f'(one per batch member), but received {len(values)}.')
+
+            *node, op, var = key.split('/')
+            node_keys = [n for n in self.nodes if len(n.split('/')) == len(node) and
+                         all(lvl == 'all' or lvl == n_lvl for lvl, n_lvl in zip(node, n.split('/')))]
+            if not node_keys:
+                raise ValueError(f'Could not find node {"/".join(node)} of batched parameter {key} in circuit.')
+
+            for node_key in node_keys:
+                if var not in self.graph.nodes[node_key]['node'].values.get(op, {}):
+                    raise ValueError(f'Could not find variable {op}/{var} of batched parameter {key} on node '
+                                     f'{node_key}.')
+                targets.append((node_key, op, var, np.asarray(values)))
+
+        return targets
+
+    def _add_batch_dim(self, n_batch: int, targets: list) -> None:
+        """Adds a batch dimension to the backend (see `NumpyBackend.add_batch_dim`). The network graph itself is not
+        replicated: Each batched node variable refers to its entry of the (vectorized) backend variable, which receives
+        the values of all batch members.
+
+        Parameters
+        ----------
+        n_batch
+            Number of batch members.
+        targets
+            Batched node variables, as returned by `_get_batch_targets`.
+
+        Returns
+        -------
+        None
+
+        """
+
+        values = []
+        for node_key, op, var, val in targets:
+            vnode_key, vnode_idx = self.label_map.get(node_key, (node_key, None))
+            backend_var = self[f"{vnode_key}/{op}/{var}"]['value']
+            if getattr(backend_var, 'name', None) == 'pyrates_index':
+
+                # state variables are views on the state vector
+                idx = backend_var.value
+                idx = [int(i) for i in idx[idx.index(self._backend.idx_l) + 1:-1].split(':')]
+                if vnode_idx is not None:
+                    idx = [idx[0] + vnode_idx]
+                elif len(idx) > 1:
+                    idx = list(range(idx[0], idx[1]))
+                values.append((self._backend.vars['y'], idx, val))
+
+            else:
+
+                values.append((backend_var, [vnode_idx] if vnode_idx is not None else None, val))
+
+        self._backend.add_batch_dim(n_batch, values)
+
     def _vectorize_nodes_in_place(self, max_node_idx):
 
         # 1: collapse all nodes that use the same operator graph into one node
@@ -1126,32 +1213,80 @@ class CircuitIR(AbstractBaseIR):
             via the following format: 'node_name/op_name/var_nam'. Thereby, the node name can consist of multiple node
             levels for hierarchical networks and either refer to a specific node name ('../node_lvl_name/..') or to
             all nodes ('../all/..') at each level. Each value is an array that defines the input for the input variable
-            over time (first dimension).
+            over time (first dimension). For batched circuits (see `CircuitIR.compile`), each input is shared by all
+            batch members. An input with a single column is shared by all nodes the key refers to. Solvers that operate
+            in continuous time look up inputs via piecewise-linear interpolation between their time points, or via a
+            zero-order hold if the keyword argument `input_interpolation='zoh'` is passed. Instead of an array, an input can be provided
+            on demand by a memory-mapped array, a function `f(t)`, a generator that yields chunks of samples (time in
+            the first dimension) or a `pyrates.backend.input_sources.InputSource` instance. Such inputs are sampled on
+            the integration time grid and pulled by the native solvers in blocks of `input_block_size` (keyword
+            argument, default: 1000) integration steps, such that only a single block is kept in memory.
         outputs
             Output variables that will be returned. Each key is the desired name of an output variable and each value is
             a string that specifies a variable in the graph in the same format as used for the input definition:
-            'node_name/op_name/var_name'.
+            'node_name/op_name/var_name'. Instead of a string, a tuple can be passed that contains the variable and a
+            reduction that is applied chunk-wise during the simulation, such that the full output variable never has
+            to be stored: ('node_name/op_name/var_name', 'mean') for statistics over all samples ('mean', 'var',
+            'std', 'min', 'max'), which are returned at the last sampling time, or ('node_name/op_name/var_name',
+            'decimate', n) for averages over blocks of `n` samples.
         sampling_step_size
             Time in seconds between sampling points of the output variables.
         solver
             Numerical solving scheme to use for differential equations. Currently supported ODE solving schemes:
             - 'euler' for the explicit Euler method
-            - 'scipy' for integration via the `scipy.integrate.solve_ivp` method.
+            - 'heun' for the explicit, 2nd-order Heun method
+            - 'rk4' for the explicit, 4th-order Runge-Kutta method
+            - 'rk45' for the explicit, embedded Runge-Kutta method of Dormand and Prince with adaptive step-size. The
+              error tolerances can be controlled via the keyword arguments `rtol` and `atol`.
+            - 'backward_euler' for the implicit, 1st-order backward Euler method (stiff systems)
+            - 'ros2' for the linearly implicit, 2nd-order Rosenbrock method of Verwer et al. (stiff systems)
+              For both implicit solvers, the jacobian of the equation system and its LU factorization are only
+              refreshed every `jac_update` steps (keyword argument, default: 10).
+            - 'scipy' for integration via the `scipy.integrate.solve_ivp` method. If the keyword argument
+              `sparse_jac=True` is passed, the implicit methods 'Radau' and 'BDF' (keyword argument `method`) are
+              provided with the sparsity pattern of the jacobian (`jac_sparsity`), which is detected numerically
+              before the integration. The same keyword argument makes the implicit solvers above use a sparse
+              jacobian. By default, jacobians are treated as dense matrices.
+            Stochastic differential equations, i.e. equations that contain variables with the default `noise`, can be
+            solved via:
+            - 'euler_maruyama' for the Euler-Maruyama method. At each step, each noise variable is set to a sample of
+              Gaussian white noise with zero mean and unit intensity. The noise is drawn in blocks of
+              `noise_block_size` steps (keyword argument, default: 1000) from a random generator that can be seeded via
+              the keyword argument `seed`.
+            All other solvers treat noise variables as zero.
         out_dir
             Directory in which to store outputs.
         verbose
             If true, status updates will be printed to the console.
         profile
-            If true, the total graph execution time will be printed and returned.
+            If true, the total graph execution time will be printed and returned. If 'ops' (numpy backend only), the
+            cumulative evaluation time and number of evaluations of each operator and edge operator (`edge_from_*`) are
+            measured as well. They are stored as a data frame in `CircuitIR.op_profile` (sorted by the cumulative
+            time) and printed as a table, if `verbose` is true.
         kwargs
-            Keyword arguments that are passed on to the chosen solver.
+            Keyword arguments that are passed on to the chosen solver. For the numpy backend, `fused_loop=True` in
+            combination with `solver='euler'` generates the complete integration loop as part of the compiled module,
+            which can be jit-compiled via the `decorator` keyword argument (e.g. `decorator=numba.njit`).
+            Via `out_sink`, the output variables can be streamed in chunks into a memory-mapped `.npy` file, an HDF5
+            file (`.h5` or `.hdf5`), a callback `callback(times, chunk)` or an instance of
+            `pyrates.backend.output_sinks.OutputSink`, such that they do not have to be kept in memory.
+            For the native solvers with fixed step-size, `checkpoint` can be used to write snapshots of the simulation
+            (state variables, delay buffers, input and noise states, output position) to a `.npz` file every
+            `checkpoint_interval` seconds of simulation time and at the end of the simulation. A simulation that was
+            interrupted can be continued from such a file via `resume`, given the same model, inputs and outputs.
+            Checkpoints require an `out_sink`, which persists the output samples collected until the checkpoint.
+            For the same solvers, `events` can be used to pass a list of `pyrates.backend.events.Event` instances (or
+            the names 'convergence' and 'divergence') that are evaluated after each integration step, e.g.
+            `events=[ThresholdEvent('p1/op1/r', 1.0), 'divergence']`. Events record the times at which they occurred
+            (`Event.times`) and terminal events stop the simulation early, in which case only the output samples until
+            then are returned.
 
         Returns
         -------
         Union[DataFrame, Tuple[DataFrame, float]]
             First entry of the tuple contains the output variables in a pandas dataframe, the second contains the
             simulation time in seconds. If profiling was not chosen during call of the function, only the dataframe
-            will be returned.
+            will be returned. If an output sink was provided, the output sink takes the place of the dataframe.
 
         """
 
@@ -1184,6 +1319,20 @@ class CircuitIR(AbstractBaseIR):
             simulation_time = step_size
         sim_steps = int(np.round(simulation_time / step_size, decimals=0))
 
+        # separate output variables from output reductions
+        reductions = {}
+        if outputs:
+            outputs = outputs.copy()
+            for key, val in outputs.items():
+                if type(val) is tuple:
+                    outputs[key] = val[0]
+                    reductions[key] = val[1:]
+                    if not reductions[key]:
+                        raise ValueError(f'No reduction defined for output variable {key}. Please pass a tuple with '
+                                         f'the variable and the name of the reduction, e.g. ({val[0]}, `mean`).')
+        if reductions and 'out_sink' in kwargs:
+            raise ValueError('Output reductions cannot be combined with an output sink (keyword argument `out_sink`).')
+
         # collect backend output variables
         ##################################
 
@@ -1197,9 +1346,26 @@ class CircuitIR(AbstractBaseIR):
                 outputs_col[key] = [[var_info['idx'], var_info['nodes']]
                                     for var_info in self.get_node_var(val, apply_idx=False).values()]
 
+            # pass output variables to a sink that performs the output reductions during the simulation
+            if reductions:
+                kwargs['out_sink'] = ReductionSink([reductions.get(key, None) for key, val in outputs_col.items()
+                                                    for _, nodes in val for _ in nodes])
+
             if verbose:
                 print("    ...user-defined output variables are logged.")
 
+        # collect backend variables that events are evaluated on
+        events_col = []
+        for event in kwargs.pop('events', []):
+            event = get_event(event)
+            event_vars = None
+            if event.var:
+                event_vars = [[var_info['idx'], var_info['nodes']]
+                              for var_info in self.get_node_var(event.var, apply_idx=False).values()]
+            events_col.append((event, event_vars))
+        if events_col:
+            kwargs['events'] = events_col
+
         # collect backend input variables
         #################################
 
@@ -1210,23 +1376,37 @@ class CircuitIR(AbstractBaseIR):
             # go through passed inputs
             for key, val in inputs.items():
 
-                in_shape = val.shape[1] if len(val.shape) > 1 else 1
+                # inputs that are provided on demand are pulled block-wise from an input source by the backend
+                if is_input_source(val):
+                    val = get_input_source(val, n_samples=sim_steps)
+                    in_shape = val.n_columns
+                else:
+                    in_shape = val.shape[1] if len(val.shape) > 1 else 1
 
                 # extract respective input variable from the network
                 for var_key, var_info in self.get_node_var(key, apply_idx=False).items():
                     var_shape = int(np.max(var_info['var'].shape)) if tuple(var_info['var'].shape) else 1
                     var_idx = var_info['idx'] if var_shape > 1 else None
                     var_idx_shape = len(var_idx) if var_idx else 1
-                    if var_idx_shape == in_shape:
+                    if var_idx_shape == in_shape or in_shape == 1:
+                        # a single input is shared by all target indices via broadcasting
                         inputs_col.append((val, var_info['var'], var_idx))
+                    elif isinstance(val, InputSource):
+                        raise ValueError(f'Invalid input source for {key}: The input source provides {in_shape} '
+                                         f'columns, but the input variable has {var_idx_shape} entries. Please provide '
+                                         f'input sources with a single column or one column per entry.')
                     elif (var_idx_shape % in_shape) == 0:
-                        inputs_col.append((np.tile(val, (1, var_idx_shape)), var_info['var'], var_idx))
+                        inputs_col.append((np.tile(val, (1, var_idx_shape // in_shape)), var_info['var'], var_idx))
                     else:
                         inputs_col.append((np.reshape(val, (sim_steps, var_idx_shape)), var_info['var'], var_idx))
 
         # run simulation
         ################
 
+        if self._noise_vars:
+            kwargs['noise_vars'] = self._noise_vars
+        if self.compile_report:
+            kwargs['compile_report'] = self.compile_report
         output_col, times, *time = self._backend.run(T=simulation_time, dt=step_size, dts=sampling_step_size,
                                                      out_dir=out_dir, outputs=outputs_col, inputs=inputs_col,
                                                      solver=solver, profile=profile, **kwargs)
@@ -1238,28 +1418,47 @@ class CircuitIR(AbstractBaseIR):
             else:
                 print(f"ComputeGraph computations finished after {time[0]} seconds.")
 
+        # collect the timing counters of the operators
+        if profile == 'ops':
+            op_profile = self._backend.get_op_profile()
+            self.op_profile = DataFrame([('edge' if 'edge_from_' in scope else 'operator', t, n, t / n if n else 0.)
+                                         for scope, (t, n) in op_profile.items()],
+                                        index=list(op_profile.keys()),
+                                        columns=['type', 'time', 'calls', 'time_per_call'])
+            self.op_profile['fraction'] = self.op_profile['time'] / max(self.op_profile['time'].sum(), 1e-12)
+            if verbose:
+                print(self.op_profile.to_string())
+
+        # output variables have been passed to an output sink
+        if isinstance(output_col, ReductionSink):
+            output_col = output_col.load()
+        if isinstance(output_col, OutputSink) or reductions:
+            if profile:
+                return output_col, time[0]
+            return output_col
+
         # store output variables in data frame
         ######################################
 
-        # ungroup grouped output variables
-        outputs = {}
+        # collect column keys of the grouped output variables
+        columns, values = [], []
         for outkey, (out_val, node_keys) in output_col.items():
-            for i, node_key in enumerate(node_keys):
-                out_val_tmp = np.squeeze(out_val[:, i]) if len(out_val.shape) > 1 else out_val
-                if len(out_val_tmp.shape) < 2:
-                    outputs[(outkey,) + tuple(node_key.split('/'))] = out_val_tmp
-                else:
-                    for k in range(out_val_tmp.shape[1]):
-                        outputs[(outkey, node_key, str(k))] = np.squeeze(out_val_tmp[:, k])
+            out_val = np.reshape(out_val, (out_val.shape[0], -1))
+            if out_val.shape[1] == len(node_keys):
+                columns += [(outkey,) + tuple(node_key.split('/')) for node_key in node_keys]
+            else:
+                n = out_val.shape[1] // len(node_keys)
+                columns += [(outkey, node_key, str(k)) for node_key in node_keys for k in range(n)]
+            values.append(out_val)
+        values = np.concatenate(values, axis=1) if len(values) > 1 else values[0]
 
         # create data frame
         if sampling_step_size and not all(np.diff(times, 1) - sampling_step_size < step_size * 0.01):
             n = int(np.round(simulation_time / sampling_step_size, decimals=0))
             new_times = np.linspace(step_size, simulation_time, n + 1)
-            for key, val in outputs.items():
-                outputs[key] = np.interp(new_times, times, val)
+            values = np.asarray([np.interp(new_times, times, val) for val in values.T]).T
             times = new_times
-        out_vars = DataFrame(outputs, index=times)
+        out_vars = DataFrame(values, index=times, columns=MultiIndex.from_tuples(columns))
 
         # return results
         ################
@@ -1276,8 +1475,11 @@ class CircuitIR(AbstractBaseIR):
                 step_size: Optional[float] = None,
                 solver: Optional[str] = None,
                 dde_approximation_order: int = 0,
+                n_batch: Optional[int] = None,
+                batch_params: Optional[dict] = None,
                 verbose: bool = True,
                 in_place: bool = False,
+                sparse_edges: Optional[float] = 0.1,
                 **kwargs
                 ) -> AbstractBaseIR:
         """Parses IR into the backend. Returns an instance of the CircuitIR that allows for numerical simulations via
@@ -1298,25 +1500,55 @@ class CircuitIR(AbstractBaseIR):
             Only relevant if `vectorization` is True. All edges that are vectorized and do not contain discrete delays
             can be realized internally via inner products between an edge weight matrix and the source variables.
             The matrix sparseness indicated how sparse edge weight matrices are allowed to be. If the sparseness of an
-            edge weight matrix for a given projection would be higher, no edge weight matrix will be built/used.
+            edge weight matrix for a given projection would be higher, no dense edge weight matrix will be built/used
+            (see `sparse_edges`).
         step_size
             Step-size with which the network should be simulated later on. Only needs to be passed here, if the edges of
             the network contain delays. Will be used to discretize the delays.
         solver
+            Numerical solver that will be used for simulations of the network (see `CircuitIR.run` for valid solvers).
+            Edge delays will only be discretized for solvers that do not operate in continuous time.
         dde_approximation_order
             Only relevant for delayed systems. If larger than zero, all discrete delays in the system will be
             automatically approximated by a system of (n+1) coupled ODEs that represent a convolution with a
             gamma distribution centered around the original delay (n is the approximation order).
+        n_batch
+            If provided, `n_batch` parametrizations of the circuit will be simulated in parallel. The circuit itself is
+            compiled only once and the backend state vector and parameters receive a trailing batch axis of length
+            `n_batch` (see `NumpyBackend.add_batch_dim`). The batch members are labeled `batch_0`, `batch_1`, ... and
+            show up as an additional column level in the simulation results.
+        batch_params
+            Key-value pairs for each node variable that should take different values across the batch. Keys follow the
+            format 'node/op/var' (see `CircuitIR.run` for referring to multiple nodes) and values are sequences that
+            contain one value per batch member. If `n_batch` is not provided, it will be inferred from the length of
+            these sequences.
         verbose
             If true, updates about compilation process will be displayed in the terminal.
         in_place
             If true, all variable and equation attributes on operators in the graph will be overwritten, by their
             compiled, backend-compatible versions. If false, a deep copy of the graph will be made first.
+        sparse_edges
+            Only relevant if `vectorization` is True and for the `numpy` backend. Vectorized edges that are too sparse
+            for an edge weight matrix (see `matrix_sparseness`) are realized via a product between a sparse edge weight
+            matrix (`scipy.sparse.csr_matrix`) and the source variables instead of an index matrix of shape
+            (n_targets, n_edges), if the density of the edge weight matrix (the number of edges divided by the number
+            of its entries) does not exceed `sparse_edges`. Memory and time of these edge projections then scale with
+            the number of edges only. Set to None to disable sparse edge weight matrices (e.g. for right-hand side
+            evaluations that are compiled via `numba`).
         kwargs
             Additional keyword arguments that will be passed on to the backend instance. For a full list of viable
             keyword arguments, see the documentation of the respective backend class (`numpy_backend.NumpyBackend` or
             tensorflow_backend.TensorflowBackend).
 
+        Returns
+        -------
+        CircuitIR
+            Compiled circuit. Its attribute `compile_report` contains a `compile_report.CompileReport` with the wall
+            time and peak memory of each compilation phase (including the template application, if the circuit was
+            created via `CircuitTemplate.apply`, and the code generation, which takes place at the first call of
+            `CircuitIR.run`) and the number of nodes, edges, vectorized nodes and edges, parsed equations and backend
+            variables and operations.
+
         """
 
         filterwarnings("ignore", category=FutureWarning)
@@ -1328,11 +1560,20 @@ class CircuitIR(AbstractBaseIR):
         # set basic attributes
         ######################
 
+        report = CompileReport(phases={'apply': self.compile_report.phases['apply']}
+                               if self.compile_report and 'apply' in self.compile_report.phases else None)
+        n_nodes, n_edges = self.graph.number_of_nodes(), self.graph.number_of_edges()
         G = self if in_place else deepcopy(self)
         G.solver = solver
         G.step_size = step_size
+        G.compile_report = report
 
         # instantiate the backend and set the backend default_device
+        if (n_batch or batch_params) and backend != 'numpy':
+            raise ValueError(f'Batched simulations are only available for the numpy backend. Please choose the numpy '
+                             f'backend instead of `{backend}` or remove `n_batch` and `batch_params`.')
+        if backend != 'numpy':
+            sparse_edges = None
         if backend == 'tensorflow':
             from pyrates.backend.tensorflow_backend import TensorflowBackend
             backend = TensorflowBackend
@@ -1350,10 +1591,18 @@ class CircuitIR(AbstractBaseIR):
         kwargs['name'] = G.label
         kwargs['float_default_type'] = float_precision
         G._backend = backend(**kwargs)
+        report.add_phase('setup')
+
+        # collect the batched node variables (the batch dimension is added to the backend, see `_add_batch_dim`)
+        if batch_params and n_batch is None:
+            n_batch = len(next(iter(batch_params.values())))
+        batch_targets = G._get_batch_targets(n_batch, batch_params) if n_batch else []
 
         # run graph optimization and vectorization
         G._first_run = True
         G.optimize_graph_in_place(vectorize=vectorization, dde_approx=dde_approximation_order, verbose=verbose)
+        report.add_phase('optimize')
+        n_vec_nodes, n_vec_edges = G.graph.number_of_nodes(), G.graph.number_of_edges()
 
         # move edge operations to nodes
         ###############################
@@ -1386,7 +1635,7 @@ class CircuitIR(AbstractBaseIR):
                 # check whether the weight matrix is dense enough for this edge realization to be efficient
                 if 1 - len(weight) / (n * m) < matrix_sparseness and n > 1 and m > 1:
 
-                    weight_mat = np.zeros((n, m), dtype=np.float32)
+                    weight_mat = np.zeros((n, m), dtype=G._backend._float_def)
                     if not tidx:
                         tidx = [0 for _ in range(len(sidx))]
                     for row, col, w in zip(tidx, sidx, weight):
@@ -1397,9 +1646,27 @@ class CircuitIR(AbstractBaseIR):
                     weight = weight_mat
                     dot_edge = True
 
+            # check whether the edge projection should be realized via a sparse weight matrix instead of an index matrix
+            # of shape (n_targets, n_edges)
+            sparse_edge = False
+            if not dot_edge and sparse_edges and len(tval['shape']) == 1 and len(sval['shape']) == 1 and \
+                    len(tidx) > 1 and len(sidx) > 1 and \
+                    len(weight) / (tval['shape'][0] * sval['shape'][0]) <= sparse_edges:
+
+                n, m = tval['shape'][0], sval['shape'][0]
+                weight_mat = csr_matrix((np.asarray(weight, dtype=G._backend._float_def), (tidx, sidx)), shape=(n, m))
+
+                # set up weights and edge projection equation
+                eq = f"{tvar} = sparse_dot(weight, {svar})"
+                weight = weight_mat
+                dot_edge = True
+                sparse_edge = True
+
             # set up edge projection equation and edge indices for edges that cannot be realized via a matrix product
             args = {}
-            if len(tidx) > 1 and sum(tval['shape']) > 1:
+            if sparse_edge:
+                d = []
+            elif len(tidx) > 1 and sum(tval['shape']) > 1:
                 d = np.zeros((tval['shape'][0], len(tidx)))
                 for i, t in enumerate(tidx):
                     d[t, i] = 1
@@ -1407,7 +1674,7 @@ class CircuitIR(AbstractBaseIR):
                 d = tidx
             else:
                 d = []
-            idx = "[source_idx]" if sidx and sum(sval['shape']) > 1 else ""
+            idx = "[source_idx]" if sidx and sum(sval['shape']) > 1 and not sparse_edge else ""
             if not dot_edge:
                 if len(d) > 1:
                     eq = f"{tvar} = target_idx @ ({svar}{idx} * weight)"
@@ -1449,6 +1716,8 @@ class CircuitIR(AbstractBaseIR):
                 inputs[tvar] = {'sources': [op_name],
                                 'reduce_dim': True}
 
+        report.add_phase('edges')
+
         if verbose:
             print("    ...all edge operations have been translated to backend-compatible equations.")
 
@@ -1469,6 +1738,7 @@ class CircuitIR(AbstractBaseIR):
 
         # bring equations into correct order
         equations = sort_equations(edge_eqs=edge_equations, node_eqs=node_equations)
+        report.add_phase('collect')
 
         if verbose:
             print("    ...all model equations have been collected from the network.")
@@ -1481,9 +1751,17 @@ class CircuitIR(AbstractBaseIR):
         if verbose:
             print("Parsing the model equations into a compute graph.")
 
+        # noise variables are state variables that are set by stochastic solvers at each integration step
+        noise_keys = []
+        for key, var in variables.items():
+            if type(var) is dict and var.get('vtype') == 'noise':
+                var['vtype'] = 'state_var'
+                noise_keys.append(key)
+
         # parse mapping
         variables = parse_equations(equations=equations, equation_args=variables, backend=G._backend,
                                     squeeze=squeeze_vars)
+        G._noise_vars = [variables[key] for key in noise_keys if key in variables]
         if verbose:
             print("Compilation finished!\n")
 
@@ -1496,6 +1774,20 @@ class CircuitIR(AbstractBaseIR):
                         G[f"{node}/{op}/{var}"]['value'] = val
                     except KeyError as e:
                         pass
+        report.add_phase('parse')
+
+        # simulate all members of a batched circuit in parallel
+        if n_batch:
+            G._add_batch_dim(n_batch, batch_targets)
+            report.add_phase('batch')
+
+        # collect statistics of the compiled network
+        report.stats.update(n_nodes=n_nodes, n_edges=n_edges, n_vectorized_nodes=n_vec_nodes,
+                            n_vectorized_edges=n_vec_edges,
+                            n_equations=sum(len(layer) for layer in equations),
+                            n_backend_vars=len(G._backend.vars),
+                            n_backend_ops=sum(len([op for op in layer if op is not None])
+                                              for layer in G._backend.layers))
 
         return G
 
@@ -1717,7 +2009,7 @@ class CircuitIR(AbstractBaseIR):
         return means, stds, nodes, add_delay
 
     def _process_delays(self, d, discretize=True):
-        if self.step_size is None and self.solver == 'scipy':
+        if self.step_size is None and self.solver in continuous_solvers:
             raise ValueError('Step-size not passed for setting up edge delays. If delays are added to any '
                              'network edge, please pass the simulation `step-size` to the `compile` '
                              'method.')
@@ -1731,7 +2023,7 @@ class CircuitIR(AbstractBaseIR):
 
     def _preprocess_delay(self, delay, discretize=True):
         if discretize:
-            discretize = self.step_size is None or self.solver != 'scipy'
+            discretize = self.step_size is None or self.solver not in continuous_solvers
         return int(np.round(delay / self.step_size, decimals=0)) if discretize else delay
 
     @staticmethod
@@ -1972,7 +2264,7 @@ class CircuitIR(AbstractBaseIR):
         # discretized edge buffers
         ##########################
 
-        elif self.step_size is None or self.solver != 'scipy':
+        elif self.step_size is None or self.solver not in continuous_solvers:
 
             # create buffer variable shapes
             if len(target_shape) < 1 or (len(target_shape) == 1 and target_shape[0] == 1):
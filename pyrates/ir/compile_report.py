@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+#
+# PyRates software framework for flexible implementation of neural
+# network model_templates and simulations. See also:
+# https://github.com/pyrates-neuroscience/PyRates
+#
+# Copyright (C) 2017-2018 the original authors (Richard Gast and
+# Daniel Rose), the Max-Planck-Institute for Human Cognitive Brain
+# Sciences ("MPI CBS") and contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+# CITATION:
+#
+# Richard Gast and Daniel Rose et. al. in preparation
+"""Contains a report of the phases of the compilation of a circuit (wall time and peak memory) and of the size of the
+compiled network, which is attached to compiled circuits as `CircuitIR.compile_report`.
+"""
+
+# external imports
+from time import perf_counter
+from typing import Optional
+import sys
+
+# meta infos
+__author__ = "Richard Gast"
+__status__ = "development"
+
+
+def get_peak_memory() -> Optional[float]:
+    """Returns the peak resident set size of the current process in MB, or None on platforms without the `resource`
+    module.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == 'darwin' else peak / 1024
+
+
+class CompileReport:
+    """Collects the wall time and the peak memory of consecutive compilation phases, as well as statistics about the
+    compiled network. Phases are recorded via `add_phase`, which measures the time since the previous phase (or since
+    the creation of the report).
+
+    Parameters
+    ----------
+    phases
+        Phases that have already been recorded, e.g. the application of a template (see `CircuitTemplate.apply`).
+
+    """
+
+    def __init__(self, phases: Optional[dict] = None):
+        self.phases = dict(phases) if phases else {}
+        self.stats = {}
+        self._t0 = perf_counter()
+
+    @property
+    def total_time(self) -> float:
+        """Summed wall time of all recorded phases in seconds.
+        """
+        return sum(phase['time'] for phase in self.phases.values())
+
+    def add_phase(self, name: str) -> None:
+        """Records the phase `name` as the time span since the previous phase. The time of phases that are recorded
+        repeatedly is accumulated.
+        """
+        t = perf_counter()
+        time = t - self._t0 + (self.phases[name]['time'] if name in self.phases else 0.0)
+        self.phases[name] = {'time': time, 'peak_memory': get_peak_memory()}
+        self._t0 = t
+
+    def reset_timer(self) -> None:
+        """Starts the time span of the next phase at the current time.
+        """
+        self._t0 = perf_counter()
+
+    def to_dict(self) -> dict:
+        """Returns the report as a dictionary of builtin types (e.g. for storing it as JSON).
+        """
+        return {'phases': {name: dict(phase) for name, phase in self.phases.items()},
+                'total_time': self.total_time,
+                'stats': dict(self.stats)}
+
+    def __str__(self):
+        lines = [f"{'phase':<20}{'time [s]':>12}{'peak memory [MB]':>20}"]
+        for name, phase in self.phases.items():
+            mem = f"{phase['peak_memory']:.1f}" if phase['peak_memory'] is not None else "-"
+            lines.append(f"{name:<20}{phase['time']:>12.4f}{mem:>20}")
+        lines.append(f"{'total':<20}{self.total_time:>12.4f}")
+        lines.append("")
+        for key, val in self.stats.items():
+            lines.append(f"{key:<20}{val:>12}")
+        return "\n".join(lines)
@@ -61,6 +61,8 @@ def grid_search(circuit_template: Union[CircuitTemplate, str], param_grid: Union
                 sampling_step_size: Optional[float] = None, permute_grid: bool = False, init_kwargs: dict = None,
                 **kwargs) -> tuple:
     """Function that runs multiple parametrizations of the same circuit in parallel and returns a combined output.
+    If the parameter grid only contains node parameters, the circuit is compiled once as a batch with one member per
+    parameter combination (see `CircuitIR.compile`).
 
     Parameters
     ----------
@@ -108,24 +110,71 @@ def grid_search(circuit_template: Union[CircuitTemplate, str], param_grid: Union
     if type(param_grid) is dict:
         param_grid = linearize_grid(param_grid, permute_grid)
 
-    # create grid-structure of network
-    ##################################
-
     # get parameter names and grid length
     param_keys = list(param_grid.keys())
     N = param_grid.shape[0]
+    circuit_names = [f'{circuit_template.label}_{idx}' for idx in param_grid.index]
+
+    # create batched network
+    ########################
+
+    if all('edges' not in param_map[key] for key in param_keys):
+
+        # map each parameter of the grid to the node variables it should be applied to
+        circuit = circuit_template.apply()
+        batch_params = {}
+        for key in param_keys:
+            if not param_map[key].get('nodes'):
+                raise ValueError(f'Invalid entry of the parameter map: {key}. Each parameter of the grid has to be '
+                                 f'mapped to the nodes (`nodes`) or edges (`edges`) it should be applied to.')
+            n_params = len(batch_params)
+            for var in param_map[key]['vars']:
+                for node in param_map[key]['nodes']:
+                    if "/" in var:
+                        batch_params[f"{node}/{var}"] = param_grid[key].values
+                    else:
+                        for op, _ in circuit[node]:
+                            if var in circuit[node].values[op]:
+                                batch_params[f"{node}/{op}/{var}"] = param_grid[key].values
+            if len(batch_params) == n_params:
+                raise ValueError(f'Invalid entry of the parameter map: {key}. None of the variables '
+                                 f'{param_map[key]["vars"]} has been found on the nodes {param_map[key]["nodes"]}.')
+
+        # create backend graph that contains one replica of the circuit for each parameter combination
+        net = circuit.compile(vectorization=vectorization, batch_params=batch_params, n_batch=N, **init_kwargs)
+
+        # simulate the circuits behavior
+        results = net.run(simulation_time=simulation_time,
+                          step_size=step_size,
+                          sampling_step_size=sampling_step_size,
+                          inputs=inputs,
+                          outputs=outputs,
+                          **kwargs)    # type: pd.DataFrame
+        net.clear()
+
+        # rename batch members of the results
+        if 'profile' in kwargs:
+            results, duration = results
+        results = results.rename(columns={f"batch_{i}": name for i, name in enumerate(circuit_names)}, level=1)
+        param_grid.index = circuit_names
+
+        # return results
+        if 'profile' in kwargs:
+            return results, param_grid, duration
+        return results, param_grid
+
+    # create grid-structure of network
+    ##################################
 
-    # assign parameter updates to each circuit, combine them to unconnected network and remember their parameters
+    # assign parameter updates to each circuit, combine them to unconnected network and remember their parameters.
+    # This is only required if edge parameters are part of the parameter grid, since those cannot be batched.
     circuit = CircuitIR()
-    circuit_names = []
-    for idx in param_grid.index:
+    for idx, circuit_key in zip(param_grid.index, circuit_names):
         new_params = {}
         for key in param_keys:
             new_params[key] = param_grid[key][idx]
-        circuit_key = f'{circuit_template.label}_{idx}'
         circuit_tmp = adapt_circuit(deepcopy(circuit_template).apply(), new_params, param_map)
         circuit.add_circuit(circuit_key, circuit_tmp)
-        circuit_names.append(circuit_key)
     param_grid.index = circuit_names
 
     # create backend graph
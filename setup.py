@@ -49,6 +49,7 @@ setup(name='pyrates',
       python_requires='>=3.6',
       install_requires=INSTALL_REQUIREMENTS,
       extras_require=EXTRAS,
+      entry_points={'console_scripts': ['pyrates-benchmarks = pyrates.benchmarks.__main__:main']},
       classifiers=CLASSIFIERS,
       include_package_data=True  # include additional non-python files specified in MANIFEST.in
       )
@@ -77,3 +77,39 @@ def test_ir_compilation():
     circuit = CircuitIR.from_yaml(path)
 
     circuit.compile()
+
+
+def test_ir_compile_report():
+    """Test, if the phases of the compilation are recorded in the compile report"""
+
+    path = "model_templates.test_resources.test_backend.net13"
+    from pyrates.frontend.template.circuit import CircuitTemplate
+
+    circuit = CircuitTemplate.from_yaml(path).apply()
+    net = circuit.compile(vectorization=True, step_size=1e-3, backend='numpy', solver='euler', verbose=False,
+                          optimize_rhs=False)
+    n_backend_vars = len(net._backend.vars)
+    net.run(0.01, outputs={'a': 'p1/op9/a'}, verbose=False)
+    report = net.compile_report
+    with open(net._backend._module.__file__, 'r') as f:
+        source = f.read()
+
+    # all phases have been recorded, including the template application and the code generation
+    assert list(report.phases) == ['apply', 'setup', 'optimize', 'edges', 'collect', 'parse', 'code_generation']
+    assert all(phase['time'] >= 0. for phase in report.phases.values())
+    assert report.total_time == pytest.approx(sum(phase['time'] for phase in report.phases.values()))
+
+    # network statistics: two nodes with an edge in each direction are vectorized into a single node with a single
+    # edge, and each equation of the network (edge projection, delay buffer, 7 state derivatives and the
+    # non-differential equation of the node operator) is parsed into one backend operation and one line of code
+    assert report.stats['n_nodes'] == 2
+    assert report.stats['n_edges'] == 2
+    assert report.stats['n_vectorized_nodes'] == 1
+    assert report.stats['n_vectorized_edges'] == 1
+    assert report.stats['n_equations'] == report.stats['n_backend_ops'] == 10
+    equation_lines = source.split('# calculate right-hand side update of equation system')[1]
+    equation_lines = equation_lines.split('# update system parameters')[0].strip().split('\n')
+    assert len(equation_lines) == report.stats['n_equations']
+    assert report.stats['n_backend_vars'] == n_backend_vars
+    assert report.to_dict()['stats'] == report.stats
+    net.clear()
@@ -444,3 +444,37 @@ def test_1_7_equation_parsing():
         # numpy-based parsing
         result = parse_equations(equations=[[(eq, 'node/op')]], equation_args=args, backend=b)['node/op/a']
         #assert result == pytest.approx(target, rel=1e-6)
+
+
+def test_1_8_expression_grammar():
+    """Testing the expression grammar that is shared by all expression parsers:
+
+    See Also
+    --------
+    :class:`ExpressionGrammar`: Detailed documentation of the expression grammar.
+    """
+
+    from pyrates.backend.parser import get_expression_grammar
+
+    # the grammar is built only once
+    grammar = get_expression_grammar()
+    assert get_expression_grammar() is grammar
+    b = NumpyBackend()
+    p1 = ExpressionParser("a + b", {'a': np.ones((3,)), 'b': 5.}, backend=b)
+    p2 = ExpressionParser("a * b", {'a': np.ones((3,)), 'b': 5.}, backend=b)
+    assert p1.grammar is grammar and p2.grammar is grammar
+
+    # each parse creates its own expression stack
+    _, stack_1 = grammar.parse("a + b[0:2]")
+    _, stack_2 = grammar.parse("-sin(a) * 2.0")
+    assert stack_1 == ['a', 'b', '[', '0', ':', '2', ']', '+']
+    assert stack_2 == ['a', ')', 'sin(', '-one', '2.0', '*']
+
+    # parse results are cached by expression string
+    grammar.clear_cache()
+    expr_list, stack = grammar.parse("a + b[0:2]")
+    stack.clear()
+    expr_list.clear()
+    _, stack_3 = grammar.parse("a + b[0:2]")
+    assert stack_3 == stack_1
+    assert grammar.cache_hits == 1 and grammar.cache_misses == 1
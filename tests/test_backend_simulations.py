@@ -3,6 +3,7 @@
 
 # external imports
 from typing import Union
+import os
 
 import numpy as np
 import pytest
@@ -50,6 +51,57 @@ def nmrse(x: np.ndarray,
     return np.sqrt(np.sum(diff ** 2, axis=0)) / (max_val - min_val)
 
 
+def simulate_circuit(circuit: str,
+                     op: str,
+                     label: str,
+                     sim_time: float = 10.,
+                     dt: float = 1e-3,
+                     compile_kwargs: dict = None,
+                     inp: np.ndarray = None,
+                     **kwargs
+                     ) -> tuple:
+    """Compiles a circuit of the backend test resources, simulates its behavior for an input to the first node and
+    returns the simulation results together with the generated source code.
+
+    Parameters
+    ----------
+    circuit
+        Name of the circuit template in `model_templates.test_resources.test_backend`.
+    op
+        Name of the operator that defines the state variable `a` and the input `I_ext` in nodes `p1` and `p2`.
+    label
+        Label of the compiled circuit.
+    sim_time
+        Simulation time.
+    dt
+        Integration step-size.
+    compile_kwargs
+        Additional keyword arguments passed to `CircuitTemplate.compile`.
+    inp
+        Input to the first node (a constant input of 0.5 by default).
+    kwargs
+        Additional keyword arguments passed to `ComputeGraph.run`.
+
+    Returns
+    -------
+    tuple
+        Return value of `ComputeGraph.run`, the compute graph and the source code of its right-hand side evaluation.
+    """
+
+    compile_kwargs = dict({'solver': 'euler'}, **(compile_kwargs if compile_kwargs else {}))
+    net_config = CircuitTemplate.from_yaml(f"model_templates.test_resources.test_backend.{circuit}").apply(label=label)
+    net = net_config.compile(vectorization=True, step_size=dt, backend='numpy', cache_dir=None, verbose=False,
+                             **compile_kwargs)
+    if inp is None:
+        inp = np.zeros((int(np.round(sim_time / dt)), 1)) + 0.5
+    r = net.run(sim_time, outputs={'a1': f'p1/{op}/a', 'a2': f'p2/{op}/a'}, inputs={f'p1/{op}/I_ext': inp},
+                verbose=False, **kwargs)
+    with open(net._backend._module.__file__, 'r') as f:
+        source = f.read()
+    net.clear()
+    return r, net, source
+
+
 #########
 # Tests #
 #########
@@ -469,6 +521,28 @@ def test_2_5_solver():
 
     assert np.mean(results.loc[:, 'a2'].values - results2.loc[:, 'a2'].values) == pytest.approx(0., rel=1e-4, abs=1e-4)
 
+    # native runge-kutta and implicit solvers with larger step-sizes (tested)
+    dt2 = 1e-2
+    inp2 = np.zeros((int(np.round(sim_time / dt2, decimals=0)), 1)) + 0.5
+    for i, (solver, tol, kwargs) in enumerate([('heun', 1e-4, {}), ('rk4', 1e-4, {}), ('rk45', 1e-4, {}),
+                                               ('backward_euler', 1e-3, {}), ('ros2', 1e-4, {}),
+                                               ('ros2', 1e-4, {'sparse_jac': True})]):
+        net_config3 = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13"
+                                                ).apply(label=f'net{i+2}')
+        net3 = net_config3.compile(vectorization=True, step_size=dt2, backend=backend, solver=solver)
+        results3 = net3.run(sim_time,
+                            outputs={'a1': 'p1/op9/a',
+                                     'a2': 'p2/op9/a'},
+                            inputs={'p1/op9/I_ext': inp2},
+                            sampling_step_size=dt2,
+                            **kwargs)
+        net3.clear()
+
+        # every 10th sample of the euler solution matches the sampling points of the other solutions
+        assert results3.shape[0] == results.shape[0] // 10
+        assert np.mean(results.loc[:, 'a2'].values[9::10] - results3.loc[:, 'a2'].values) == \
+            pytest.approx(0., rel=tol, abs=tol)
+
 
 def test_2_6_inputs_outputs():
     """Tests the input-output interface of the run method in circuits of different hierarchical depth.
@@ -546,3 +620,935 @@ def test_2_6_inputs_outputs():
     n2.clear()
 
     assert np.mean(r1.values.flatten() - r2.values.flatten()) == pytest.approx(0., rel=1e-4, abs=1e-4)
+
+
+def test_2_7_fused_loop():
+    """Tests the fused integration loop of the numpy backend, in which the whole time-stepping loop is generated as
+    part of the right-hand side evaluation module.
+
+    See Also
+    --------
+    :method:`compile`: Detailed documentation of the code generation performed by the `NumpyBackend`.
+    """
+
+    backend = 'numpy'
+    dt = 1e-3
+    sim_time = 100.
+    sim_steps = int(np.round(sim_time / dt, decimals=0))
+    inp = np.zeros((sim_steps, 1)) + 0.5
+
+    # standard euler solver with python loop (trusted)
+    net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13").apply(label='net0')
+    net = net_config.compile(vectorization=True, step_size=dt, backend=backend, solver='euler')
+    r1 = net.run(sim_time, outputs={'a1': 'p1/op9/a', 'a2': 'p2/op9/a'}, inputs={'p1/op9/I_ext': inp},
+                 sampling_step_size=1e-2)
+    net.clear()
+
+    # euler solver with fused integration loop (tested)
+    net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13").apply(label='net1')
+    net = net_config.compile(vectorization=True, step_size=dt, backend=backend, solver='euler')
+    r2 = net.run(sim_time, outputs={'a1': 'p1/op9/a', 'a2': 'p2/op9/a'}, inputs={'p1/op9/I_ext': inp},
+                 sampling_step_size=1e-2, fused_loop=True)
+    net.clear()
+
+    assert r1.shape == r2.shape
+    assert np.mean(np.abs(r1.values - r2.values)) == pytest.approx(0., rel=1e-6, abs=1e-6)
+
+    # with an output sink, the fused loop is called once per chunk of samples, such that the parameters it updates
+    # (e.g. the position in a time-varying input) have to be passed on between the chunks. Since both loops advance the
+    # time in the same way, their results are identical.
+    from pyrates.backend.output_sinks import CallbackSink
+
+    sim_time = 10.
+    inp = np.sin(np.linspace(0., 4*np.pi, int(np.round(sim_time / dt))))[:, None]
+    for solver in ['euler', 'rk4']:
+        r1, _, _ = simulate_circuit('net13', 'op9', 'net2', sim_time=sim_time, dt=dt, inp=inp,
+                                    compile_kwargs={'solver': solver}, sampling_step_size=1e-2)
+        chunks = []
+        sink = CallbackSink(lambda t, x: chunks.append(x.copy()), chunk_size=64)
+        simulate_circuit('net13', 'op9', 'net3', sim_time=sim_time, dt=dt, inp=inp, compile_kwargs={'solver': solver},
+                         sampling_step_size=1e-2, fused_loop=True, out_sink=sink)
+        np.testing.assert_array_equal(np.concatenate(chunks, axis=0), r1.values)
+
+    # the fused loop can be compiled as a whole via numba (which may round single-precision operations differently)
+    numba = pytest.importorskip('numba')
+    for solver in ['euler', 'rk4']:
+        r1, _, _ = simulate_circuit('net13', 'op9', 'net4', sim_time=1., dt=dt, compile_kwargs={'solver': solver},
+                                    sampling_step_size=1e-2)
+        r2, _, source = simulate_circuit('net13', 'op9', 'net5', sim_time=1., dt=dt, compile_kwargs={'solver': solver},
+                                         sampling_step_size=1e-2, fused_loop=True, decorator=numba.njit)
+        assert 'def run_loop(' in source
+        np.testing.assert_allclose(r2.values, r1.values, rtol=1e-5)
+
+
+def test_2_8_batched_simulation():
+    """Tests batched simulations, in which multiple parametrizations of the same circuit are simulated in parallel via
+    a batch axis of the backend state vector and parameters.
+
+    See Also
+    --------
+    :method:`CircuitIR.compile`: Detailed documentation of the arguments `n_batch` and `batch_params`.
+    """
+
+    backend = 'numpy'
+    dt = 1e-3
+    sim_time = 20.
+    sim_steps = int(np.round(sim_time / dt, decimals=0))
+    inp = np.zeros((sim_steps, 1)) + 0.5
+    taus = [5., 10., 20.]
+
+    # batched simulation (tested)
+    net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13").apply(label='net0')
+    net = net_config.compile(vectorization=True, step_size=dt, backend=backend, solver='euler',
+                             batch_params={'p1/op9/tau': taus})
+    r1 = net.run(sim_time, outputs={'a1': 'p1/op9/a', 'a2': 'p2/op9/a'}, inputs={'p1/op9/I_ext': inp})
+    with open(net._backend._module.__file__, 'r') as f:
+        source = f.read()
+    n_state = net._backend.vars['y'].shape[0] // len(taus)
+    n_nodes = len(net.nodes)
+    net.clear()
+
+    # the circuit is not replicated, instead the state vector receives a trailing batch axis
+    assert f"y_batch = y.reshape(({n_state}, {len(taus)}))" in source
+    assert f"return y_delta.reshape({n_state*len(taus)})" in source
+
+    # separate simulations (trusted)
+    for i, tau in enumerate(taus):
+        net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13"
+                                               ).apply(label=f'net{i+1}', node_values={'p1/op9/tau': tau})
+        net = net_config.compile(vectorization=True, step_size=dt, backend=backend, solver='euler')
+        r2 = net.run(sim_time, outputs={'a1': 'p1/op9/a', 'a2': 'p2/op9/a'}, inputs={'p1/op9/I_ext': inp})
+        net.clear()
+
+        assert len(net.nodes) == n_nodes
+        for key in ['a1', 'a2']:
+            assert np.mean(np.abs(r1[(key, f'batch_{i}')].values.squeeze() - r2[key].values.squeeze())) == \
+                   pytest.approx(0., rel=1e-6, abs=1e-6)
+
+    # batched grid searches reject parameters that are not mapped to any node variable
+    from pyrates.utility.grid_search import grid_search
+    for param_map in [{'tau': {'vars': ['op9/tau']}}, {'tau': {'vars': ['tau_x'], 'nodes': ['p1']}}]:
+        with pytest.raises(ValueError):
+            grid_search("model_templates.test_resources.test_backend.net13", {'tau': taus}, param_map, dt, sim_time,
+                        inputs={}, outputs={'a': 'p1/op9/a'},
+                        init_kwargs={'step_size': dt, 'backend': backend, 'solver': 'euler'})
+
+
+def test_2_9_output_sink(tmp_path):
+    """Tests streaming of the output variables into output sinks, which receive the sampled output variables in chunks
+    during the simulation.
+
+    See Also
+    --------
+    :module:`pyrates.backend.output_sinks`: Detailed documentation of the available output sinks.
+    """
+
+    from pyrates.backend.output_sinks import NpySink, CallbackSink
+
+    backend = 'numpy'
+    dt = 1e-3
+    sim_time = 10.
+    sim_steps = int(np.round(sim_time / dt, decimals=0))
+    inp = np.zeros((sim_steps, 1)) + 0.5
+
+    for i, (solver, fused_loop) in enumerate([('euler', False), ('euler', True), ('rk45', False),
+                                              ('scipy', False)]):
+
+        # simulation with results stored in memory (trusted)
+        net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13"
+                                               ).apply(label=f'net{2*i}')
+        net = net_config.compile(vectorization=True, step_size=dt, backend=backend, solver=solver)
+        r1 = net.run(sim_time, outputs={'a1': 'p1/op9/a', 'a2': 'p2/op9/a'}, inputs={'p1/op9/I_ext': inp},
+                     sampling_step_size=1e-2, solver=solver, fused_loop=fused_loop)
+        net.clear()
+
+        # simulations with results streamed into a memory-mapped file and a callback (tested)
+        chunks = []
+        npy_sink = NpySink(str(tmp_path / f"results_{i}.npy"), chunk_size=64)
+        for j, sink in enumerate([npy_sink, CallbackSink(lambda t, x: chunks.append(x.copy()), chunk_size=64)]):
+            net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13"
+                                                   ).apply(label=f'net{2*i+1}_{j}')
+            net = net_config.compile(vectorization=True, step_size=dt, backend=backend, solver=solver)
+            r2 = net.run(sim_time, outputs={'a1': 'p1/op9/a', 'a2': 'p2/op9/a'}, inputs={'p1/op9/I_ext': inp},
+                         sampling_step_size=1e-2, solver=solver, fused_loop=fused_loop, out_sink=sink)
+            net.clear()
+            assert r2 is sink
+
+        r2 = npy_sink.load()
+        r3 = np.concatenate(chunks, axis=0)
+        assert all([len(c) <= 64 for c in chunks])
+        assert r1.shape == r2.shape == r3.shape
+        assert list(r1.columns) == list(r2.columns)
+        assert np.mean(np.abs(r1.values - r2.values)) == pytest.approx(0., rel=1e-6, abs=1e-6)
+        assert np.mean(np.abs(r1.values - r3)) == pytest.approx(0., rel=1e-6, abs=1e-6)
+
+
+def test_2_10_output_reductions():
+    """Tests output reductions, which are applied chunk-wise to the output variables during the simulation.
+
+    See Also
+    --------
+    :class:`pyrates.backend.output_sinks.ReductionSink`: Detailed documentation of the available output reductions.
+    """
+
+    backend = 'numpy'
+    dt = 1e-3
+    sim_time = 10.
+    sim_steps = int(np.round(sim_time / dt, decimals=0))
+    inp = np.zeros((sim_steps, 1)) + 0.5
+
+    # simulation with full output variables (trusted)
+    net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13").apply(label='net0')
+    net = net_config.compile(vectorization=True, step_size=dt, backend=backend, solver='euler')
+    r1 = net.run(sim_time, outputs={'a1': 'p1/op9/a', 'a2': 'p2/op9/a'}, inputs={'p1/op9/I_ext': inp},
+                 sampling_step_size=1e-2)
+    net.clear()
+    a1, a2 = r1['a1'].values.squeeze(), r1['a2'].values.squeeze()
+
+    # simulation with output reductions (tested)
+    net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13").apply(label='net1')
+    net = net_config.compile(vectorization=True, step_size=dt, backend=backend, solver='euler')
+    r2 = net.run(sim_time, outputs={'mean': ('p1/op9/a', 'mean'), 'var': ('p1/op9/a', 'var'),
+                                    'min': ('p2/op9/a', 'min'), 'max': ('p2/op9/a', 'max'),
+                                    'dec': ('p1/op9/a', 'decimate', 7)},
+                 inputs={'p1/op9/I_ext': inp}, sampling_step_size=1e-2)
+    net.clear()
+
+    n = len(a1) // 7
+    stats = r2.iloc[-1]
+    assert r2.shape[0] == n + 1
+    assert stats['mean'].values[0] == pytest.approx(np.mean(a1), rel=1e-6, abs=1e-6)
+    assert stats['var'].values[0] == pytest.approx(np.var(a1), rel=1e-6, abs=1e-6)
+    assert stats['min'].values[0] == pytest.approx(np.min(a2), rel=1e-6, abs=1e-6)
+    assert stats['max'].values[0] == pytest.approx(np.max(a2), rel=1e-6, abs=1e-6)
+    assert np.mean(np.abs(r2['dec'].dropna().values.squeeze() - np.mean(np.reshape(a1[:n*7], (n, 7)), axis=1))) == \
+           pytest.approx(0., rel=1e-6, abs=1e-6)
+
+
+def test_2_11_stochastic_solver():
+    """Tests the Euler-Maruyama solver for stochastic differential equations with noise variables.
+
+    See Also
+    --------
+    :method:`add_noise_layer`: Detailed documentation of how noise variables are realized in the `NumpyBackend`.
+    """
+
+    backend = 'numpy'
+    dt = 1e-3
+    sim_time = 2.
+    sim_steps = int(np.round(sim_time / dt, decimals=0))
+    block_size = 300
+    seed = 42
+
+    # euler-maruyama solver (tested)
+    net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net_noise").apply(label='net0')
+    net = net_config.compile(vectorization=True, step_size=dt, backend=backend, solver='euler_maruyama')
+    r1 = net.run(sim_time, outputs={'a': 'all/op_noise/a'}, seed=seed, noise_block_size=block_size)
+    net.clear()
+
+    # euler-maruyama steps of an ornstein-uhlenbeck process with the same noise samples (trusted)
+    rng = np.random.default_rng(seed)
+    a = np.zeros((2,), dtype=np.float32)
+    r2 = np.zeros((sim_steps, 2))
+    for step in range(sim_steps):
+        if step % block_size == 0:
+            noise = (rng.standard_normal((block_size, 2)) / np.sqrt(dt)).astype(np.float32)
+        a = a + dt * (-a / 2.0 + 0.5 * noise[step % block_size])
+        r2[step, :] = a
+
+    assert np.mean(np.abs(r1.values - r2)) == pytest.approx(0., rel=1e-6, abs=1e-6)
+
+    # without stochastic solver, noise variables are zero
+    net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net_noise").apply(label='net1')
+    net = net_config.compile(vectorization=True, step_size=dt, backend=backend, solver='euler')
+    r3 = net.run(sim_time, outputs={'a': 'all/op_noise/a'})
+    net.clear()
+
+    assert np.mean(np.abs(r3.values)) == pytest.approx(0., rel=1e-6, abs=1e-6)
+
+
+def test_2_12_jacobian():
+    """Tests the jacobian evaluation of the implicit solvers and the sparsity pattern of the jacobian that is passed to
+    the implicit methods of `scipy.integrate.solve_ivp`.
+
+    See Also
+    --------
+    :method:`_get_jacobian_func`: Detailed documentation of the jacobian evaluation of the `NumpyBackend`.
+    :method:`_get_jac_sparsity`: Detailed documentation of the detection of the sparsity pattern.
+    """
+
+    from pyrates.backend.numpy_backend import NumpyBackend
+
+    # jacobian of a system with tri-diagonal coupling
+    n = 200
+    A = np.diag(-2. * np.ones(n)) + np.diag(np.ones(n - 1), 1) + np.diag(np.ones(n - 1), -1)
+    y = np.linspace(0., 1., n)
+    calls = []
+
+    def rhs(t, y_tmp):
+        calls.append(t)
+        return A @ y_tmp + np.sin(y_tmp)
+
+    # dense jacobians perturb each state variable separately
+    jac_eval = NumpyBackend._get_jacobian_func(rhs, t=0., y=y)
+    calls.clear()
+    jac = jac_eval(0., y)
+    assert isinstance(jac, np.ndarray) and jac.shape == (n, n)
+    assert len(calls) == n + 1
+    assert np.max(np.abs(jac - A - np.diag(np.cos(y)))) == pytest.approx(0., rel=1e-6, abs=1e-6)
+
+    # sparse jacobians perturb the three groups of structurally independent state variables together
+    jac_eval = NumpyBackend._get_jacobian_func(rhs, t=0., y=y, sparse=True)
+    calls.clear()
+    jac = jac_eval(0., y)
+    assert jac.shape == (n, n) and jac.nnz == 3 * n - 2
+    assert len(calls) == 4
+    assert np.max(np.abs(jac.toarray() - A - np.diag(np.cos(y)))) == pytest.approx(0., rel=1e-6, abs=1e-6)
+
+    # couplings that vanish on one side of the initial state are detected at one of the perturbed states
+    rows, cols = NumpyBackend._get_jac_sparsity(lambda t, y_tmp: np.asarray([np.minimum(y_tmp[1], 0.), -y_tmp[1]]),
+                                                t=0., y=np.zeros((2,)))
+    assert sorted(zip(rows, cols)) == [(0, 0), (0, 1), (1, 1)]
+
+    # simulations via implicit methods with jacobian (tested) vs. euler solver (trusted)
+    backend = 'numpy'
+    dt = 1e-3
+    sim_time = 10.
+    sim_steps = int(np.round(sim_time / dt, decimals=0))
+    inp = np.zeros((sim_steps, 1)) + 0.5
+
+    net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13").apply(label='net0')
+    net = net_config.compile(vectorization=True, step_size=dt, backend=backend, solver='euler')
+    r1 = net.run(sim_time, outputs={'a1': 'p1/op9/a', 'a2': 'p2/op9/a'}, inputs={'p1/op9/I_ext': inp},
+                 sampling_step_size=1e-2)
+    net.clear()
+
+    for i, (method, sparse_jac) in enumerate([('BDF', True), ('Radau', True), ('LSODA', False)]):
+        net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13"
+                                               ).apply(label=f'net{i+1}')
+        net = net_config.compile(vectorization=True, step_size=dt, backend=backend, solver='scipy')
+        r2 = net.run(sim_time, outputs={'a1': 'p1/op9/a', 'a2': 'p2/op9/a'}, inputs={'p1/op9/I_ext': inp},
+                     sampling_step_size=1e-2, solver='scipy', method=method, sparse_jac=sparse_jac)
+        net.clear()
+        assert np.mean(np.abs(r1.values - r2.values)) == pytest.approx(0., rel=1e-3, abs=1e-3)
+
+
+def test_2_13_checkpoints(tmp_path):
+    """Tests checkpoints of simulations, from which interrupted simulations can be continued.
+
+    See Also
+    --------
+    :method:`_write_checkpoint`: Detailed documentation of the information stored in checkpoints.
+    """
+
+    import json
+    from pyrates.backend.output_sinks import NpySink
+
+    class Interruption(Exception):
+        pass
+
+    class InterruptedSink(NpySink):
+        def _write(self, chunk, idx):
+            if idx >= 500:
+                raise Interruption
+            super()._write(chunk, idx)
+
+    dt = 1e-3
+    sim_time = 10.
+    inp = np.zeros((int(np.round(sim_time / dt, decimals=0)), 1)) + 0.5
+    configs = [("net13", 'euler', {'a1': 'p1/op9/a', 'a2': 'p2/op9/a'}, {'inputs': {'p1/op9/I_ext': inp}}),
+               ("net_noise", 'euler_maruyama', {'a': 'all/op_noise/a'}, {'seed': 1, 'noise_block_size': 700})]
+
+    for i, (net_name, solver, outputs, kwargs) in enumerate(configs):
+
+        def compile_net(label):
+            net_config = CircuitTemplate.from_yaml(f"model_templates.test_resources.test_backend.{net_name}"
+                                                   ).apply(label=label)
+            return net_config.compile(vectorization=True, step_size=dt, backend='numpy', solver=solver)
+
+        # uninterrupted simulation (trusted)
+        net = compile_net(f'net{i}_0')
+        r1 = net.run(sim_time, outputs=outputs, sampling_step_size=1e-2, **kwargs)
+        net.clear()
+
+        # simulation that is interrupted after the first checkpoint and continued from that checkpoint (tested)
+        checkpoint = str(tmp_path / f"checkpoint_{i}.npz")
+        results = str(tmp_path / f"results_{i}.npy")
+        net = compile_net(f'net{i}_1')
+        with pytest.raises(Interruption):
+            net.run(sim_time, outputs=outputs, sampling_step_size=1e-2, out_sink=InterruptedSink(results, chunk_size=100),
+                    checkpoint=checkpoint, checkpoint_interval=3., **kwargs)
+        net.clear()
+        net = compile_net(f'net{i}_2')
+        r2 = net.run(sim_time, outputs=outputs, sampling_step_size=1e-2, out_sink=NpySink(results, chunk_size=100),
+                     resume=checkpoint, **kwargs).load()
+        net.clear()
+
+        assert r1.shape == r2.shape
+        assert np.mean(np.abs(r1.values - r2.values)) == pytest.approx(0., rel=1e-6, abs=1e-6)
+
+        # checkpoints can be loaded without unpickling, and the output samples are persisted by the output sink
+        # instead of the checkpoint
+        with np.load(checkpoint, allow_pickle=False) as f:
+            meta = json.loads(str(f['__meta__']))
+            assert f['y'].ndim == 1 and f['y'].shape[0] > 0
+            assert 'results' not in meta and meta['step'] == 3000
+
+    # checkpoints require an output sink
+    net = compile_net('net2_0')
+    with pytest.raises(ValueError):
+        net.run(sim_time, outputs=outputs, sampling_step_size=1e-2, checkpoint=str(tmp_path / "checkpoint.npz"),
+                **kwargs)
+    net.clear()
+
+
+def test_2_14_events():
+    """Tests events that are evaluated during the simulation and can terminate it early.
+
+    See Also
+    --------
+    :class:`Event`: Detailed documentation of the event base class.
+    """
+
+    from pyrates.backend.events import ThresholdEvent, ConvergenceEvent, DivergenceEvent
+
+    dt = 1e-3
+    sim_time = 10.
+    inp = np.zeros((int(np.round(sim_time / dt, decimals=0)), 1)) + 0.5
+    outputs = {'a1': 'p1/op9/a', 'a2': 'p2/op9/a'}
+
+    def compile_net(label, solver='euler'):
+        net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13").apply(label=label)
+        return net_config.compile(vectorization=True, step_size=dt, backend='numpy', solver=solver)
+
+    # simulation without events (trusted)
+    net = compile_net('net0')
+    r1 = net.run(sim_time, outputs=outputs, inputs={'p1/op9/I_ext': inp}, sampling_step_size=1e-2)
+    net.clear()
+    threshold = 0.5 * np.max(r1['a1'].values)
+
+    # non-terminal events only record the times at which they occurred (tested)
+    threshold_event = ThresholdEvent('p1/op9/a', threshold)
+    divergence_event = DivergenceEvent()
+    net = compile_net('net1')
+    r2 = net.run(sim_time, outputs=outputs, inputs={'p1/op9/I_ext': inp}, sampling_step_size=1e-2,
+                 events=[threshold_event, divergence_event])
+    net.clear()
+    assert r2.shape == r1.shape
+    assert np.mean(np.abs(r1.values - r2.values)) == pytest.approx(0., rel=1e-6, abs=1e-6)
+    assert len(threshold_event.times) == 1
+    assert not divergence_event.triggered
+    t_cross = r1.index[np.argmax(r1['a1'].values[:, 0] >= threshold)]
+    assert threshold_event.times[0] == pytest.approx(t_cross, rel=1e-6, abs=1e-2)
+
+    # terminal events stop the simulation (tested)
+    divergence_event = DivergenceEvent(max_value=threshold, var='p1/op9/a')
+    net = compile_net('net2', solver='rk4')
+    r3 = net.run(sim_time, outputs=outputs, inputs={'p1/op9/I_ext': inp}, sampling_step_size=1e-2,
+                 events=[divergence_event])
+    net.clear()
+    assert divergence_event.times[0] == pytest.approx(threshold_event.times[0], rel=1e-6, abs=1e-2)
+    assert r3.shape[0] < r1.shape[0]
+    assert r3.index[-1] <= divergence_event.times[0]
+
+    # without input, the network rests at its fixed point, which is detected after `min_steps` steps (tested)
+    net = compile_net('net3')
+    r4 = net.run(sim_time, outputs=outputs, sampling_step_size=1e-2, events=['convergence'])
+    net.clear()
+    assert r4.shape[0] == 10
+
+    # convergence requires the right-hand side update to stay below the tolerance for consecutive steps (tested)
+    convergence_event = ConvergenceEvent(tol=1e-3, min_steps=3)
+    convergence_event.open()
+    y = np.zeros((2,))
+    updates = [[0., 0.], [0., 0.], [1., 0.], [0., 0.], [0., 0.], [0., 0.]]
+    assert [convergence_event.update(float(i), y, np.asarray(dy)) for i, dy in enumerate(updates)] == \
+           [False, False, False, False, False, True]
+    assert convergence_event.times == [5.]
+
+
+def test_2_15_module_cache(tmp_path):
+    """Tests the cache of generated right-hand side modules, which are stored under a hash of their source code and
+    compilation settings.
+
+    See Also
+    --------
+    :method:`_get_module_name`: Detailed documentation of the content-addressed module names.
+    """
+
+    dt = 1e-3
+    sim_time = 10.
+    inp = np.zeros((int(np.round(sim_time / dt, decimals=0)), 1)) + 0.5
+    cache_dir = str(tmp_path)
+
+    def simulate(label, solver='euler', **kwargs):
+        net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13").apply(label=label)
+        net = net_config.compile(vectorization=True, step_size=dt, backend='numpy', solver=solver, **kwargs)
+        r = net.run(sim_time, outputs={'a1': 'p1/op9/a', 'a2': 'p2/op9/a'}, inputs={'p1/op9/I_ext': inp},
+                    sampling_step_size=1e-2)
+        module = net._backend._module_name
+        net.clear()
+        return r, module
+
+    # simulation without cache (trusted)
+    r1, m1 = simulate('net0', cache_dir=None)
+    assert m1 == 'rhs_func'
+
+    # first simulation writes the module to the cache, second simulation re-uses it (tested)
+    r2, m2 = simulate('net1', cache_dir=cache_dir)
+    fn = os.path.join(cache_dir, f"{m2}.py")
+    assert os.path.exists(fn)
+    mtime = os.path.getmtime(fn)
+    r3, m3 = simulate('net2', cache_dir=cache_dir)
+    assert m3 == m2
+    assert os.path.getmtime(fn) == mtime
+    assert np.mean(np.abs(r1.values - r2.values)) == pytest.approx(0., rel=1e-6, abs=1e-6)
+    assert np.mean(np.abs(r1.values - r3.values)) == pytest.approx(0., rel=1e-6, abs=1e-6)
+
+    # different source code or compilation settings result in different modules (tested)
+    _, m4 = simulate('net3', solver='rk4', cache_dir=cache_dir)
+    _, m5 = simulate('net4', cache_dir=cache_dir, float_precision='float64')
+    assert len({m2, m4, m5}) == 3
+
+
+def test_2_16_concurrent_models():
+    """Tests simulations of multiple compiled models that are kept alive in a single process and run concurrently.
+
+    See Also
+    --------
+    :method:`_load_module`: Detailed documentation of the loading of generated modules.
+    """
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    dt = 1e-3
+    sim_time = 10.
+    inputs = [np.zeros((int(np.round(sim_time / dt, decimals=0)), 1)) + val for val in [0.2, 0.5, 1.0]]
+    outputs = {'a1': 'p1/op9/a', 'a2': 'p2/op9/a'}
+
+    def compile_nets(prefix):
+        return [CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13"
+                                          ).apply(label=f'{prefix}{i}').compile(vectorization=True, step_size=dt,
+                                                                                backend='numpy', solver=solver,
+                                                                                cache_dir=None)
+                for i, solver in enumerate(['euler', 'rk4', 'euler'])]
+
+    def simulate(net, inp):
+        return net.run(sim_time, outputs=outputs, inputs={'p1/op9/I_ext': inp}, sampling_step_size=1e-2,
+                       verbose=False)
+
+    # sequential simulations of one model at a time (trusted)
+    results = []
+    for net, inp in zip(compile_nets('net_seq'), inputs):
+        results.append(simulate(net, inp))
+        net.clear()
+
+    # concurrent simulations of all models (tested)
+    nets = compile_nets('net_con')
+    with ThreadPoolExecutor(max_workers=len(nets)) as executor:
+        results_con = list(executor.map(simulate, nets, inputs))
+    for net in nets:
+        net.clear()
+
+    for r1, r2 in zip(results, results_con):
+        assert r1.shape == r2.shape
+        assert np.mean(np.abs(r1.values - r2.values)) == pytest.approx(0., rel=1e-6, abs=1e-6)
+
+
+def test_2_17_input_lookup():
+    """Tests the lookup of extrinsic inputs on their uniform time grid and the sharing of inputs across nodes.
+
+    See Also
+    --------
+    :method:`add_input_layer`: Detailed documentation of the input layer of the numpy backend.
+    """
+
+    from pyrates.backend.funcs import pr_interp_uniform, pr_hold_uniform
+
+    # lookup functions (tested) vs. numpy interpolation (trusted)
+    T = 2.0
+    y = np.random.RandomState(0).randn(201, 3)
+    time = np.linspace(0, T, y.shape[0])
+    for t in [0., 0.0123, 0.5, 1.2345, 1.999, 2.0, 2.0 + 1e-12]:
+        y_lin = pr_interp_uniform(y, t, (y.shape[0] - 1) / T)
+        y_zoh = pr_hold_uniform(y, t, (y.shape[0] - 1) / T)
+        assert np.allclose(y_lin, [np.interp(t, time, y[:, i]) for i in range(y.shape[1])])
+        assert np.allclose(y_zoh, y[min(int(np.searchsorted(time, t, side='right')) - 1, y.shape[0] - 1)])
+
+    # the zero-order hold returns the sample at a sample time, also if the time carries the round-off of single
+    # precision, whereas times that fall short of a sample time by a larger fraction of the sample interval do not
+    from pyrates.backend.funcs import hold_uniform_tol
+    scale = (y.shape[0] - 1) / T
+    for idx in range(1, y.shape[0]):
+        for t in [time[idx], float(np.float32(time[idx])), np.nextafter(np.float32(time[idx]), np.float32(0.))]:
+            assert np.array_equal(pr_hold_uniform(y, t, scale), y[idx])
+        assert np.array_equal(pr_hold_uniform(y, time[idx] - 2 * hold_uniform_tol / scale, scale), y[idx - 1])
+
+    dt = 1e-3
+    sim_time = 10.
+    sim_steps = int(np.round(sim_time / dt, decimals=0))
+    outputs = {'a': 'all/op9/a'}
+
+    def simulate(label, inp, solver='euler', **kwargs):
+        net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13").apply(label=label)
+        net = net_config.compile(vectorization=True, step_size=dt, backend='numpy', solver=solver)
+        r = net.run(sim_time, outputs=outputs, inputs={'all/op9/I_ext': inp}, sampling_step_size=1e-2, **kwargs)
+        net.clear()
+        return r
+
+    # an input for each node (trusted) vs. an input that is shared by all nodes (tested)
+    inp = np.sin(np.linspace(0, 2*np.pi, sim_steps))[:, None]
+    for i, solver in enumerate(['euler', 'rk4']):
+        r1 = simulate(f'net{i}_0', np.tile(inp, (1, 2)), solver=solver)
+        r2 = simulate(f'net{i}_1', inp, solver=solver)
+        assert np.mean(np.abs(r1.values - r2.values)) == pytest.approx(0., rel=1e-6, abs=1e-6)
+
+    # piecewise-linear interpolation (trusted) vs. zero-order hold (tested) of a piecewise-constant input
+    inp = np.repeat(np.random.RandomState(1).rand(sim_steps // 100, 1), 100, axis=0)
+    r1 = simulate('net2_0', inp, solver='rk4')
+    r2 = simulate('net2_1', inp, solver='rk4', input_interpolation='zoh')
+    assert np.mean(np.abs(r1.values - r2.values)) == pytest.approx(0., rel=1e-3, abs=1e-3)
+
+    # inputs with the same (trusted) vs. a different (tested) number of samples, which are looked up on their own time
+    # grids (the coarse grid points are a subset of the fine grid points, such that the interpolants are identical)
+    time = np.linspace(0, sim_time, sim_steps)
+    time_coarse = np.linspace(0, sim_time, 102)
+    inp1 = np.sin(time)[:, None]
+    inp2 = np.cos(3*time_coarse)[:, None]
+    results = []
+    for i, inp in enumerate([np.interp(time, time_coarse, inp2[:, 0])[:, None], inp2]):
+        net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13"
+                                               ).apply(label=f'net3_{i}')
+        net = net_config.compile(vectorization=True, step_size=dt, backend='numpy', solver='rk4')
+        results.append(net.run(sim_time, outputs=outputs, inputs={'p1/op9/I_ext': inp1, 'p2/op9/I_ext': inp},
+                               sampling_step_size=1e-2))
+        net.clear()
+    np.testing.assert_allclose(results[0].values, results[1].values, rtol=1e-5, atol=1e-6)
+
+
+def test_2_18_input_sources(tmp_path):
+    """Tests inputs that are pulled block-wise from memory-mapped arrays, functions and generators during the
+    simulation.
+
+    See Also
+    --------
+    :method:`add_input_layer`: Detailed documentation of the input layer of the numpy backend.
+    :class:`pyrates.backend.input_sources.InputSource`: Base class of the input sources.
+    """
+
+    dt = 1e-3
+    sim_time = 5.
+    sim_steps = int(np.round(sim_time / dt, decimals=0))
+    outputs = {'a': 'all/op9/a'}
+    time = np.linspace(0, sim_time, sim_steps)
+    inp = np.stack([np.sin(2*time), np.cos(3*time)], axis=1)
+    np.save(tmp_path / 'inp.npy', inp)
+
+    def simulate(label, inp, solver='euler', **kwargs):
+        net_config = CircuitTemplate.from_yaml("model_templates.test_resources.test_backend.net13").apply(label=label)
+        net = net_config.compile(vectorization=True, step_size=dt, backend='numpy', solver=solver)
+        r = net.run(sim_time, outputs=outputs, inputs={'all/op9/I_ext': inp}, sampling_step_size=1e-2, **kwargs)
+        net.clear()
+        return r
+
+    def generator(chunk_size=337):
+        for i in range(0, sim_steps, chunk_size):
+            yield inp[i:i+chunk_size]
+
+    # input arrays (trusted) vs. input sources (tested)
+    for i, solver in enumerate(['euler', 'rk4', 'euler_maruyama']):
+        r1 = simulate(f'net{i}_0', inp, solver=solver)
+        sources = [np.load(tmp_path / 'inp.npy', mmap_mode='r'), lambda t: [np.sin(2*t), np.cos(3*t)], generator()]
+        for j, source in enumerate(sources):
+            r2 = simulate(f'net{i}_{j+1}', source, solver=solver, input_block_size=97)
+            assert np.mean(np.abs(r1.values - r2.values)) == pytest.approx(0., rel=1e-6, abs=1e-6)
+
+    # input sources require the native fixed step-size solvers
+    with pytest.raises(ValueError):
+        simulate('net3_0', generator(), solver='rk45')
+
+
+def test_2_19_op_profile():
+    """Tests the per-operator timing counters of the numpy backend.
+
+    See Also
+    --------
+    :method:`compile`: Detailed documentation of the code generation of the numpy backend.
+    """
+
+    dt = 1e-3
+    sim_time = 10.
+    sim_steps = int(np.round(sim_time / dt, decimals=0))
+
+    # simulation without (trusted) vs. with timing counters (tested)
+    r1, _, _ = simulate_circuit('net13', 'op9', 'net0', sim_time=sim_time, dt=dt)
+    (r2, _), net, source = simulate_circuit('net13', 'op9', 'net1', sim_time=sim_time, dt=dt, profile='ops')
+    np.testing.assert_allclose(r2.values, r1.values)
+
+    # each equation is timed within the block of its operator, and each operator counts its evaluations once
+    scopes = net._backend._op_scopes
+    lines = source.split('# calculate right-hand side update of equation system')[1]
+    lines = [line.strip() for line in lines.split('# update system parameters')[0].split('\n') if line.strip()]
+    blocks, block = {}, []
+    for line in lines:
+        if line.startswith('op_profile[') and line.endswith(', 0] += perf_counter() - t_op'):
+            blocks.setdefault(scopes[int(line[len('op_profile['):].split(',')[0])], []).extend(block)
+        elif line == 't_op = perf_counter()':
+            block = []
+        elif not line.startswith('op_profile['):
+            block.append(line)
+    assert f"op_profile = np.zeros(({len(scopes)}, 2))" in source
+    assert all(source.count(f"op_profile[{i}, 1] += 1") == 1 for i in range(len(scopes)))
+    assert blocks['vector_node0/edge_from_vector_node0_0'] == \
+           ['I_syn = np.dot(target_idx, np.multiply(b_buffered, weight))']
+    assert blocks['network_inputs'] == ['I_ext[0:1] = I_ext_inp[in_var_idx]', 'in_var_idx += 1']
+    assert blocks['vector_node0/op9'][0] == 'b = np.tanh(a)'
+    assert sum(len(block) for block in blocks.values()) == \
+           len([line for line in lines if not line.startswith(('op_profile[', 't_op = '))])
+
+    # each operator and edge operator is evaluated once per integration step
+    profile = net.op_profile
+    assert 'vector_node0/op9' in profile.index
+    assert len(profile[profile['type'] == 'edge']) == 1
+    assert all(profile['calls'] == sim_steps)
+    assert all(profile['time'] > 0.)
+    assert profile['fraction'].sum() == pytest.approx(1.)
+
+    # timing counters require a pure python right-hand side evaluation
+    with pytest.raises(ValueError):
+        simulate_circuit('net13', 'op9', 'net2', sim_time=sim_time, dt=dt, profile='ops', fused_loop=True)
+
+
+def test_2_20_static_shape_inference():
+    """Tests the static shape and data-type inference of the numpy backend operations against their evaluation.
+
+    See Also
+    --------
+    :method:`PyRatesOp.build_op`: Detailed documentation of the shape and data-type inference of operations.
+    """
+
+    from pyrates.backend.numpy_backend import NumpyBackend
+
+    # shapes and data-types of operations are inferred without evaluating them
+    b = NumpyBackend(cache_dir=None)
+    W = b.add_var('state_var', name='W', value=np.ones((3, 4)), dtype='float64')
+    x = b.add_var('state_var', name='x', value=np.ones((4,)), dtype='float32')
+    idx = b.add_var('state_var', name='idx', value=np.asarray([0, 2]), dtype='int32')
+    op1 = b.add_op('@', W, x)
+    op2 = b.add_op('index', b.add_op('sin', op1), idx)
+    assert op1.shape == (3,) and op1.dtype == np.float64
+    assert op2.shape == (2,) and op2.dtype == np.float64
+    assert op1.numpy().shape == op1.shape and op2.numpy().shape == op2.shape
+    with pytest.raises(ValueError):
+        b._create_op('@', 'dot', x, W)
+
+    # updates of single entries must not have more dimensions than the entry, such that they are squeezed instead
+    z = b.add_var('state_var', name='z', value=np.zeros((3,)), dtype='float32')
+    u = b.add_var('state_var', name='u', value=np.ones((1,)), dtype='float32', squeeze=False)
+    with pytest.raises(ValueError):
+        b._create_op('=', 'assign', z, b.add_op('sin', u), 1)
+    op3 = b.add_op('=', z, b.add_op('sin', u), 1)
+    assert 'np.squeeze' in op3.value
+    np.testing.assert_allclose(op3.numpy(), [0., np.sin(1.), 0.], rtol=1e-6)
+
+    # inferred (tested) vs. evaluated (trusted) shapes and data-types of all operations of compiled networks
+    for i, circuit in enumerate(['net13', 'net15']):
+        net = CircuitTemplate.from_yaml(f"model_templates.test_resources.test_backend.{circuit}"
+                                        ).apply(label=f'net_ops{i}').compile(vectorization=True, step_size=1e-3,
+                                                                              backend='numpy', solver='euler',
+                                                                              verbose=False)
+        ops = [op for layer in net._backend.layers for op in layer if op is not None]
+        assert ops
+        for op in ops:
+            value = np.asarray(op.numpy())
+            assert op.shape == value.shape and op.dtype == value.dtype, op.value
+        net.clear()
+
+    # simulation with inferred (tested) vs. evaluated (trusted) operation shapes and data-types, which generate the
+    # same code
+    r1, _, source1 = simulate_circuit('net13', 'op9', 'net0')
+    r2, _, source2 = simulate_circuit('net13', 'op9', 'net1', compile_kwargs={'check_ops': True})
+    assert source1 == source2
+    np.testing.assert_allclose(r1.values, r2.values)
+
+
+def test_2_21_equation_optimization():
+    """Tests the constant folding and common-subexpression elimination in the right-hand side evaluation.
+
+    See Also
+    --------
+    :func:`optimize_equations`: Detailed documentation of the optimization passes.
+    """
+
+    from pyrates.backend.optimization import optimize_equations
+
+    # subexpressions on constants are evaluated once, repeated subexpressions are shared until their variables change
+    lines = ["a = np.multiply(np.divide(h, tau), x)",
+             "b = np.add(np.divide(h, tau), np.exp(x))",
+             "c = np.exp(x)",
+             "x = np.multiply(x, 2.0)",
+             "d = np.exp(x)",
+             "w[0] = np.multiply(k, 2.0)",
+             "e = np.multiply(w, 2.0)"]
+    constants = {'h': np.asarray(2.0), 'tau': np.asarray(4.0), 'k': np.ones((2,)), 'w': np.ones((2,))}
+    new_lines, scopes, params = optimize_equations(lines, list(range(len(lines))), constants=constants,
+                                                   variables={'a', 'b', 'c', 'd', 'e', 'x', 'h', 'tau', 'k', 'w'},
+                                                   namespace={'np': np})
+    assert len(params) == 2 and params[0][1] == 0.5 and np.all(params[1][1] == 2.0)
+    assert new_lines[0] == f"a = np.multiply({params[0][0]}, x)"
+    assert sum('np.exp(x)' in line for line in new_lines) == 2
+    assert new_lines[-1] == "e = np.multiply(w, 2.0)"
+    assert len(scopes) == len(new_lines) == len(lines) + 1
+
+    # results that are changed in-place afterwards are not shared with other variables
+    lines = ["a = np.exp(x)",
+             "b = np.exp(x)",
+             "a[0] = 5.0",
+             "y_delta[0:2] = np.add(a, b)"]
+    new_lines, _, _ = optimize_equations(lines, list(range(len(lines))), constants={},
+                                         variables={'a', 'b', 'x', 'y_delta'}, namespace={'np': np})
+    assert not any('_shared' in line for line in new_lines)
+    local_vars = {'x': np.zeros((2,)), 'y_delta': np.zeros((2,))}
+    exec("\n".join(new_lines), {'np': np}, local_vars)
+    assert np.array_equal(local_vars['y_delta'], [6.0, 2.0])
+
+    # simulation with optimized (tested) vs. non-optimized (trusted) right-hand side evaluation
+    r1, _, source = simulate_circuit('net15', 'op11', 'net0')
+    r2, _, _ = simulate_circuit('net15', 'op11', 'net1', compile_kwargs={'optimize_rhs': False})
+    np.testing.assert_allclose(r1.values, r2.values)
+
+    # `h/tau` is folded into a parameter, which replaces `h`, and `exp(-a)` is evaluated once for both of its uses
+    rhs = source.split('def rhs_eval(')[1].split('\n\n\n')[0]
+    assert '\tnumpy_divide_evaluated = params[' in rhs and 'h = params[' not in rhs and 'np.divide(h' not in rhs
+    assert rhs.count('np.exp(') == 1 and '\tnumpy_exp_shared = np.exp(np.multiply(a, -1))' in rhs
+    y_delta_line = [line for line in rhs.split('\n') if line.startswith('\ty_delta[0:3] = ')][0]
+    assert y_delta_line.count('numpy_exp_shared') == 2 and 'numpy_divide_evaluated' in y_delta_line
+
+    # shared subexpressions are local to the right-hand side evaluation and not written back to the parameters
+    assert 'numpy_exp_shared' not in rhs.split('# update system parameters')[1]
+
+
+def test_2_22_dead_code_elimination():
+    """Tests the removal of equations and parameters that the state derivatives and the inputs do not depend on.
+
+    See Also
+    --------
+    :func:`eliminate_dead_code`: Detailed documentation of the liveness analysis.
+    """
+
+    from pyrates.backend.optimization import eliminate_dead_code
+
+    # equations are removed unless they feed the roots, either directly, via aliases or via the next evaluation
+    lines = ["a = np.multiply(x, 2.0)",
+             "b = pr_identity(c)",
+             "b[0] = 1.0",
+             "d = np.exp(a)",
+             "e = np.add(f, 1.0)",
+             "f = np.add(x, 1.0)",
+             "g = np.add(d, 1.0)",
+             "y_delta[0] = np.add(c, e)"]
+    new_lines, scopes = eliminate_dead_code(lines, list(range(len(lines))), roots={'y_delta'},
+                                            variables={'a', 'b', 'c', 'd', 'e', 'f', 'g', 'x', 'y_delta'})
+    assert new_lines == [lines[i] for i in (1, 2, 4, 5, 7)]
+    assert scopes == [1, 2, 4, 5, 7]
+
+    # simulation without (tested) vs. with (trusted) the observer variable that nothing depends on
+    r1, _, source1 = simulate_circuit('net15', 'op11', 'net0')
+    r2, _, source2 = simulate_circuit('net15', 'op11', 'net1', compile_kwargs={'optimize_rhs': False})
+    np.testing.assert_allclose(r1.values, r2.values)
+
+    # only the equation of `v` is removed, together with its parameter and its write-back, whereas `b` is kept, since
+    # it feeds the edge projection
+    def lhs_vars(source):
+        lines = source.split('# calculate right-hand side update of equation system')[1]
+        lines = lines.split('# update system parameters')[0].strip().split('\n')
+        return {line.split('=')[0].strip().split('[')[0].rstrip('+') for line in lines}
+
+    assert lhs_vars(source2) - lhs_vars(source1) == {'v'}
+    assert {'b', 'I_syn', 'I_ext', 'y_delta'} <= lhs_vars(source1)
+    assert '\tv = params[' in source2 and '\tv = params[' not in source1
+    assert '] = v\n' in source2 and '] = v\n' not in source1
+
+
+def test_2_23_preallocated_buffers():
+    """Tests the code generation mode that writes the results of ufuncs and inner products into preallocated work arrays.
+
+    See Also
+    --------
+    :func:`preallocate_buffers`: Detailed documentation of the buffer allocation.
+    """
+
+    import re
+    from pyrates.backend.optimization import preallocate_buffers
+
+    # only results that are consumed immediately and have at least one dimension are written into buffers
+    lines = ["a = np.multiply(x, np.add(x, 1.0))",
+             "b = np.exp(a)",
+             "c = b",
+             "d = np.sum(np.add(x, c))",
+             "y_delta[0:3] = np.add(a, np.multiply(k, 2.0))"]
+    values = {'x': np.ones((3,)), 'k': 2.0, 'y_delta': np.zeros((3,)), 'y': np.zeros((3,)), 't': 0.0}
+    new_lines, buffers = preallocate_buffers(lines, values=values, variables=set(values), namespace={'np': np},
+                                             name_func=lambda func: func.split('.')[-1])
+    assert new_lines == ["a = np.multiply(x, np.add(x, 1.0, out=add_buffer), out=multiply_buffer)",
+                         "b = np.exp(a)",
+                         "c = b",
+                         "d = np.sum(np.add(x, c))",
+                         "y_delta[0:3] = np.add(a, np.multiply(k, 2.0), out=add_buffer_0)"]
+    assert [name for name, _ in buffers] == ['add_buffer', 'multiply_buffer', 'add_buffer_0']
+    assert all(val.shape == (3,) for _, val in buffers)
+    assert np.array_equal(values['y_delta'], np.zeros((3,)))
+
+    # simulation with (tested) vs. without (trusted) preallocated work arrays
+    r1, _, source1 = simulate_circuit('net15', 'op11', 'net0', preallocate=True)
+    r2, _, source2 = simulate_circuit('net15', 'op11', 'net1')
+    assert '_buffer' not in source2
+    np.testing.assert_allclose(r1.values, r2.values)
+
+    # each work array is a parameter, i.e. it is allocated once and reused at each evaluation, and receives the result
+    # of a single call per evaluation
+    rhs = source1.split('def rhs_eval(')[1].split('\n\n\n')[0]
+    declared = re.findall(r'\t(\w+_buffer(?:_\d+)?) = params\[', rhs)
+    used = re.findall(r'out=(\w+)\)', rhs)
+    assert declared and sorted(used) == sorted(declared)
+    assert 'np.zeros(' not in rhs and 'np.empty(' not in rhs
+
+    # results that are written back to the parameters are not written into work arrays
+    assert '\tb = np.tanh(a)\n' in rhs
+    assert '\tI_syn = np.dot(target_idx, np.multiply(b[source_idx], weight, out=numpy_multiply_buffer))\n' in rhs
+    assert 'numpy_exp_shared = np.exp(np.multiply(a, -1, out=' in rhs
+
+
+def test_2_24_sparse_edges():
+    """Tests the realization of sparse edge projections via sparse edge weight matrices.
+
+    See Also
+    --------
+    :method:`CircuitIR.compile`: Detailed documentation of the arguments `matrix_sparseness` and `sparse_edges`.
+    """
+
+    from pyrates.benchmarks import build_network
+
+    dt = 1e-4
+    sim_time = 0.05
+    outputs = {'r': 'all/p/Op_e/r'}
+
+    def simulate(sparse_edges):
+        net = build_network('montbrio', 20, 0.2, seed=1).compile(vectorization=True, step_size=dt, backend='numpy',
+                                                                  solver='euler', cache_dir=None, verbose=False,
+                                                                  sparse_edges=sparse_edges)
+        r = net.run(sim_time, outputs=outputs, verbose=False)
+        source = open(net._backend._module.__file__).read()
+        net.clear()
+        return r, source
+
+    # simulation with (tested) vs. without (trusted) sparse edge weight matrix
+    r1, source1 = simulate(0.5)
+    r2, source2 = simulate(None)
+    assert 'pr_sparse_dot(' in source1 and 'pr_sparse_dot(' not in source2
+    assert np.allclose(r1.values, r2.values, rtol=1e-6, atol=1e-8)
+    assert np.sum(np.abs(r1.values)) > 0.
+
+    # sparse edge weight matrices are only used up to the given density (about 0.2 for this network)
+    _, source3 = simulate(0.1)
+    assert 'pr_sparse_dot(' not in source3
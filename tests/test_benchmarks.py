@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#
+#
+# PyRates software framework for flexible implementation of neural
+# network models and simulations. See also:
+# https://github.com/pyrates-neuroscience/PyRates
+#
+# Copyright (C) 2017-2018 the original authors (Richard Gast and
+# Daniel Rose), the Max-Planck-Institute for Human Cognitive Brain
+# Sciences ("MPI CBS") and contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>
+#
+# CITATION:
+#
+# Richard Gast and Daniel Rose et. al. in preparation
+"""
+Test suite for the performance benchmark suite.
+"""
+
+__author__ = "Richard Gast"
+__status__ = "Development"
+
+import pytest
+
+
+def setup_module():
+    print("\n")
+    print("===============================")
+    print("| Test Suite: Benchmark Suite |")
+    print("===============================")
+
+
+def test_benchmark_suite(tmp_path):
+    """Runs a minimal benchmark suite and compares it against itself and against a faster baseline.
+    """
+    from copy import deepcopy
+    from pyrates.benchmarks import run_suite, compare, save, load
+
+    results = run_suite(models=['montbrio', 'kuramoto'], sizes=[3], densities=[0.5], isolate=False, verbose=False,
+                        T=0.01, dt=1e-3)
+    assert len(results['results']) == 2
+    for res in results['results']:
+        assert 'error' not in res
+        assert res['compile_time'] > 0 and res['run_time'] > 0 and res['steps_per_second'] > 0
+        assert res['stats']['n_nodes'] == 3
+
+    # storing and loading
+    fn = str(tmp_path / "results.json")
+    save(results, fn)
+    baseline = load(fn)
+    assert compare(results, baseline) == []
+
+    # regressions compared to a faster baseline
+    baseline = deepcopy(baseline)
+    baseline['results'][0]['run_time'] = results['results'][0]['run_time'] / 10
+    regressions = compare(results, baseline)
+    assert len(regressions) == 1
+    assert regressions[0]['model'] == 'montbrio' and regressions[0]['metric'] == 'run_time'
+
+    # failing benchmarks
+    with pytest.raises(ValueError):
+        run_suite(models=['invalid'], sizes=[3], isolate=False, verbose=False)